@@ -0,0 +1,107 @@
+"""Rapport de construction du dataset : débit, temps décodage / détection, qualité par classe.
+
+    report = BuildReport()
+    report.add_image('A', 'static', features, detect_s=0.012)
+    report.save('dataset_report.json', elapsed_s)
+    report.print_summary(elapsed_s)
+
+Les workers de l'extraction parallèle renvoient `report.state()` (dict picklable),
+fusionné dans le rapport principal avec `merge()`.
+"""
+import json
+import time
+
+from hand_features import NUM_FEATURES
+
+_COUNTERS = ('images', 'cached', 'decode_failures', 'no_hand', 'one_hand', 'two_hands',
+             'decode_s', 'detect_s', 'wall_s')
+
+
+def count_hands(features):
+    """0, 1 ou 2 mains d'après un vecteur de features (seconde main absente = zéros)."""
+    if features is None:
+        return 0
+    return 2 if features[NUM_FEATURES // 2:].any() else 1
+
+
+class BuildReport:
+    def __init__(self):
+        self.classes = {}
+        self.sequences = []
+
+    def _entry(self, label, kind):
+        entry = self.classes.get(label)
+        if entry is None:
+            entry = self.classes[label] = dict.fromkeys(_COUNTERS, 0)
+            entry['kind'] = kind
+        return entry
+
+    def add_image(self, label, kind, features, cached=False, decode_failed=False, detect_s=0.0):
+        entry = self._entry(label, kind)
+        entry['images'] += 1
+        entry['cached'] += int(cached)
+        entry['detect_s'] += detect_s
+        if decode_failed:
+            entry['decode_failures'] += 1
+            return
+        entry[('no_hand', 'one_hand', 'two_hands')[count_hands(features)]] += 1
+
+    def add_time(self, label, kind, wall_s=0.0, decode_s=0.0):
+        entry = self._entry(label, kind)
+        entry['wall_s'] += wall_s
+        entry['decode_s'] += decode_s
+
+    def add_sequence(self, label, source, frames, hand_frames, windows):
+        self.sequences.append({'label': label, 'source': source, 'frames': frames,
+                               'hand_frames': hand_frames, 'windows': windows})
+
+    def state(self):
+        return {'classes': self.classes, 'sequences': self.sequences}
+
+    def merge(self, state):
+        for label, other in state['classes'].items():
+            entry = self._entry(label, other['kind'])
+            for key in _COUNTERS:
+                entry[key] += other[key]
+        self.sequences.extend(state['sequences'])
+
+    def to_dict(self, elapsed_s):
+        classes = {}
+        for label, e in sorted(self.classes.items()):
+            failures = e['decode_failures'] + e['no_hand']
+            classes[label] = dict(
+                e,
+                images_per_s=round(e['images'] / e['wall_s'], 2) if e['wall_s'] else 0.0,
+                failure_rate=round(failures / e['images'], 4) if e['images'] else 0.0,
+            )
+        images = sum(e['images'] for e in self.classes.values())
+        return {
+            'timestamp': time.time(),
+            'elapsed_s': round(elapsed_s, 3),
+            'images': images,
+            'images_per_s': round(images / elapsed_s, 2) if elapsed_s else 0.0,
+            'cached': sum(e['cached'] for e in self.classes.values()),
+            'decode_s': round(sum(e['decode_s'] for e in self.classes.values()), 3),
+            'detect_s': round(sum(e['detect_s'] for e in self.classes.values()), 3),
+            'classes': classes,
+            'sequences': self.sequences,
+        }
+
+    def save(self, path, elapsed_s):
+        data = self.to_dict(elapsed_s)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return data
+
+    def print_summary(self, elapsed_s):
+        data = self.to_dict(elapsed_s)
+        print(f"\n{'Classe':<16}{'Type':<10}{'Images':>8}{'Img/s':>9}{'Décod. s':>10}{'Détect. s':>11}"
+              f"{'Échecs':>9}{'1 main':>8}{'2 mains':>9}")
+        for label, c in data['classes'].items():
+            print(f"{label:<16}{c['kind']:<10}{c['images']:>8}{c['images_per_s']:>9.1f}{c['decode_s']:>10.2f}"
+                  f"{c['detect_s']:>11.2f}{c['failure_rate']:>9.1%}{c['one_hand']:>8}{c['two_hands']:>9}")
+        for seq in data['sequences']:
+            print(f"  - {seq['label']} ({seq['source']}): {seq['hand_frames']}/{seq['frames']} frames, "
+                  f"{seq['windows']} windows")
+        print(f"Total: {data['images']} images en {data['elapsed_s']:.1f} s ({data['images_per_s']:.1f} img/s), "
+              f"décodage {data['decode_s']:.1f} s, détection {data['detect_s']:.1f} s, {data['cached']} en cache")
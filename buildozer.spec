@@ -13,7 +13,8 @@ package.domain = org.test
 source.dir = .
 
 # (list) Source files to include (let empty to include all the files)
-source.include_exts = py,png,jpg,kv,atlas,p,pickle,json,task
+# Modèles : seuls les .forest (model_artifact.py) sont embarqués, pas les pickles sklearn
+source.include_exts = py,png,jpg,kv,atlas,json,task,forest
 
 # (list) List of inclusions using pattern matching
 #source.include_patterns = assets/*,images/*.png
@@ -32,7 +33,7 @@ version = 1.0
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy,opencv,mediapipe,plyer,numpy,pillow,scikit-learn,gtts,sh,requests,arabic-reshaper,python-bidi
+requirements = python3,kivy,opencv,mediapipe,plyer,numpy,pillow,gtts,sh,requests,arabic-reshaper,python-bidi
 
 # (str) python-for-android fork to use (default is kivy)
 # p4a.fork = kivy
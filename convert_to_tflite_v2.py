@@ -1,23 +1,25 @@
-
-import pickle
 import numpy as np
 import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 import os
+import math
+
+from dataset_store import load_dataset, dataset_exists
+from landmark_augment import LandmarkAugmenter
+from model_artifact import load_model, artifact_path
+from distillation import teacher_batches, agreement, single_sample_ms, distill_report, save_report, print_report
 
-def convert_dataset_to_tflite(data_file, model_output_name, is_sequence=False):
+def convert_dataset_to_tflite(data_file, model_output_name, is_sequence=False, sequence_length=None, stride=None,
+                              augment=False):
     print(f"\n--- Traitement de {data_file} ---")
-    if not os.path.exists(data_file):
+    if not dataset_exists(data_file):
         print(f"❌ Fichier introurvable: {data_file}")
         return
 
-    # 1. Charger les données
-    with open(data_file, 'rb') as f:
-        data_dict = pickle.load(f)
-    
-    data = np.asarray(data_dict['data'])
-    labels = np.asarray(data_dict['labels'])
+    # 1. Charger les données (float32 memmappé, ancien pickle en secours)
+    # Séquences stockées par vidéo : fenêtres (sequence_length, stride) construites ici
+    data, labels, _ = load_dataset(data_file, sequence_length=sequence_length, stride=stride)
     
     # Nettoyage des données (Séquences vs Statique)
     # Si séquence, data peut avoir une forme (N, Sequence_Length, Features) ou (N, Solt_Features)
@@ -67,7 +69,13 @@ def convert_dataset_to_tflite(data_file, model_output_name, is_sequence=False):
 
     # 5. Entraîner
     print("⏳ Entraînement en cours...")
-    model.fit(X_train, y_train, epochs=50, batch_size=32, validation_data=(X_test, y_test), verbose=0)
+    if augment:
+        # Lots réels + copies augmentées renouvelées à chaque époque (rotation, échelle, miroir, vitesse)
+        augmenter = LandmarkAugmenter(seed=42)
+        model.fit(augmenter.batches(X_train, y_train, batch_size=32), steps_per_epoch=math.ceil(len(X_train) / 32),
+                  epochs=50, validation_data=(X_test, y_test), verbose=0)
+    else:
+        model.fit(X_train, y_train, epochs=50, batch_size=32, validation_data=(X_test, y_test), verbose=0)
     
     loss, accuracy = model.evaluate(X_test, y_test, verbose=0)
     print(f"✅ Précision (Accuracy): {accuracy*100:.2f}%")
@@ -84,25 +92,124 @@ def convert_dataset_to_tflite(data_file, model_output_name, is_sequence=False):
     print(f"💾 Modèle TFLite sauvegardé: {model_output_name}")
 
 
+def distill_forest_to_tflite(data_file, teacher_file, model_output_name, sequence_length=None, stride=None,
+                             epochs=50):
+    """Élève dense entraîné à reproduire `predict_proba` de la forêt `teacher_file` (voir distillation.py).
+
+    Même découpage train/test que train_classifier.py : l'accord est mesuré sur des
+    échantillons que la forêt n'a pas vus. Rapport dans <modèle>_distill.json.
+    """
+    print(f"\n--- Distillation de {teacher_file} ({data_file}) ---")
+    teacher = load_model(teacher_file)
+    if teacher is None or not dataset_exists(data_file):
+        print(f"❌ Fichier introuvable: {teacher_file} / {data_file}")
+        return None
+
+    data, labels, _ = load_dataset(data_file, sequence_length=sequence_length, stride=stride)
+    if teacher.feature.max() >= data.shape[1]:
+        print(f"❌ {teacher_file} attend plus de {data.shape[1]} features : même sequence_length qu'à l'entraînement ?")
+        return None
+    classes = np.asarray(teacher.classes_)
+    labels_file = model_output_name.replace('.tflite', '_labels.txt')
+    with open(labels_file, 'w', encoding='utf-8') as f:
+        for c in classes:
+            f.write(c + '\n')
+    print(f"📝 Labels sauvegardés dans {labels_file}")
+
+    _, counts = np.unique(labels, return_counts=True)
+    X_train, X_test, y_train, y_test = train_test_split(
+        data, labels, test_size=0.2, shuffle=True, stratify=labels if counts.min() >= 2 else None, random_state=42
+    )
+
+    # Élève plus petit que le MLP de convert_dataset_to_tflite : il imite la forêt, pas les labels
+    model = tf.keras.models.Sequential([
+        tf.keras.layers.Input(shape=(data.shape[1],)),
+        tf.keras.layers.Dense(64, activation='relu'),
+        tf.keras.layers.Dense(32, activation='relu'),
+        tf.keras.layers.Dense(len(classes), activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss=tf.keras.losses.KLDivergence(), metrics=['accuracy'])
+
+    # Lots réels + copies augmentées, étiquetés par la forêt à la volée
+    print("⏳ Distillation en cours...")
+    augmenter = LandmarkAugmenter(seed=42)
+    model.fit(teacher_batches(teacher, X_train, batch_size=32, augmenter=augmenter, seed=42),
+              steps_per_epoch=math.ceil(len(X_train) / 32), epochs=epochs,
+              validation_data=(X_test, teacher.predict_proba(X_test)), verbose=0)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_model = converter.convert()
+    with open(model_output_name, 'wb') as f:
+        f.write(tflite_model)
+    print(f"💾 Modèle TFLite sauvegardé: {model_output_name}")
+
+    # Mesures sur le modèle TFLite, celui qui est déployé
+    interpreter = tf.lite.Interpreter(model_content=tflite_model)
+    interpreter.allocate_tensors()
+    student = lambda X: _tflite_predict_proba(interpreter, X)
+    X_augmented = augmenter.augment(X_test)
+    student_proba = student(X_test)
+    teacher_path = artifact_path(teacher_file) if os.path.exists(artifact_path(teacher_file)) else teacher_file
+    report = distill_report(
+        agreement(teacher.predict_proba(X_test), student_proba, classes),
+        agreement(teacher.predict_proba(X_augmented), student(X_augmented), classes),
+        single_sample_ms(teacher.predict_proba, X_test), single_sample_ms(student, X_test),
+        os.path.getsize(teacher_path), len(tflite_model),
+        teacher_accuracy=round(float(np.mean(teacher.predict(X_test) == y_test)), 4),
+        student_accuracy=round(float(np.mean(classes[np.argmax(student_proba, axis=1)] == y_test)), 4),
+    )
+    print_report(report)
+    print(f"📝 Rapport: {save_report(report, model_output_name.replace('.tflite', '_distill.json'))}")
+    return report
+
+
+def _tflite_predict_proba(interpreter, X):
+    """predict_proba via l'interpréteur TFLite, un échantillon à la fois (comme sur l'appareil)."""
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+    outputs = []
+    for sample in np.asarray(X, dtype=np.float32):
+        interpreter.set_tensor(input_index, sample[None])
+        interpreter.invoke()
+        outputs.append(interpreter.get_tensor(output_index)[0].copy())
+    return np.asarray(outputs)
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export TFLite des modèles lettres et mots pour Flutter")
+    parser.add_argument('--distill', action='store_true',
+                        help="Élèves distillés des forêts model.p / model_sequence.p au lieu de MLP entraînés sur les labels")
+    parser.add_argument('--augment', action='store_true',
+                        help="MLP : ajoute à chaque lot sa copie augmentée (comme train_classifier.py --augment)")
+    args = parser.parse_args()
+
     # S'assurer que le dossier flutter assets existe
     assets_dir = os.path.join("flutter_app", "assets")
     if not os.path.exists(assets_dir):
         os.makedirs(assets_dir)
         
-    # 1. Modèle Lettres
-    convert_dataset_to_tflite(
-        'data.pickle', 
-        os.path.join(assets_dir, 'model_letters.tflite')
-    )
-    
-    # 2. Modèle Mots (Séquence)
-    # Note: Si sequence_data contient des séquences temporelles, Dense layer traite l'input aplati (flattened).
-    # C'est ce que faisait le RandomForest aussi.
-    convert_dataset_to_tflite(
-        'sequence_data.pickle',
-        os.path.join(assets_dir, 'model_words.tflite'),
-        is_sequence=True
-    )
+    if args.distill:
+        distill_forest_to_tflite('data', 'model.p', os.path.join(assets_dir, 'model_letters.tflite'))
+        distill_forest_to_tflite('sequence_data', 'model_sequence.p', os.path.join(assets_dir, 'model_words.tflite'))
+    else:
+        # 1. Modèle Lettres
+        convert_dataset_to_tflite(
+            'data', 
+            os.path.join(assets_dir, 'model_letters.tflite'),
+            augment=args.augment
+        )
+        
+        # 2. Modèle Mots (Séquence)
+        # Note: Si sequence_data contient des séquences temporelles, Dense layer traite l'input aplati (flattened).
+        # C'est ce que faisait le RandomForest aussi.
+        convert_dataset_to_tflite(
+            'sequence_data',
+            os.path.join(assets_dir, 'model_words.tflite'),
+            is_sequence=True,
+            augment=args.augment
+        )
     
     print("\n🚀 Conversion terminée ! Intégrez ces fichiers dans flutter_app/assets/")
@@ -1,102 +1,189 @@
 import os
-import pickle
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import cv2
 import numpy as np
 # Suppress TF oneDNN warnings
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 
 # Use MediaPipe Tasks API (compatible with 0.10.x)
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
 import mediapipe as mp
 
+from landmark_detector import create_landmarker, HandTracker, MODEL_PATH
+
+from hand_features import HandFeatureExtractor
+from landmark_cache import LandmarkCache, MISSING
+from dataset_store import (save_dataset, save_frame_dataset, merge_classes, load_dataset, load_sequence_dataset,
+                           num_windows, MIN_UPSAMPLE_FRAMES)
+from image_prefetch import ImagePrefetcher
+from dataset_dedup import prune_dataset, print_report
+from build_report import BuildReport
+
 # REDUCED SEQUENCE LENGTH: 30 -> 15
 # This makes recognition FASTER and easier to trigger
 SEQUENCE_LENGTH = 15 
 
+# Extraction parallèle : nombre d'images d'une lettre traitées par tâche
+STATIC_SHARD_SIZE = 200
+
+# Cache des landmarks par image, à côté du dossier Data/
+CACHE_FILE = 'landmark_cache.sqlite'
+
+# Timestamps synthétiques des frames d'un dossier de mot (mode VIDEO, ~30 fps)
+SEQUENCE_FRAME_MS = 33
+
+# Fichiers vidéo acceptés comme source d'une séquence (mot)
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+# Décodage en avance sur le détecteur : threads et images en attente (mémoire bornée)
+DECODE_THREADS = 4
+DECODE_QUEUE_SIZE = 32
+
 class HandLandmarkExtractor:
-    def __init__(self, data_dir='./Data'):
+    def __init__(self, data_dir='./Data', workers=1, use_cache=True, cache_hash=False, track_sequences=True,
+                 decode_max_size=None, video_fps=None, dedup_threshold=0.005, max_per_class=None, classes=None):
         self.data_dir = data_dir
-        self.pickle_file_static = 'data.pickle'    # Pour les lettres (A-Z)
-        self.pickle_file_sequence = 'sequence_data.pickle' # Pour les mots (vidéo)
-        
-        # Initialize hand landmarker using Tasks API
-        base_options = python.BaseOptions(model_asset_path='hand_landmarker.task')
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            num_hands=2,
-            min_hand_detection_confidence=0.3,
-            min_hand_presence_confidence=0.3,
-            min_tracking_confidence=0.3
-        )
-        self.detector = vision.HandLandmarker.create_from_options(options)
-
-    def extract_features(self, img):
-        """Extrait les 84 features d'une image. Retourne None si aucune main détectée."""
-        data_aux = []
-        x_ = []
-        y_ = []
+        # Datasets float32 data.npy + data.json (voir dataset_store.py)
+        self.dataset_static = 'data'             # Pour les lettres (A-Z)
+        self.dataset_sequence = 'sequence_data'  # Pour les mots (vidéo)
+        # Nombre de processus d'extraction (None = tous les coeurs, 1 = séquentiel)
+        self.workers = workers or os.cpu_count() or 1
         
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+        # Cache SQLite (chemin, taille, mtime [, SHA-1]) -> features : seules les images
+        # nouvelles ou modifiées sont décodées et passées à MediaPipe
+        self.use_cache = use_cache
+        self.cache_hash = cache_hash
+        self.cache_path = os.path.join(os.path.dirname(os.path.abspath(data_dir)), CACHE_FILE)
+        self._cache = None
         
-        results = self.detector.detect(mp_image)
+        # Hand landmarker Tasks API (IMAGE mode: images indépendantes), créé au premier
+        # usage : en mode parallèle seuls les workers en ont besoin
+        self._detector = None
+        # Dossiers de mots : un landmarker VIDEO par dossier, MediaPipe suit les mains
+        # d'une frame à l'autre (comme l'application en direct)
+        self.track_sequences = track_sequences
+        # Images bien plus grandes que `decode_max_size` décodées à 1/2 ou 1/4 (None = pleine taille)
+        self.decode_max_size = decode_max_size
+        # Fichiers vidéo sous-échantillonnés à ~video_fps images/s (None = toutes les frames)
+        self.video_fps = video_fps
+        # Lettres : quasi-doublons (aucun landmark déplacé de plus de dedup_threshold)
+        # retirés après extraction, au plus max_per_class échantillons par classe
+        self.dedup_threshold = dedup_threshold
+        self.max_per_class = max_per_class
+        # Extraction limitée à ces classes, fusionnées dans les datasets existants
+        # (les autres classes sont gardées telles quelles) : voir train_classifier --incremental
+        self.classes = set(classes) if classes else None
+        # Débit, temps décodage / détection et qualité par classe -> dataset_report.json
+        self.report = BuildReport()
+        self.report_file = 'dataset_report.json'
+        self.features = HandFeatureExtractor()
+
+    @property
+    def detector(self):
+        if self._detector is None:
+            self._detector = create_landmarker()
+        return self._detector
+
+    @property
+    def cache(self):
+        """Connexion au cache, ouverte par processus (None si désactivé)."""
+        if self._cache is None and self.use_cache:
+            model_size = os.path.getsize(MODEL_PATH) if os.path.exists(MODEL_PATH) else 0
+            sequence_mode = 'video' if self.track_sequences else 'image'
+            signature = (f"{MODEL_PATH}:{model_size}:conf=0.3:hands=2:sequences={sequence_mode}"
+                         f":decode={self.decode_max_size or 'full'}")
+            self._cache = LandmarkCache(self.cache_path, root=self.data_dir,
+                                        signature=signature, use_hash=self.cache_hash)
+        return self._cache
+
+    def cache_stats(self):
+        return self._cache.stats() if self._cache is not None else {'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+
+    def iter_features(self, img_paths, label, kind, tracker=None):
+        """Génère (chemin, features ou None, erreur ou None) dans l'ordre de `img_paths`.
+
+        Les features en cache sont réutilisées ; les autres images sont décodées par
+        ImagePrefetcher en avance sur la détection, puis mises en cache. Avec `tracker`
+        (HandTracker), la frame i est détectée en mode VIDEO à i * SEQUENCE_FRAME_MS.
+        Chaque image est comptée dans le rapport sous (`label`, `kind`).
+        """
+        cache = self.cache
+        cached = {}
+        if cache is not None:
+            for img_path in img_paths:
+                features = cache.get(img_path)
+                if features is not MISSING:
+                    cached[img_path] = features
         
-        if results.hand_landmarks:
-            # SORT HANDS by x-coordinate (Left to Right) to ensure consistency
-            # landmarks[0] is the wrist. We use wrist.x to sort.
-            sorted_hands = sorted(results.hand_landmarks, key=lambda h: h[0].x)
-            
-            for hand_landmarks in sorted_hands:
-                for landmark in hand_landmarks:
-                    x_.append(landmark.x)
-                    y_.append(landmark.y)
-
-            if x_ and y_:
-                min_x = min(x_)
-                min_y = min(y_)
-
-                for hand_landmarks in sorted_hands:
-                    for landmark in hand_landmarks:
-                        data_aux.append(landmark.x - min_x)
-                        data_aux.append(landmark.y - min_y)
-
-            # Padding
-            if len(data_aux) == 42:
-                data_aux.extend([0.0] * 42)
+        to_decode = [p for p in img_paths if p not in cached]
+        prefetcher = ImagePrefetcher(to_decode, workers=DECODE_THREADS, queue_size=DECODE_QUEUE_SIZE,
+                                     max_size=self.decode_max_size)
+        decoded = iter(prefetcher)
+        for frame_index, img_path in enumerate(img_paths):
+            if img_path in cached:
+                self.report.add_image(label, kind, cached[img_path], cached=True)
+                yield img_path, cached[img_path], None
+                continue
             
-            if len(data_aux) == 84:
-                return data_aux
+            _, img, error = next(decoded)
+            if error is not None or img is None:
+                self.report.add_image(label, kind, None, decode_failed=True)
+                yield img_path, None, error
+                continue
+            start = time.perf_counter()
+            try:
+                features = self.extract_features(img, tracker, frame_index * SEQUENCE_FRAME_MS)
+            except Exception as e:
+                self.report.add_image(label, kind, None, detect_s=time.perf_counter() - start)
+                yield img_path, None, e
+                continue
+            self.report.add_image(label, kind, features, detect_s=time.perf_counter() - start)
+            if cache is not None:
+                cache.put(img_path, features)
+            yield img_path, features, None
+        self.report.add_time(label, kind, decode_s=prefetcher.decode_seconds)
+
+    def extract_features(self, img, tracker=None, timestamp_ms=None):
+        """Extrait les 84 features d'une image (vecteur float32). Retourne None si aucune main détectée."""
+        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        
+        if tracker is not None:
+            results = tracker.detect(img_rgb, timestamp_ms)
+        else:
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+            results = self.detector.detect(mp_image)
+        
+        # Tri gauche -> droite, normalisation et padding partagés avec les applications
+        if self.features.update(results.hand_landmarks):
+            return self.features.flat.copy()
         
         return None
 
     def process_static_folder(self, folder_path, label, data, labels):
         """Traite un dossier comme collection d'images indépendantes (Lettres)"""
+        return self.process_static_files(_list_files(folder_path), label, data, labels)
+
+    def process_static_files(self, img_paths, label, data, labels):
+        """Extrait les features d'une liste d'images d'une même lettre"""
+        start = time.perf_counter()
         count = 0
-        for img_name in os.listdir(folder_path):
-            img_path = os.path.join(folder_path, img_name)
-            if not os.path.isfile(img_path): continue
-            
-            # FIX: Unicode path support for Windows
-            try:
-                stream = np.fromfile(img_path, dtype=np.uint8)
-                img = cv2.imdecode(stream, cv2.IMREAD_COLOR)
-            except:
-                continue
-                
-            if img is None: continue
-            
-            features = self.extract_features(img)
-            if features:
+        for _, features, _ in self.iter_features(img_paths, label, 'static'):
+            if features is not None:
                 data.append(features)
                 labels.append(label)
                 count += 1
+        if self._cache is not None:
+            self._cache.commit()
+        self.report.add_time(label, 'static', wall_s=time.perf_counter() - start)
         return count
 
     def process_sequence_folder(self, folder_path, label, data, labels):
         """Traite un dossier comme une séquence vidéo (Mots)"""
+        start = time.perf_counter()
         # On suppose que les fichiers sont numérotés ou triables par nom pour former une séquence
-        files = [f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))]
+        files = [os.path.basename(f) for f in _list_files(folder_path)]
         
         # Tentative de tri numérique (car(1), car(2)...)
         try:
@@ -105,130 +192,339 @@ class HandLandmarkExtractor:
             files.sort()
 
         all_frames_features = []
+        # Landmarker VIDEO propre au dossier, timestamps synthétiques monotones
+        tracker = HandTracker() if self.track_sequences else None
         
-        for img_name in files:
-            img_path = os.path.join(folder_path, img_name)
-            
-            # FIX: Unicode path support for Windows (cv2.imread fails with accents)
-            try:
-                # Lecture via numpy pour supporter les accents (ex: "métro")
-                stream = np.fromfile(img_path, dtype=np.uint8)
-                img = cv2.imdecode(stream, cv2.IMREAD_COLOR)
-            except Exception as e:
-                print(f"Error reading {img_path}: {e}")
-                continue
-                
-            if img is None: continue
-            
-            features = self.extract_features(img)
-            if features:
-                all_frames_features.append(features)
-
-        # Création des séquences de longueur fixe (SEQUENCE_LENGTH)
-        sequences_created = 0
-        
-        # Adaptive Stride: If video is short, use smaller stride to get more samples
-        STRIDE = 4
-        if len(all_frames_features) < 60:
-            STRIDE = 1
-        elif len(all_frames_features) < 100:
-            STRIDE = 2
-            
-        if len(all_frames_features) >= SEQUENCE_LENGTH:
-            # Créer des fenêtres glissantes de 30 frames
-            for start_idx in range(0, len(all_frames_features) - SEQUENCE_LENGTH + 1, STRIDE):
-                sampled_sequence = all_frames_features[start_idx : start_idx + SEQUENCE_LENGTH]
-                flattened_sequence = np.array(sampled_sequence).flatten().tolist()
-                data.append(flattened_sequence)
-                labels.append(label)
-                sequences_created += 1
-            
-            # --- AUGMENTATION DE SECOURS (Si < 2 échantillons) ---
-            # Si malgré le glissement on a qu'un seul échantillon (ex: vidéo de 32 frames, stride 4 -> 1 sample)
-            # On ajoute du bruit pour créer un 2ème échantillon artificiel
-            if sequences_created < 2:
-                print(f"  - Augmenting data for '{label}' (only {sequences_created} found)...")
-                original_seq = data[-1] # Le dernier ajouté
-                # Ajouter un léger bruit (jitter)
-                noisy_seq = np.array(original_seq) + np.random.normal(0, 0.01, len(original_seq))
-                data.append(noisy_seq.tolist())
-                labels.append(label)
-                sequences_created += 1
-            
-            print(f"  - Generated {sequences_created} sequences for '{label}' (from {len(all_frames_features)} frames)")
-            return sequences_created
-            
-        elif len(all_frames_features) > 10: # Si on a au moins 10 frames mais moins que 30
-             # On upsample (étire) pour atteindre 30 frames
-             indices = np.linspace(0, len(all_frames_features) - 1, SEQUENCE_LENGTH, dtype=int)
-             sampled_sequence = [all_frames_features[i] for i in indices]
-             flattened_sequence = np.array(sampled_sequence).flatten().tolist()
-             
-             # Sample 1 (Original Upsamled)
-             data.append(flattened_sequence)
-             labels.append(label)
-             
-             # Sample 2 (Noisy Upsampled) -> Pour garantir au moins 2 samples
-             noisy_seq = np.array(flattened_sequence) + np.random.normal(0, 0.01, len(flattened_sequence))
-             data.append(noisy_seq.tolist())
-             labels.append(label)
-             
-             print(f"  - Upsampled & Augmented 2 sequences for '{label}' (from {len(all_frames_features)} frames)")
-             return 2
-             
-        else:
-            print(f"  - Warning: Not enough frames for '{label}' sequence ({len(all_frames_features)} frames). Skipping.")
-            return 0
+        try:
+            img_paths = [os.path.join(folder_path, img_name) for img_name in files]
+            for img_path, features, error in self.iter_features(img_paths, label, 'sequence', tracker):
+                if error is not None:
+                    print(f"Error reading {img_path}: {error}")
+                elif features is not None:
+                    all_frames_features.append(features)
+        finally:
+            if tracker is not None:
+                tracker.close()
+        if self._cache is not None:
+            self._cache.commit()
 
-    def extract_landmarks(self):
-        data_static = []
-        labels_static = []
-        
-        data_sequence = []
-        labels_sequence = []
+        self.report.add_time(label, 'sequence', wall_s=time.perf_counter() - start)
+        return self._add_sequence(all_frames_features, label, data, labels, folder_path, len(files))
+
+    def process_video_file(self, video_path, label, data, labels):
+        """Traite un fichier vidéo (.mp4, .avi...) comme une séquence (Mots), décodé en flux"""
+        start = time.perf_counter()
+        variant = f"fps={self.video_fps or 'all'}"
+        cache = self.cache
+        frames = cache.get(video_path, variant) if cache is not None else MISSING
+        counts = cache.get_counts(video_path, variant) if frames is not MISSING else None
         
-        print(f"Parsing directories in {self.data_dir}...")
+        if frames is MISSING or counts is None:
+            # Absente du cache, ou entrée d'un ancien cache sans les comptes : vidéo retraitée
+            frames = []
+            frames_read = 0
+            decode_failures = 0
+            decode_s = 0.0
+            cap = cv2.VideoCapture(video_path)
+            if not cap.isOpened():
+                print(f"Error reading {video_path}: cannot open video")
+                return 0
+            src_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            step = max(1, round(src_fps / self.video_fps)) if self.video_fps else 1
+            tracker = HandTracker() if self.track_sequences else None
+            try:
+                index = 0
+                # grab() avance sans convertir la frame : seules les frames gardées sont décodées
+                while True:
+                    t0 = time.perf_counter()
+                    if not cap.grab():
+                        break
+                    if index % step == 0:
+                        ok, frame = cap.retrieve()
+                        t1 = time.perf_counter()
+                        frames_read += 1
+                        if not ok:
+                            decode_failures += 1
+                            self.report.add_image(label, 'sequence', None, decode_failed=True)
+                        else:
+                            features = self.extract_features(frame, tracker, int(index * 1000 / src_fps))
+                            self.report.add_image(label, 'sequence', features, detect_s=time.perf_counter() - t1)
+                            if features is not None:
+                                frames.append(features)
+                    else:
+                        t1 = time.perf_counter()
+                    decode_s += t1 - t0
+                    index += 1
+            finally:
+                cap.release()
+                if tracker is not None:
+                    tracker.close()
+            if cache is not None:
+                counts = {'frames': frames_read, 'no_hand': frames_read - decode_failures - len(frames),
+                          'decode_failures': decode_failures}
+                cache.put(video_path, np.stack(frames) if frames else None, variant, counts)
+                cache.commit()
+            self.report.add_time(label, 'sequence', decode_s=decode_s)
+        else:
+            # Seules les frames avec main sont en cache, les autres sont comptées à côté
+            frames = [] if frames is None else list(frames)
+            frames_read = counts['frames']
+            for features in frames:
+                self.report.add_image(label, 'sequence', features, cached=True)
+            for _ in range(counts['no_hand']):
+                self.report.add_image(label, 'sequence', None, cached=True)
+            for _ in range(counts['decode_failures']):
+                self.report.add_image(label, 'sequence', None, cached=True, decode_failed=True)
         
+        self.report.add_time(label, 'sequence', wall_s=time.perf_counter() - start)
+        return self._add_sequence(list(frames), label, data, labels, video_path, frames_read)
+
+    def _add_sequence(self, all_frames_features, label, data, labels, source, frames_read):
+        windows = num_windows(len(all_frames_features), SEQUENCE_LENGTH)
+        self.report.add_sequence(label, os.path.relpath(source, self.data_dir), frames_read,
+                                 len(all_frames_features), windows)
+        # Une matrice (frames, 84) par vidéo : les fenêtres glissantes de SEQUENCE_LENGTH
+        # frames (pas adaptatif, étirement des vidéos courtes, copie bruitée) sont construites
+        # à l'entraînement par dataset_store.SequenceDataset, sans dupliquer les frames
+        if len(all_frames_features) > MIN_UPSAMPLE_FRAMES:
+            data.append(np.stack(all_frames_features))
+            labels.append(label)
+            print(f"  - Stored {len(all_frames_features)} frames for '{label}' ({windows} windows of {SEQUENCE_LENGTH})")
+            return len(all_frames_features)
+
+        print(f"  - Warning: Not enough frames for '{label}' sequence ({len(all_frames_features)} frames). Skipping.")
+        return 0
+
+    def list_targets(self):
+        """Liste ordonnée des (label, dossier ou fichier vidéo) à traiter
+
+        Un fichier vidéo `bonjour.mp4` à côté des dossiers donne le label 'bonjour' ;
+        les vidéos d'un dossier de mot sont autant d'enregistrements de ce mot.
+        """
+        targets = []
+        folders = []
         for dir_ in sorted(os.listdir(self.data_dir)):
             dir_path = os.path.join(self.data_dir, dir_)
+            if _is_video(dir_path):
+                targets.append((os.path.splitext(dir_)[0], dir_path))
             if not os.path.isdir(dir_path): continue
             
             # Check for subdirectories (hierarchical categories)
             items = os.listdir(dir_path)
             subdirs = [d for d in items if os.path.isdir(os.path.join(dir_path, d))]
             
-            targets = []
             if subdirs:
-                for sub in subdirs: targets.append((sub, os.path.join(dir_path, sub)))
+                for sub in subdirs: folders.append((sub, os.path.join(dir_path, sub)))
+                for video in _list_videos(dir_path):
+                    targets.append((os.path.splitext(os.path.basename(video))[0], video))
             else:
-                targets.append((dir_, dir_path))
-            
+                folders.append((dir_, dir_path))
+        
+        for label, path in folders:
+            videos = _list_videos(path) if len(label) > 1 else []
+            if not videos or _list_files(path):
+                targets.append((label, path))
+            targets.extend((label, video) for video in videos)
+        if self.classes:
+            targets = [(label, path) for label, path in targets if label in self.classes]
+        return targets
+
+    def extract_landmarks(self):
+        """Extrait et sauvegarde les datasets. Retourne les statistiques du cache (tous processus)."""
+        data_static = []
+        labels_static = []
+        
+        data_sequence = []
+        labels_sequence = []
+        
+        print(f"Parsing directories in {self.data_dir}...")
+        start = time.perf_counter()
+        self.report = BuildReport()
+        targets = self.list_targets()
+        
+        if self.workers > 1:
+            cache_stats = self._extract_parallel(targets, data_static, labels_static, data_sequence, labels_sequence)
+        else:
             for label, path in targets:
                 # HEURISTIQUE: Si le label a 1 seule lettre -> Static (A-Z)
-                # Sinon -> Sequence (Mots)
-                if len(label) == 1:
+                # Sinon -> Sequence (Mots) ; un fichier vidéo est toujours une séquence
+                if _is_video(path):
+                    print(f"Processing SEQUENCE video: {label} ({os.path.basename(path)})")
+                    self.process_video_file(path, label, data_sequence, labels_sequence)
+                elif len(label) == 1:
                     print(f"Processing STATIC category: {label}")
                     self.process_static_folder(path, label, data_static, labels_static)
                 else:
                     print(f"Processing SEQUENCE category: {label}")
                     self.process_sequence_folder(path, label, data_sequence, labels_sequence)
+            cache_stats = self.cache_stats()
+        
+        elapsed = time.perf_counter() - start
+        self.report.save(self.report_file, elapsed)
+        self.report.print_summary(elapsed)
+        print(f"Build report saved to {self.report_file}")
+        
+        if self.use_cache:
+            print(f"Landmark cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.1%}) - {self.cache_path}")
         
         # Save Static Data (Letters)
+        if data_static and (self.dedup_threshold or self.max_per_class):
+            keep, report = prune_dataset(data_static, labels_static, self.dedup_threshold or 0, self.max_per_class)
+            print_report(report)
+            data_static = [data_static[i] for i in keep]
+            labels_static = [labels_static[i] for i in keep]
+        save_static, save_sequence = (merge_classes, merge_classes) if self.classes else (save_dataset, save_frame_dataset)
         if data_static:
-            with open(self.pickle_file_static, 'wb') as f:
-                pickle.dump({'data': data_static, 'labels': labels_static}, f)
-            print(f"\n✅ Static Dataset saved: {len(data_static)} samples ({len(data_static[0])} features/sample)")
+            path = save_static(self.dataset_static, data_static, labels_static,
+                               meta={'data_dir': self.data_dir,
+                                     'dedup': {'threshold': self.dedup_threshold, 'max_per_class': self.max_per_class}})
+            if self.classes:
+                # merge_classes a réécrit tout le dataset : total relu sur disque
+                total = len(load_dataset(self.dataset_static)[1])
+                print(f"\n✅ Static Dataset saved to {path}: {total} samples "
+                      f"({len(data_static)} extracted for {sorted(self.classes)})")
+            else:
+                print(f"\n✅ Static Dataset saved to {path}: {len(data_static)} samples ({len(data_static[0])} features/sample)")
             
         # Save Sequence Data (Words)
         if data_sequence:
-            with open(self.pickle_file_sequence, 'wb') as f:
-                pickle.dump({'data': data_sequence, 'labels': labels_sequence}, f)
-            print(f"✅ Sequence Dataset saved: {len(data_sequence)} samples ({len(data_sequence[0])} features/sample)")
+            path = save_sequence(self.dataset_sequence, data_sequence, labels_sequence,
+                                 meta={'data_dir': self.data_dir, 'sequence_length': SEQUENCE_LENGTH})
+            total_videos, total_frames = len(data_sequence), sum(len(v) for v in data_sequence)
+            if self.classes:
+                merged = load_sequence_dataset(self.dataset_sequence)
+                total_videos, total_frames = len(merged), len(merged.frames)
+            print(f"✅ Sequence Dataset saved to {path}: {total_videos} videos, {total_frames} frames "
+                  f"(windows of {SEQUENCE_LENGTH} built at training time)")
+            if self.classes:
+                print(f"   {len(data_sequence)} videos extracted for {sorted(self.classes)}")
         
         if not data_static and not data_sequence:
             print("\n❌ No data collected. Check your Data directory structure.")
+        return cache_stats
+
+    def _extract_parallel(self, targets, data_static, labels_static, data_sequence, labels_sequence):
+        """Répartit les dossiers sur un pool de processus (un HandLandmarker par worker).
+
+        Les lettres sont découpées en lots d'images, chaque dossier de mot reste une seule
+        tâche (ordre des frames conservé). Les résultats sont fusionnés dans l'ordre des
+        tâches : le dataset est identique à celui de l'extraction séquentielle.
+        Retourne les statistiques cumulées du cache des workers.
+        """
+        tasks = []
+        for label, path in targets:
+            if _is_video(path):
+                tasks.append((_extract_video_file, path, label))
+            elif len(label) == 1:
+                files = _list_files(path)
+                for start in range(0, len(files), STATIC_SHARD_SIZE):
+                    tasks.append((_extract_static_shard, files[start:start + STATIC_SHARD_SIZE], label))
+            else:
+                tasks.append((_extract_sequence_folder, path, label))
+
+        print(f"Extracting {len(targets)} categories with {self.workers} workers ({len(tasks)} tasks)...")
+        results = [None] * len(tasks)
+        # 'spawn' : pas de fork d'un processus ayant déjà chargé MediaPipe / TensorFlow
+        ctx = multiprocessing.get_context('spawn')
+        worker_args = (self.data_dir, self.use_cache, self.cache_hash, self.track_sequences,
+                       self.decode_max_size, self.video_fps)
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=worker_args) as pool:
+            futures = {pool.submit(func, arg, label): i for i, (func, arg, label) in enumerate(tasks)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                kind = "STATIC" if tasks[i][0] is _extract_static_shard else "SEQUENCE"
+                print(f"[{done}/{len(tasks)}] {kind} {tasks[i][2]}: {len(results[i][0])} items")
+
+        hits = misses = 0
+        for (func, _, _), (data, labels, stats, report) in zip(tasks, results):
+            self.report.merge(report)
+            if func is _extract_static_shard:
+                data_static.extend(data)
+                labels_static.extend(labels)
+            else:
+                data_sequence.extend(data)
+                labels_sequence.extend(labels)
+            hits += stats['hits']
+            misses += stats['misses']
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total, 3) if total else 0.0}
+
+
+def _is_video(path):
+    return path.lower().endswith(VIDEO_EXTENSIONS) and os.path.isfile(path)
+
+def _list_files(folder_path):
+    """Chemins des images (fichiers hors vidéos) d'un dossier, triés par nom"""
+    names = sorted(os.listdir(folder_path))
+    paths = [os.path.join(folder_path, n) for n in names]
+    return [p for p in paths if os.path.isfile(p) and not _is_video(p)]
+
+def _list_videos(folder_path):
+    """Chemins des fichiers vidéo d'un dossier, triés par nom"""
+    return [os.path.join(folder_path, n) for n in sorted(os.listdir(folder_path))
+            if _is_video(os.path.join(folder_path, n))]
+
+
+# --- Workers de l'extraction parallèle (un extracteur, donc un landmarker, par processus) ---
+_worker_extractor = None
+
+def _init_worker(data_dir, use_cache, cache_hash, track_sequences, decode_max_size, video_fps):
+    global _worker_extractor
+    _worker_extractor = HandLandmarkExtractor(data_dir, workers=1, use_cache=use_cache, cache_hash=cache_hash,
+                                              track_sequences=track_sequences, decode_max_size=decode_max_size,
+                                              video_fps=video_fps)
+
+def _run_task(method, arg, label):
+    """Exécute une tâche ; retourne (data, labels, stats du cache, rapport) pour cette tâche."""
+    data, labels = [], []
+    _worker_extractor.report = BuildReport()
+    before = _worker_extractor.cache_stats()
+    method(_worker_extractor, arg, label, data, labels)
+    after = _worker_extractor.cache_stats()
+    stats = {'hits': after['hits'] - before['hits'], 'misses': after['misses'] - before['misses']}
+    return data, labels, stats, _worker_extractor.report.state()
+
+def _extract_static_shard(img_paths, label):
+    return _run_task(HandLandmarkExtractor.process_static_files, img_paths, label)
+
+def _extract_sequence_folder(folder_path, label):
+    return _run_task(HandLandmarkExtractor.process_sequence_folder, folder_path, label)
+
+def _extract_video_file(video_path, label):
+    return _run_task(HandLandmarkExtractor.process_video_file, video_path, label)
 
 
 if __name__ == "__main__":
-    extractor = HandLandmarkExtractor()
+    parser = argparse.ArgumentParser(description="Extraction des landmarks du dossier Data/")
+    parser.add_argument('--data-dir', default='./Data')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Nombre de processus d'extraction (1 = séquentiel)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignorer le cache des landmarks (tout re-détecter)")
+    parser.add_argument('--cache-hash', action='store_true',
+                        help="Valider le cache par SHA-1 du contenu plutôt que par mtime")
+    parser.add_argument('--no-tracking', action='store_true',
+                        help="Dossiers de mots détectés image par image (mode IMAGE) au lieu du suivi VIDEO")
+    parser.add_argument('--decode-max-size', type=int, default=None,
+                        help="Décoder à 1/2 ou 1/4 les images dont le plus grand côté dépasse 2x/4x cette taille")
+    parser.add_argument('--video-fps', type=float, default=None,
+                        help="Sous-échantillonner les fichiers vidéo à ~N images/s (défaut: toutes les frames)")
+    parser.add_argument('--dedup-threshold', type=float, default=0.005,
+                        help="Lettres : déplacement max d'un landmark sous lequel deux images sont des doublons (0 = garder tout)")
+    parser.add_argument('--max-per-class', type=int, default=None,
+                        help="Lettres : nombre max d'échantillons représentatifs gardés par classe")
+    parser.add_argument('--classes', default=None,
+                        help="N'extraire que ces classes (séparées par des virgules) et les fusionner "
+                             "dans les datasets existants")
+    args = parser.parse_args()
+
+    extractor = HandLandmarkExtractor(args.data_dir, workers=args.workers,
+                                      use_cache=not args.no_cache, cache_hash=args.cache_hash,
+                                      track_sequences=not args.no_tracking,
+                                      decode_max_size=args.decode_max_size, video_fps=args.video_fps,
+                                      dedup_threshold=args.dedup_threshold, max_per_class=args.max_per_class,
+                                      classes=args.classes.split(',') if args.classes else None)
     extractor.extract_landmarks()
@@ -0,0 +1,102 @@
+"""Suppression des quasi-doublons du dataset statique, dans l'espace des landmarks normalisés.
+
+collect_imgs enregistre 100 frames consécutives par classe : beaucoup sont presque
+identiques et ne font que grossir le dataset, l'entraînement et la forêt.
+
+Deux échantillons d'une même classe sont des doublons si aucun landmark ne s'est
+déplacé de plus de `threshold` (même mesure que MotionGate). Le premier rencontré est
+gardé. Les voisins candidats viennent d'un KD-tree (rayon euclidien sur les 84
+valeurs), la distance exacte est ensuite vérifiée en vectoriel. Avec `max_per_class`,
+un sous-ensemble représentatif est choisi parmi les survivants par échantillonnage
+du point le plus éloigné.
+
+    python dataset_dedup.py data --threshold 0.005 --max-per-class 300
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def max_displacement(samples, reference):
+    """Plus grand déplacement d'un landmark (x, y) entre chaque échantillon et `reference`."""
+    diff = (np.asarray(samples, dtype=np.float32) - reference).reshape(len(samples), -1, 2)
+    return np.sqrt(np.square(diff).sum(axis=2)).max(axis=1)
+
+
+def near_duplicate_mask(features, threshold):
+    """Masque des échantillons gardés (parcours glouton dans l'ordre)."""
+    n = len(features)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0 or threshold <= 0:
+        keep[:] = True
+        return keep
+    features = np.asarray(features, dtype=np.float32)
+    # Un déplacement max < threshold par point implique une distance euclidienne < threshold * sqrt(points)
+    radius = threshold * np.sqrt(features.shape[1] // 2)
+    tree = cKDTree(features)
+    suppressed = np.zeros(n, dtype=bool)
+    for i in range(n):
+        if suppressed[i]:
+            continue
+        keep[i] = True
+        candidates = np.asarray(tree.query_ball_point(features[i], radius), dtype=np.intp)
+        candidates = candidates[(candidates > i) & ~suppressed[candidates]]
+        if len(candidates):
+            suppressed[candidates[max_displacement(features[candidates], features[i]) < threshold]] = True
+    return keep
+
+
+def farthest_point_subset(features, budget):
+    """Indices (triés) de `budget` échantillons couvrant au mieux l'espace (premier = index 0)."""
+    features = np.asarray(features, dtype=np.float32)
+    if len(features) <= budget:
+        return np.arange(len(features))
+    chosen = [0]
+    min_dist = np.linalg.norm(features - features[0], axis=1)
+    for _ in range(budget - 1):
+        nxt = int(np.argmax(min_dist))
+        chosen.append(nxt)
+        np.minimum(min_dist, np.linalg.norm(features - features[nxt], axis=1), out=min_dist)
+    return np.sort(chosen)
+
+
+def prune_dataset(data, labels, threshold=0.005, max_per_class=None):
+    """Retourne (indices gardés triés, rapport {classe: {before, after, removed}})."""
+    data = np.asarray(data, dtype=np.float32)
+    labels = np.asarray(labels)
+    kept = []
+    report = {}
+    for label in np.unique(labels):
+        idx = np.flatnonzero(labels == label)
+        survivors = idx[near_duplicate_mask(data[idx], threshold)]
+        if max_per_class and len(survivors) > max_per_class:
+            survivors = survivors[farthest_point_subset(data[survivors], max_per_class)]
+        kept.append(survivors)
+        report[str(label)] = {'before': len(idx), 'after': len(survivors), 'removed': len(idx) - len(survivors)}
+    keep = np.sort(np.concatenate(kept)) if kept else np.zeros(0, dtype=np.intp)
+    return keep, report
+
+
+def print_report(report):
+    before = sum(r['before'] for r in report.values())
+    after = sum(r['after'] for r in report.values())
+    for label, r in report.items():
+        if r['removed']:
+            print(f"  - {label}: {r['before']} -> {r['after']} ({r['removed']} near-duplicates removed)")
+    print(f"Dedup: {before} -> {after} samples ({before - after} removed)")
+
+
+if __name__ == "__main__":
+    import argparse
+    from dataset_store import load_dataset, save_dataset
+
+    parser = argparse.ArgumentParser(description="Suppression des quasi-doublons d'un dataset statique")
+    parser.add_argument('dataset', nargs='?', default='data')
+    parser.add_argument('--threshold', type=float, default=0.005)
+    parser.add_argument('--max-per-class', type=int, default=None)
+    args = parser.parse_args()
+
+    data, labels, meta = load_dataset(args.dataset, mmap=False)
+    keep, report = prune_dataset(data, labels, args.threshold, args.max_per_class)
+    print_report(report)
+    meta = dict(meta, dedup={'threshold': args.threshold, 'max_per_class': args.max_per_class})
+    print(f"✅ {save_dataset(args.dataset, data[keep], labels[keep], meta)}")
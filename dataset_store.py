@@ -0,0 +1,308 @@
+"""Stockage colonne des datasets : features float32 contiguës (.npy) + labels/métadonnées (.json).
+
+    data.npy    -> tableau (N, F) float32, chargé avec np.load(mmap_mode='r')
+    data.json   -> {"version", "shape", "dtype", "classes", "labels" (indices), "meta"}
+
+Un float Python dans une liste coûte ~4x un float32 et l'unpickle du dataset de
+séquences dominait le temps de chargement. L'ancien format `data.pickle`
+({'data': [...], 'labels': [...]}) reste lisible en secours.
+
+Les séquences (mots) sont stockées par vidéo (`"kind": "frames"`) : une matrice
+(frames, 84) par vidéo, concaténées une seule fois dans le .npy. Les fenêtres de
+`sequence_length` frames ne sont construites qu'au chargement (voir SequenceDataset),
+la longueur et le pas se choisissent donc à l'entraînement sans ré-extraction.
+"""
+import json
+import os
+import pickle
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FORMAT_VERSION = 1
+
+# Vidéos plus courtes que la fenêtre mais d'au moins MIN_UPSAMPLE_FRAMES + 1 frames : étirées
+MIN_UPSAMPLE_FRAMES = 10
+
+
+def dataset_paths(path):
+    """Chemins (features .npy, métadonnées .json, ancien .pickle) pour `data`, `data.npy` ou `data.pickle`."""
+    stem = os.path.splitext(path)[0] if path.endswith(('.npy', '.json', '.pickle')) else path
+    return stem + '.npy', stem + '.json', stem + '.pickle'
+
+
+def dataset_exists(path):
+    npy_path, json_path, pickle_path = dataset_paths(path)
+    return (os.path.exists(npy_path) and os.path.exists(json_path)) or os.path.exists(pickle_path)
+
+
+def save_dataset(path, data, labels, meta=None):
+    """Écrit un dataset (N, F) : un vecteur de features par label."""
+    features = np.ascontiguousarray(np.asarray(data, dtype=np.float32))
+    if features.ndim != 2 or len(features) != len(labels):
+        raise ValueError(f"Dataset attendu (N, F) avec N labels, reçu {features.shape} / {len(labels)} labels")
+    return _write_dataset(path, features, _header(features, labels, meta))
+
+
+def _header(features, labels, meta):
+    classes, indices = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    return {
+        'version': FORMAT_VERSION,
+        'shape': list(features.shape),
+        'dtype': 'float32',
+        'classes': classes.tolist(),
+        'labels': indices.astype(int).tolist(),
+        'meta': meta or {},
+    }
+
+
+def _write_dataset(path, features, header):
+    """Écriture atomique : fichiers temporaires puis renommage."""
+    npy_path, json_path, _ = dataset_paths(path)
+    tmp_npy = npy_path + '.tmp'
+    with open(tmp_npy, 'wb') as f:
+        np.save(f, features)
+    tmp_json = json_path + '.tmp'
+    with open(tmp_json, 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False)
+    os.replace(tmp_npy, npy_path)
+    os.replace(tmp_json, json_path)
+    return npy_path
+
+
+def save_frame_dataset(path, videos, labels, meta=None):
+    """Écrit un dataset de séquences : une matrice (frames, F) par vidéo, stockée une seule fois."""
+    videos = [np.asarray(v, dtype=np.float32).reshape(len(v), -1) for v in videos]
+    if len(videos) != len(labels):
+        raise ValueError(f"Un label par vidéo attendu, reçu {len(videos)} vidéos / {len(labels)} labels")
+    frames = np.concatenate(videos)
+    lengths = [len(v) for v in videos]
+    header = _header(frames, labels, meta)  # labels : un par vidéo
+    header['kind'] = 'frames'
+    header['offsets'] = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(int).tolist()
+    header['lengths'] = lengths
+    return _write_dataset(path, frames, header)
+
+
+class SequenceDataset:
+    """Frames par vidéo + fenêtres glissantes calculées à la demande.
+
+    `frames` est le tableau (total_frames, F) (memmap), chaque vidéo en est une tranche.
+    """
+
+    def __init__(self, frames, offsets, lengths, labels, meta=None):
+        self.frames = frames
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        self.lengths = np.asarray(lengths, dtype=np.intp)
+        self.labels = np.asarray(labels)
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def video(self, i):
+        """Frames (T, F) de la vidéo i (vue, sans copie)."""
+        return self.frames[self.offsets[i]:self.offsets[i] + self.lengths[i]]
+
+    def video_windows(self, i, length, stride=1):
+        """Fenêtres (N, length, F) de la vidéo i : vue à pas (strides), sans copie."""
+        video = self.video(i)
+        if len(video) < length:
+            return np.empty((0, length, video.shape[1]), dtype=video.dtype)
+        return sliding_window_view(video, length, axis=0)[::stride].transpose(0, 2, 1)
+
+    def window_index(self, length, stride=None):
+        """Index paresseux des fenêtres complètes : tableau (N, 2) de (vidéo, début)."""
+        pairs = [(v, start)
+                 for v, n in enumerate(self.lengths) if n >= length
+                 for start in range(0, n - length + 1, stride or adaptive_stride(n))]
+        return np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+
+    def time_blocks(self, length, min_groups):
+        """Nombre de blocs temporels par vidéo pour que chaque classe ait `min_groups` groupes.
+
+        Une classe filmée en une seule vidéo (un dossier Data/<mot>/) voit sa vidéo coupée
+        en blocs contigus, chacun assez long pour contenir au moins une fenêtre.
+        """
+        classes, per_class = np.unique(self.labels, return_counts=True)
+        videos_of_class = dict(zip(classes, per_class))
+        blocks = np.ones(len(self), dtype=np.intp)
+        for v, n in enumerate(self.lengths):
+            wanted = -(-min_groups // videos_of_class[self.labels[v]])
+            blocks[v] = max(1, min(wanted, n // length))
+        return blocks
+
+    def windows(self, length, stride=None, min_windows=2, noise=0.01, seed=None, groups=False, blocks=None):
+        """Matérialise (X (N, length*F) float32, y) pour l'entraînement.
+
+        Comme l'ancien create_dataset : pas adaptatif si `stride` est None, vidéos
+        courtes (> MIN_UPSAMPLE_FRAMES frames) étirées à `length`, et une copie bruitée
+        de la dernière fenêtre pour les vidéos n'en produisant qu'une (`min_windows`).
+        Avec `groups=True`, retourne aussi le groupe de chaque fenêtre : la vidéo source,
+        ou le bloc (vidéo, bloc temporel) avec `blocks` (nombre de blocs par vidéo, voir
+        time_blocks). Les fenêtres à cheval sur deux blocs sont écartées.
+        """
+        rng = np.random.default_rng(seed)
+        if blocks is None:
+            blocks = np.ones(len(self), dtype=np.intp)
+        first_group = np.concatenate([[0], np.cumsum(blocks)[:-1]])
+        rows, labels, noisy, videos = [], [], [], []
+        for v, n in enumerate(self.lengths):
+            base = self.offsets[v]
+            video_groups = None
+            if n >= length:
+                starts = np.arange(0, n - length + 1, stride or adaptive_stride(n))
+                if blocks[v] > 1:
+                    # Bloc b = frames [b*n/blocks, (b+1)*n/blocks)
+                    block = starts * blocks[v] // n
+                    starts = starts[(starts + length - 1) * blocks[v] // n == block]
+                video_groups = list(first_group[v] + starts * blocks[v] // n)
+                video_rows = [base + start + np.arange(length) for start in starts]
+            elif n > MIN_UPSAMPLE_FRAMES:
+                video_rows = [base + np.linspace(0, n - 1, length, dtype=int)]
+            else:
+                continue
+            if video_groups is None:
+                video_groups = [first_group[v]] * len(video_rows)
+            missing = min_windows - len(video_rows)
+            if missing > 0:
+                first = len(rows) + len(video_rows)
+                noisy.extend(range(first, first + missing))
+                video_rows += [video_rows[-1]] * missing
+                video_groups += [video_groups[-1]] * missing
+            rows.extend(video_rows)
+            labels.extend([self.labels[v]] * len(video_rows))
+            videos.extend(video_groups)
+
+        num_features = self.frames.shape[1] if self.frames.ndim == 2 else 0
+        if not rows:
+            X = np.zeros((0, length * num_features), dtype=np.float32)
+        else:
+            X = self.frames[np.stack(rows)].reshape(len(rows), length * num_features)
+        if noisy:
+            X[noisy] += rng.normal(0, noise, (len(noisy), X.shape[1])).astype(np.float32)
+        if groups:
+            return X, np.asarray(labels), np.asarray(videos, dtype=np.intp)
+        return X, np.asarray(labels)
+
+
+def num_windows(num_frames, length, stride=None, min_windows=2):
+    """Nombre de fenêtres que SequenceDataset.windows produira pour une vidéo."""
+    if num_frames >= length:
+        count = len(range(0, num_frames - length + 1, stride or adaptive_stride(num_frames)))
+    elif num_frames > MIN_UPSAMPLE_FRAMES:
+        count = 1
+    else:
+        return 0
+    return max(count, min_windows)
+
+
+def adaptive_stride(num_frames):
+    """Pas adaptatif : plus d'échantillons pour les vidéos courtes."""
+    if num_frames < 60:
+        return 1
+    if num_frames < 100:
+        return 2
+    return 4
+
+
+def _read_header(path):
+    npy_path, json_path, _ = dataset_paths(path)
+    if not (os.path.exists(npy_path) and os.path.exists(json_path)):
+        return None
+    with open(json_path, encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Version de dataset non supportée: {header.get('version')} ({json_path})")
+    return header
+
+
+def _load_features(path, header, mmap):
+    npy_path = dataset_paths(path)[0]
+    features = np.load(npy_path, mmap_mode='r' if mmap else None)
+    if list(features.shape) != header['shape']:
+        raise ValueError(f"{npy_path}: forme {features.shape} != {header['shape']} annoncée")
+    return features
+
+
+def load_sequence_dataset(path, mmap=True):
+    """Charge un dataset de séquences par vidéo (`"kind": "frames"`)."""
+    header = _read_header(path)
+    if header is None or header.get('kind') != 'frames':
+        raise ValueError(f"{path}: pas un dataset de frames par vidéo")
+    labels = np.asarray(header['classes'])[np.asarray(header['labels'], dtype=np.intp)]
+    return SequenceDataset(_load_features(path, header, mmap), header['offsets'], header['lengths'],
+                           labels, header.get('meta', {}))
+
+
+def load_dataset(path, mmap=True, sequence_length=None, stride=None, groups=False, min_groups=None):
+    """Retourne (features float32 (N, F), labels (N,) str, meta).
+
+    Format colonne si présent (memmap en lecture seule), sinon ancien pickle.
+    Pour un dataset de frames par vidéo, les fenêtres sont construites ici
+    (`sequence_length` par défaut : celle de l'extraction ; `stride` None = adaptatif).
+    Avec `groups=True`, un 4e élément donne la vidéo source de chaque fenêtre (None
+    pour un dataset statique), pour ne pas couper une vidéo entre entraînement et test.
+    Avec `min_groups`, les vidéos des classes qui en ont moins sont coupées en blocs
+    temporels (SequenceDataset.time_blocks), comptés dans meta['split_videos'].
+    Lève FileNotFoundError si aucun des deux n'existe.
+    """
+    npy_path, json_path, pickle_path = dataset_paths(path)
+    header = _read_header(path)
+    if header is not None:
+        if header.get('kind') == 'frames':
+            dataset = load_sequence_dataset(path, mmap)
+            length = sequence_length or dataset.meta['sequence_length']
+            blocks = dataset.time_blocks(length, min_groups) if min_groups else None
+            features, labels, videos = dataset.windows(length, stride, groups=True, blocks=blocks)
+            meta = dict(dataset.meta, sequence_length=length, stride=stride,
+                        split_videos=int((blocks > 1).sum()) if blocks is not None else 0)
+            return (features, labels, meta, videos) if groups else (features, labels, meta)
+        features = _load_features(path, header, mmap)
+        labels = np.asarray(header['classes'])[np.asarray(header['labels'], dtype=np.intp)]
+        meta = header.get('meta', {})
+    elif os.path.exists(pickle_path):
+        print(f"[WARNING] {npy_path} absent, lecture de l'ancien format {pickle_path}")
+        with open(pickle_path, 'rb') as f:
+            data_dict = pickle.load(f)
+        features = np.asarray(data_dict['data'], dtype=np.float32)
+        labels = np.asarray(data_dict['labels'])
+        meta = {}
+    else:
+        raise FileNotFoundError(f"Dataset introuvable: {npy_path} / {pickle_path}")
+    return (features, labels, meta, None) if groups else (features, labels, meta)
+
+
+def merge_classes(path, data, labels, meta=None):
+    """Remplace dans le dataset existant les classes de `labels` et garde toutes les autres.
+
+    `data` : vecteurs (N, F) pour un dataset statique, vidéos (frames, F) pour un dataset
+    de frames. Sans dataset existant, équivaut à save_dataset / save_frame_dataset.
+    """
+    labels = [str(label) for label in labels]
+    header = _read_header(path)
+    if header is not None and header.get('kind') == 'frames':
+        old = load_sequence_dataset(path, mmap=False)
+        keep = np.flatnonzero(~np.isin(old.labels, labels))
+        videos = [old.video(i) for i in keep] + list(data)
+        return save_frame_dataset(path, videos, old.labels[keep].tolist() + labels, dict(old.meta, **(meta or {})))
+    if header is None and not dataset_exists(path):
+        return save_dataset(path, data, labels, meta)
+    old_data, old_labels, old_meta = load_dataset(path, mmap=False)
+    keep = ~np.isin(old_labels, labels)
+    features = np.concatenate([old_data[keep], np.asarray(data, dtype=np.float32).reshape(len(labels), -1)])
+    return save_dataset(path, features, old_labels[keep].tolist() + labels, dict(old_meta, **(meta or {})))
+
+
+def convert_pickle(pickle_path):
+    """Convertit un ancien dataset pickle au format colonne. Retourne le chemin du .npy."""
+    with open(pickle_path, 'rb') as f:
+        data_dict = pickle.load(f)
+    return save_dataset(pickle_path, data_dict['data'], data_dict['labels'], meta={'source': os.path.basename(pickle_path)})
+
+
+if __name__ == "__main__":
+    import sys
+    for legacy in sys.argv[1:] or ['data.pickle', 'sequence_data.pickle']:
+        if os.path.exists(legacy):
+            print(f"✅ {legacy} -> {convert_pickle(legacy)}")
@@ -0,0 +1,84 @@
+"""Distillation des forêts de train_classifier.py vers un petit réseau dense (TFLite).
+
+L'élève n'apprend pas les labels bruts mais les probabilités `predict_proba` de la
+forêt (le professeur), sur les landmarks réels et sur des copies augmentées tirées à
+chaque lot : il reproduit aussi le comportement de la forêt autour des données.
+Ce module ne dépend pas de TensorFlow (voir convert_to_tflite_v2.py --distill).
+"""
+import json
+import time
+
+import numpy as np
+
+
+def teacher_batches(teacher, X, batch_size=32, augmenter=None, seed=None):
+    """Générateur infini de lots (X, probabilités du professeur), ordre mélangé à chaque époque.
+
+    Avec `augmenter`, chaque lot réel est suivi de sa version augmentée (lot de 2 x batch_size).
+    """
+    X = np.asarray(X, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    while True:
+        order = rng.permutation(len(X))
+        for start in range(0, len(order), batch_size):
+            batch = X[np.sort(order[start:start + batch_size])]
+            if augmenter is not None:
+                batch = np.concatenate([batch, augmenter.augment(batch)])
+            yield batch, teacher.predict_proba(batch).astype(np.float32)
+
+
+def agreement(teacher_proba, student_proba, classes):
+    """Accord top-1 global et par classe (classe prédite par la forêt), écart moyen des probabilités."""
+    teacher_top = np.argmax(teacher_proba, axis=1)
+    same = teacher_top == np.argmax(student_proba, axis=1)
+    return {
+        'top1': round(float(same.mean()), 4) if len(same) else 0.0,
+        'mean_abs_proba_diff': round(float(np.abs(teacher_proba - student_proba).mean()), 5) if len(same) else 0.0,
+        'per_class': {str(c): round(float(same[teacher_top == i].mean()), 4)
+                      for i, c in enumerate(classes) if (teacher_top == i).any()},
+    }
+
+
+def single_sample_ms(predict, X, repeats=200):
+    """Latence médiane (ms) d'une prédiction sur un seul échantillon."""
+    X = np.asarray(X, dtype=np.float32)
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        sample = X[i % len(X)][None]
+        start = time.perf_counter()
+        predict(sample)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings)) * 1000
+
+
+def distill_report(agreement_real, agreement_augmented, teacher_ms, student_ms, teacher_bytes, student_bytes,
+                   teacher_accuracy=None, student_accuracy=None):
+    return {
+        'agreement': agreement_real,
+        'agreement_augmented': agreement_augmented,
+        'accuracy': {'teacher': teacher_accuracy, 'student': student_accuracy},
+        'latency_ms': {'teacher': round(teacher_ms, 4), 'student': round(student_ms, 4),
+                       'speedup': round(teacher_ms / student_ms, 2) if student_ms else None},
+        'size_bytes': {'teacher': int(teacher_bytes), 'student': int(student_bytes),
+                       'ratio': round(teacher_bytes / student_bytes, 2) if student_bytes else None},
+    }
+
+
+def save_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def print_report(report):
+    latency, size = report['latency_ms'], report['size_bytes']
+    print(f"✅ Accord forêt/élève: {report['agreement']['top1']:.2%} (réel), "
+          f"{report['agreement_augmented']['top1']:.2%} (augmenté)")
+    worst = sorted(report['agreement']['per_class'].items(), key=lambda item: item[1])[:3]
+    if worst and worst[0][1] < 1.0:
+        print("   Classes les moins fidèles: " + ", ".join(f"{c} {a:.0%}" for c, a in worst))
+    accuracy = report['accuracy']
+    if accuracy['teacher'] is not None:
+        print(f"   Précision test: forêt {accuracy['teacher']:.2%} / élève {accuracy['student']:.2%}")
+    print(f"   Latence: forêt {latency['teacher']:.3f} ms / élève {latency['student']:.3f} ms (x{latency['speedup']})")
+    print(f"   Taille: forêt {size['teacher'] / 1e6:.2f} MB / élève {size['student'] / 1e6:.3f} MB (x{size['ratio']})")
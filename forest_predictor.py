@@ -0,0 +1,118 @@
+"""Prédicteur NumPy pour les RandomForestClassifier de train_classifier.py.
+
+sklearn paie à chaque appel `predict_proba` la validation des entrées et le dispatch
+joblib sur tous les coeurs (n_jobs=-1), alors que les applications ne prédisent qu'un
+échantillon par frame. Ici les arbres sont aplatis en tableaux de noeuds (feature,
+seuil, enfants, probabilités des feuilles) et tous les arbres sont parcourus en même
+temps, un niveau de profondeur par itération.
+
+Export vers le fichier .forest des applications : python model_artifact.py model.p
+"""
+import numpy as np
+
+TREE_LEAF = -1
+
+
+def _float32_floor(threshold):
+    """Seuils float32 arrondis vers le bas : pour x float32, x <= t32 <=> x <= t64 (comme sklearn)."""
+    t32 = threshold.astype(np.float32)
+    too_high = t32.astype(np.float64) > threshold
+    t32[too_high] = np.nextafter(t32[too_high], np.float32(-np.inf))
+    return t32
+
+
+def _as_index(array):
+    """Indices : le type entier compact d'un artefact (model_artifact.py) est gardé tel quel."""
+    array = np.asarray(array)
+    return array if array.dtype.kind in 'iu' and array.dtype.itemsize <= 4 else array.astype(np.int32)
+
+
+def quantize(X, scale):
+    """Features float -> int16 à `scale` pas par unité (seuils int16 de model_artifact.py)."""
+    return np.clip(np.floor(X * scale), -32768, 32767).astype(np.int16)
+
+
+class ForestPredictor:
+    """Forêt compilée : même API que sklearn (`classes_`, `predict_proba`, `predict`).
+
+    Avec `scale`, les seuils sont des int16 (floor(seuil * scale)) et les entrées sont
+    quantifiées de la même façon avant le parcours.
+    """
+
+    def __init__(self, classes, roots, feature, threshold, left, right, leaf_id, leaf_values, max_depth,
+                 scale=None):
+        self.classes_ = np.asarray(classes)
+        self.roots = _as_index(roots)
+        self.feature = _as_index(feature)
+        self.scale = scale
+        self.threshold = np.asarray(threshold, dtype=np.int16 if scale else np.float32)
+        self.left = _as_index(left)
+        self.right = _as_index(right)
+        self.leaf_id = _as_index(leaf_id)
+        self.leaf_values = np.asarray(leaf_values, dtype=np.float32)
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Aplatit les `estimators_` d'un RandomForestClassifier (mono-sortie) en tableaux contigus."""
+        roots, feature, threshold, left, right, leaf_id, leaf_values = [], [], [], [], [], [], []
+        offset = 0
+        n_leaves = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == TREE_LEAF
+            node_ids = np.arange(n_nodes)
+
+            # Les feuilles bouclent sur elles-mêmes : le parcours à profondeur fixe s'y arrête
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            left.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            right.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            ids = np.full(n_nodes, -1, dtype=np.int32)
+            ids[is_leaf] = np.arange(n_leaves, n_leaves + is_leaf.sum())
+            leaf_id.append(ids)
+
+            values = tree.value[is_leaf, 0, :]
+            leaf_values.append(values / values.sum(axis=1, keepdims=True))
+
+            offset += n_nodes
+            n_leaves += int(is_leaf.sum())
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            model.classes_, roots,
+            np.concatenate(feature), _float32_floor(np.concatenate(threshold)),
+            np.concatenate(left), np.concatenate(right),
+            np.concatenate(leaf_id), np.concatenate(leaf_values), max_depth,
+        )
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.scale:
+            X = quantize(X, self.scale)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.leaf_values[self.leaf_id[nodes]].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def compile_forest(model):
+    """Retourne un ForestPredictor pour une forêt sklearn, sinon le modèle inchangé."""
+    if model is None or not hasattr(model, 'estimators_'):
+        return model
+    try:
+        return ForestPredictor.from_sklearn(model)
+    except Exception as e:
+        print(f"[WARNING] Compilation de la forêt impossible, sklearn conservé: {e}")
+        return model
@@ -0,0 +1,93 @@
+"""Mise à jour incrémentale d'un RandomForestClassifier entraîné (nouveaux signes).
+
+Ajouter un mot ne doit pas imposer de ré-entraîner toute la forêt :
+
+1. `add_classes` : les arbres existants sont étendus aux nouvelles classes
+   (probabilité 0 dans leurs feuilles, ordre des classes de sklearn conservé)
+2. `refresh_leaves` : les échantillons jamais vus descendent les anciens arbres et
+   s'ajoutent aux comptes des feuilles où ils tombent (structure inchangée) ; un
+   échantillon déjà compté ne doit pas y repasser
+3. `grow_trees` : `warm_start` ajoute des arbres entraînés sur les nouveaux
+   échantillons plus un rappel (replay) des anciennes classes, classes équilibrées
+
+Le résultat reste un RandomForestClassifier ordinaire (model.p, compile_forest).
+La non-régression des anciennes classes est vérifiée par train_classifier.py.
+"""
+import numpy as np
+from sklearn.tree._tree import Tree
+
+TREE_LEAF = -1
+
+
+def add_classes(model, classes):
+    """Étend la forêt (en place) à l'union de ses classes et de `classes`. Retourne les classes ajoutées."""
+    union = np.unique(np.concatenate([np.asarray(model.classes_, dtype=str), np.asarray(classes, dtype=str)]))
+    added = np.setdiff1d(union, model.classes_)
+    if len(added) == 0:
+        return added
+    # Position des anciennes classes dans l'union triée (ordre des colonnes de predict_proba)
+    columns = np.searchsorted(union, model.classes_)
+    for estimator in model.estimators_:
+        state = estimator.tree_.__getstate__()
+        values = state['values']
+        padded = np.zeros(values.shape[:2] + (len(union),), dtype=values.dtype)
+        padded[:, :, columns] = values
+        state['values'] = padded
+        tree = Tree(estimator.tree_.n_features, np.array([len(union)], dtype=np.intp), 1)
+        tree.__setstate__(state)
+        estimator.tree_ = tree
+        # Les arbres d'une forêt sont entraînés sur les indices de classe (0..k-1)
+        estimator.classes_ = np.arange(len(union), dtype=np.float64)
+        estimator.n_classes_ = len(union)
+    model.classes_ = union
+    model.n_classes_ = len(union)
+    return added
+
+
+def refresh_leaves(model, X, y):
+    """Ajoute les échantillons (X, y) aux comptes des feuilles des arbres existants."""
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    if not np.isin(y, model.classes_).all():
+        raise ValueError("Labels inconnus de la forêt : appeler add_classes d'abord")
+    onehot = np.eye(len(model.classes_))[np.searchsorted(model.classes_, y)]
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        leaves = tree.apply(X)
+        values = tree.value  # vue sur le buffer de l'arbre : modifiée en place
+        is_leaf = tree.children_left == TREE_LEAF
+        totals = values[:, 0, :].sum(axis=1, keepdims=True)
+        counts = np.divide(values[:, 0, :], totals, out=np.zeros_like(values[:, 0, :]), where=totals > 0)
+        counts *= tree.weighted_n_node_samples[:, None]
+        np.add.at(counts, leaves, onehot)
+        counts = counts[is_leaf]
+        values[is_leaf, 0, :] = counts / counts.sum(axis=1, keepdims=True)
+
+
+def grow_trees(model, X, y, n_trees):
+    """Ajoute `n_trees` arbres entraînés sur (X, y) ; y doit couvrir toutes les classes de la forêt.
+
+    Poids équilibrés : une classe mise à jour (tous ses échantillons) ne domine pas
+    le rappel limité des autres classes.
+    """
+    y = np.asarray(y)
+    missing = np.setdiff1d(model.classes_, y)
+    if len(missing):
+        raise ValueError(f"Classes absentes du jeu de mise à jour (replay) : {missing.tolist()}")
+    _, inverse, counts = np.unique(y, return_inverse=True, return_counts=True)
+    weights = len(y) / (len(counts) * counts[inverse])
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_trees)
+    model.fit(X, y, sample_weight=weights)
+    model.set_params(warm_start=False)
+    return model
+
+
+def replay_indices(labels, classes, per_class, seed=0):
+    """Indices d'au plus `per_class` échantillons tirés dans chacune des `classes`."""
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    picked = []
+    for label in classes:
+        idx = np.flatnonzero(labels == label)
+        picked.append(rng.choice(idx, min(per_class, len(idx)), replace=False) if len(idx) else idx)
+    return np.sort(np.concatenate(picked)) if picked else np.zeros(0, dtype=np.intp)
@@ -0,0 +1,129 @@
+"""Pipeline multi-threads capture -> détection -> classification -> rendu.
+
+Chaque étape tourne dans son propre thread et communique avec la suivante par un
+`LatestSlot` (file à une seule place) : si l'étape suivante est en retard, la frame
+en attente est remplacée par la plus récente au lieu de s'accumuler.
+"""
+import threading
+import time
+
+
+class LatestSlot:
+    """File bornée à une place : `put` écrase l'élément non consommé (frame périmée)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Attend un élément (au plus `timeout` secondes). Retourne None si rien n'est arrivé."""
+        with self._cond:
+            if not self._has_item:
+                self._cond.wait(timeout)
+            return self._take()
+
+    def get_nowait(self):
+        with self._cond:
+            return self._take()
+
+    def clear(self):
+        with self._cond:
+            self._take()
+
+    def _take(self):
+        if not self._has_item:
+            return None
+        item = self._item
+        self._item = None
+        self._has_item = False
+        return item
+
+
+class PipelineStage(threading.Thread):
+    """Thread qui applique `func` aux éléments de `inbox` et pousse le résultat dans `outbox`.
+
+    Sans `inbox` (étape source), `func()` est appelée en boucle. Un résultat None n'est
+    pas transmis (ex: pas de frame lue, frame ignorée).
+    """
+
+    def __init__(self, name, func, inbox, outbox, stop_event, poll_interval=0.1):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.processed = 0
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                if self.inbox is None:
+                    result = self.func()
+                else:
+                    item = self.inbox.get(timeout=self.poll_interval)
+                    if item is None:
+                        continue
+                    result = self.func(item)
+            except Exception as e:
+                print(f"[ERROR] Étape {self.name}: {e}")
+                time.sleep(self.poll_interval)
+                continue
+
+            self.processed += 1
+            if result is not None and self.outbox is not None:
+                self.outbox.put(result)
+
+
+class FramePipeline:
+    """Enchaîne des étapes `(nom, fonction)` ; la sortie de la dernière va dans `output`.
+
+    La première fonction est la source (sans argument), les suivantes reçoivent le
+    résultat de l'étape précédente.
+    """
+
+    def __init__(self, stages):
+        self.stop_event = threading.Event()
+        self.output = LatestSlot()
+        self.slots = [LatestSlot() for _ in stages[1:]] + [self.output]
+        self.stages = []
+        inbox = None
+        for (name, func), outbox in zip(stages, self.slots):
+            self.stages.append(PipelineStage(name, func, inbox, outbox, self.stop_event))
+            inbox = outbox
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self.stop_event.set()
+        for stage in self.stages:
+            if stage.is_alive():
+                stage.join(timeout)
+
+    def is_running(self):
+        return not self.stop_event.is_set() and any(stage.is_alive() for stage in self.stages)
+
+    def flush(self):
+        """Vide les files intermédiaires (ex: changement de mode ou de caméra)."""
+        for slot in self.slots:
+            slot.clear()
+
+    def stats(self):
+        """Frames traitées et frames périmées abandonnées, par étape."""
+        return {
+            stage.name: {'processed': stage.processed, 'dropped': slot.dropped}
+            for stage, slot in zip(self.stages, self.slots)
+        }
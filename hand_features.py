@@ -0,0 +1,87 @@
+"""Extraction vectorisée des features de main (84 valeurs = 2 mains x 21 points x (x, y)).
+
+Module partagé par create_dataset.py, inference_classifier.py, main.py et
+test_tflite_pc.py : l'entraînement et l'inférence utilisent exactement le même calcul.
+"""
+import numpy as np
+
+NUM_HANDS = 2
+NUM_LANDMARKS = 21
+FEATURE_SHAPE = (NUM_HANDS, NUM_LANDMARKS, 2)
+NUM_FEATURES = NUM_HANDS * NUM_LANDMARKS * 2  # 84
+
+
+def _hand_points(hand):
+    """Accepte une main Tasks API (liste de landmarks) ou Solutions API (objet .landmark)."""
+    return getattr(hand, 'landmark', hand)
+
+
+class HandFeatureExtractor:
+    """Convertit un résultat MediaPipe en tableau float32 (2, 21, 2) sans allocation par frame.
+
+    - `points`   : coordonnées brutes normalisées [0, 1] des mains triées (gauche -> droite)
+    - `features` : coordonnées moins le minimum global (x, y), main absente = 0.0
+    - `flat`     : vue (84,) de `features`, directement utilisable par les modèles
+    """
+
+    def __init__(self, out=None):
+        if out is None:
+            out = np.zeros(FEATURE_SHAPE, dtype=np.float32)
+        elif out.shape != FEATURE_SHAPE or out.dtype != np.float32:
+            raise ValueError(f"Buffer attendu: float32 {FEATURE_SHAPE}, reçu {out.dtype} {out.shape}")
+        self.features = out
+        self.flat = out.reshape(NUM_FEATURES)
+        self.points = np.zeros(FEATURE_SHAPE, dtype=np.float32)
+        self.num_hands = 0
+
+    def update(self, hand_landmarks, offset=None, scale=None):
+        """Remplit `features` depuis une liste de mains. Retourne le nombre de mains (0 si invalide).
+
+        `offset` / `scale` (x, y) ramènent des landmarks détectés sur un crop en
+        coordonnées normalisées de la frame complète (voir hand_roi.py).
+        """
+        self.num_hands = 0
+        if not hand_landmarks or len(hand_landmarks) > NUM_HANDS:
+            return 0
+
+        points = self.points
+        for i, hand in enumerate(hand_landmarks):
+            lms = _hand_points(hand)
+            if len(lms) != NUM_LANDMARKS:
+                return 0
+            points[i] = [(lm.x, lm.y) for lm in lms]
+
+        n = len(hand_landmarks)
+        if scale is not None:
+            points[:n] *= scale
+        if offset is not None:
+            points[:n] += offset
+        # Trier les mains par x du poignet (landmark 0) pour un ordre constant Gauche -> Droite
+        if n == 2 and points[1, 0, 0] < points[0, 0, 0]:
+            points[[0, 1]] = points[[1, 0]]
+
+        active = points[:n]
+        np.subtract(active, active.reshape(-1, 2).min(axis=0), out=self.features[:n])
+        self.features[n:] = 0.0
+        self.num_hands = n
+        return n
+
+    def bbox(self):
+        """Boîte englobante (min_x, min_y, max_x, max_y) en coordonnées normalisées des mains actives."""
+        active = self.points[:self.num_hands].reshape(-1, 2)
+        min_x, min_y = active.min(axis=0)
+        max_x, max_y = active.max(axis=0)
+        return float(min_x), float(min_y), float(max_x), float(max_y)
+
+    def pixel_points(self, width, height):
+        """Landmarks des mains actives en pixels (N, 2) int32, pour le dessin."""
+        active = self.points[:self.num_hands].reshape(-1, 2)
+        return (active * (width, height)).astype(np.int32)
+
+
+def extract_features(hand_landmarks, out=None):
+    """Raccourci ponctuel : retourne un tableau (2, 21, 2) float32, ou None si aucune main valide."""
+    extractor = HandFeatureExtractor(out)
+    if extractor.update(hand_landmarks):
+        return extractor.features
+    return None
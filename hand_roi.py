@@ -0,0 +1,92 @@
+"""Région d'intérêt autour de la main : le détecteur ne reçoit qu'un crop réduit de la frame.
+
+Une fois une main localisée, la frame suivante est recadrée autour de sa boîte
+englobante (+ marge) puis réduite à `input_size` pixels. Les landmarks retournés sont
+relatifs au crop : `offset` / `scale` permettent de les ramener en coordonnées
+normalisées de la frame complète (voir HandFeatureExtractor.update), les features
+restent donc identiques. Sans main (ou toutes les `refresh_interval` frames, pour
+repérer une seconde main hors du crop), la détection repart sur la frame complète.
+
+Avec un détecteur qui suit les mains (mode VIDEO / static_image_mode=False),
+`tracking=True` fige le crop tant que la main est suivie : déplacer l'image d'entrée
+fait perdre le suivi et relance la détection de paume. Pas de rafraîchissement
+périodique dans ce mode ; le crop ne bouge que pour retrouver une main perdue ou
+sortie de sa zone intérieure.
+"""
+import cv2
+
+FULL_FRAME = ((0.0, 0.0), (1.0, 1.0))
+
+
+class HandROI:
+    def __init__(self, margin=0.3, input_size=256, full_frame_size=None, refresh_interval=30, min_size=64,
+                 tracking=False):
+        self.margin = margin
+        self.input_size = input_size
+        self.full_frame_size = full_frame_size
+        self.refresh_interval = 0 if tracking else refresh_interval
+        self.min_size = min_size
+        self.region = None  # (x0, y0, x1, y1) en pixels, None = frame complète
+        self._frames_since_full = 0
+
+    def prepare(self, frame_bgr):
+        """Retourne (image RGB pour le détecteur, offset, scale) pour la frame BGR donnée."""
+        H, W = frame_bgr.shape[:2]
+        self._frames_since_full += 1
+        if self.refresh_interval and self._frames_since_full >= self.refresh_interval:
+            self.region = None
+        elif self.region is not None and (self.region[2] > W or self.region[3] > H):
+            self.region = None  # Changement de source (ex: caméra -> ESP32)
+
+        if self.region is None:
+            self._frames_since_full = 0
+            image = _shrink(frame_bgr, self.full_frame_size)
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB), *FULL_FRAME
+
+        x0, y0, x1, y1 = self.region
+        image = _shrink(frame_bgr[y0:y1, x0:x1], self.input_size)
+        offset = (x0 / W, y0 / H)
+        scale = ((x1 - x0) / W, (y1 - y0) / H)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB), offset, scale
+
+    def update(self, bbox, frame_shape):
+        """Met à jour la région depuis la boîte normalisée (min_x, min_y, max_x, max_y), ou None si main perdue."""
+        if bbox is None:
+            self.region = None
+            return
+
+        H, W = frame_shape[:2]
+        min_x, min_y, max_x, max_y = bbox[0] * W, bbox[1] * H, bbox[2] * W, bbox[3] * H
+
+        # Hystérésis : on garde le crop tant que la main reste dans sa zone intérieure,
+        # pour que le suivi MediaPipe voie une image stable
+        if self.region is not None:
+            x0, y0, x1, y1 = self.region
+            inner = self.margin / (1 + 2 * self.margin) * (x1 - x0) / 2
+            if x0 + inner <= min_x and max_x <= x1 - inner and y0 + inner <= min_y and max_y <= y1 - inner:
+                return
+
+        # Crop carré (pas de déformation pour le détecteur), décalé pour rester dans la frame
+        side = max(max_x - min_x, max_y - min_y) * (1 + 2 * self.margin)
+        side = int(max(side, self.min_size))
+        if side >= min(W, H):
+            self.region = None
+            return
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        x0 = int(min(max(cx - side / 2, 0), W - side))
+        y0 = int(min(max(cy - side / 2, 0), H - side))
+        self.region = (x0, y0, x0 + side, y0 + side)
+
+    def reset(self):
+        self.region = None
+
+
+def _shrink(image, max_size):
+    """Réduit l'image pour que son plus grand côté soit <= max_size (INTER_AREA)."""
+    if not max_size:
+        return image
+    h, w = image.shape[:2]
+    if max(h, w) <= max_size:
+        return image
+    ratio = max_size / max(h, w)
+    return cv2.resize(image, (max(1, int(w * ratio)), max(1, int(h * ratio))), interpolation=cv2.INTER_AREA)
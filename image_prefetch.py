@@ -0,0 +1,103 @@
+"""Lecture + décodage des images du dataset sur un pool de threads, en avance sur le détecteur.
+
+    for path, img, error in ImagePrefetcher(paths, max_size=640):
+        ...
+
+Les images sont rendues dans l'ordre de `paths` ; au plus `queue_size` décodages sont
+en cours ou en attente (mémoire bornée). np.fromfile + cv2.imdecode relâchent le GIL,
+les E/S et le décodage JPEG se recouvrent donc avec l'inférence MediaPipe.
+
+Avec `max_size`, les images nettement plus grandes que nécessaire sont décodées
+directement à 1/2 ou 1/4 (IMREAD_REDUCED_COLOR_*) : le facteur est déterminé sur la
+première image décodée puis réutilisé (un dossier vient d'une même caméra). Une image
+plus petite que prévu est redécodée à un facteur inférieur (jamais sous `max_size`),
+et le facteur du dossier est abaissé en conséquence.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+_REDUCED_FLAGS = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4}
+
+
+def reduction_factor(width, height, max_size):
+    """Plus grand facteur (1, 2, 4) gardant le plus grand côté >= max_size."""
+    if not max_size:
+        return 1
+    largest = max(width, height)
+    for factor in (4, 2):
+        if largest // factor >= max_size:
+            return factor
+    return 1
+
+
+def read_image(path, factor=1):
+    """Décode une image BGR (chemins Unicode supportés sous Windows). None si illisible."""
+    stream = np.fromfile(path, dtype=np.uint8)
+    return cv2.imdecode(stream, _REDUCED_FLAGS[factor])
+
+
+class ImagePrefetcher:
+    def __init__(self, paths, workers=4, queue_size=32, max_size=None):
+        self.paths = list(paths)
+        self.workers = workers
+        self.queue_size = max(1, queue_size)
+        self.max_size = max_size
+        self.factor = None if max_size else 1
+        self.decode_seconds = 0.0  # Temps cumulé de lecture + décodage (tous threads)
+        self._lock = threading.Lock()
+
+    def _decode(self, path):
+        """(chemin, image BGR ou None, exception ou None), sans lever."""
+        start = time.perf_counter()
+        try:
+            if self.factor is None:
+                img = read_image(path)
+                if img is not None:
+                    h, w = img.shape[:2]
+                    self.factor = reduction_factor(w, h, self.max_size)
+                    if self.factor > 1:
+                        # Même échelle pour toutes les images du dossier
+                        img = read_image(path, self.factor)
+                return path, img, None
+            factor = self.factor
+            img = read_image(path, factor)
+            # Dossier mélangé : la réduction ne doit pas passer sous max_size
+            while img is not None and factor > 1 and max(img.shape[:2]) < self.max_size:
+                factor //= 2
+                img = read_image(path, factor)
+            if factor < self.factor:
+                self.factor = factor
+            return path, img, None
+        except Exception as e:
+            return path, None, e
+        finally:
+            with self._lock:
+                self.decode_seconds += time.perf_counter() - start
+
+    def __iter__(self):
+        """Génère (chemin, image BGR ou None, exception ou None) dans l'ordre."""
+        remaining = iter(self.paths)
+        # Facteur de réduction fixé sur la première image lisible, avant de lancer les threads
+        while self.factor is None:
+            path = next(remaining, None)
+            if path is None:
+                return
+            yield self._decode(path)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for path in remaining:
+                pending.append(pool.submit(self._decode, path))
+                if len(pending) >= self.queue_size:
+                    break
+            while pending:
+                future = pending.popleft()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(pool.submit(self._decode, next_path))
+                yield future.result()
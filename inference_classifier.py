@@ -6,7 +6,6 @@ from tkinter import *
 from tkinter import ttk
 from PIL import Image, ImageTk
 import threading
-import pickle
 import pyttsx3
 import time
 import json
@@ -15,9 +14,7 @@ import queue
 from collections import Counter
 
 # Use MediaPipe Tasks API (compatible with 0.10.x)
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-import mediapipe as mp
+from landmark_detector import HandTracker
 
 # Audio additions
 from gtts import gTTS
@@ -27,6 +24,13 @@ import tempfile
 # Voice to Gesture imports
 from speech_to_gesture import create_speech_recognizer
 from gesture_display_utils import get_gesture_image
+from hand_features import HandFeatureExtractor
+from sequence_buffer import SequenceBuffer
+from model_artifact import load_model as load_forest
+from motion_gate import MotionGate
+from hand_roi import HandROI
+from tk_display import TkFrameDisplay
+from latency_profiler import LatencyProfiler
 
 
 class TTSThread(threading.Thread):
@@ -116,22 +120,31 @@ class Camera:
         self.interface = interface
         self.paused = False # Flag pour mettre en pause la caméra (ex: mode vocal)
         
-        # Initialize hand landmarker using Tasks API
-        base_options = python.BaseOptions(model_asset_path='hand_landmarker.task')
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.IMAGE,
-            num_hands=2,
-            min_hand_detection_confidence=0.3, # Match create_dataset (was 0.5)
-            min_hand_presence_confidence=0.3, # Match create_dataset (was 0.5)
-            min_tracking_confidence=0.3       # Match create_dataset (was 0.5)
-        )
-        self.detector = vision.HandLandmarker.create_from_options(options)
+        # Affichage cadencé par la boucle Tk (indépendant de la vitesse d'inférence)
+        self.DISPLAY_FPS = 20
+        # Latence par étape de la boucle : JSON périodique + overlay optionnel
+        self.SHOW_LATENCY = False
+        self.profiler = LatencyProfiler(snapshot_path='latency_stats.json')
+        self.display = TkFrameDisplay(interface.fenetre, label, fps=self.DISPLAY_FPS, profiler=self.profiler)
+        self._letters_text = None
+        
+        # Hand landmarker en mode VIDEO (Tasks API): suivi des mains entre frames. Le détecteur
+        # de paume n'est sauté qu'avec 2 mains suivies (num_hands=2). Seuils 0.3 = create_dataset
+        self.tracker = HandTracker()
+        self.hand_features = HandFeatureExtractor()
+        # Détection sur un crop réduit autour de la dernière main (frame complète si main perdue)
+        # Crop figé pendant le suivi (mode VIDEO), pas de rafraîchissement périodique
+        self.roi = HandROI(margin=0.3, input_size=256, tracking=True)
         
         # Buffers for synchronization and prediction
         self.detected_letters = []
-        self.frame_buffer = [] # Buffer for sequence recognition
         self.SEQUENCE_LENGTH = 15 # Match create_dataset.py
+        self.frame_buffer = SequenceBuffer(self.SEQUENCE_LENGTH) # Buffer for sequence recognition
+        self.MOTION_THRESHOLD = 0.01 # Mode LETTRES: pose tenue -> prédiction réutilisée
+        self.letter_gate = MotionGate(self.MOTION_THRESHOLD)
+        # Changement de mode demandé par le thread Tk, appliqué par le thread caméra
+        # (les buffers ne sont jamais remis à zéro pendant leur utilisation)
+        self._reset_requested = threading.Event()
         
         # Initialiser la caméra avec fallback automatique
         self.cap = self._init_camera()
@@ -161,6 +174,10 @@ class Camera:
                     cap.release()
         return cv2.VideoCapture(0) # Ultimate fallback
 
+    def request_reset(self):
+        """Vide le buffer de séquence et la prédiction mémorisée au prochain tour du thread caméra."""
+        self._reset_requested.set()
+
     def open_camera_thread(self):
         import time
         while self.camera_open:
@@ -170,137 +187,140 @@ class Camera:
                     time.sleep(0.1)
                     continue
                     
-                data_aux = []
-                x_ = []
-                y_ = []
                 self.detected_letters = []
+                if self._reset_requested.is_set():
+                    self._reset_requested.clear()
+                    self.frame_buffer.reset()
+                    self.letter_gate.reset()
                 
-                ret, frame = self.cap.read()
+                with self.profiler.measure('capture'):
+                    ret, frame = self.cap.read()
                 if not ret or frame is None:
                     time.sleep(0.01)
                     continue
                 
                 H, W, _ = frame.shape
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+                with self.profiler.measure('color'):
+                    detector_rgb, roi_offset, roi_scale = self.roi.prepare(frame)
+                with self.profiler.measure('detection'):
+                    results = self.tracker.detect(detector_rgb)
                 
-                results = self.detector.detect(mp_image)
+                # Tri gauche -> droite + normalisation partagés avec create_dataset,
+                # landmarks du crop ramenés en coordonnées de la frame complète
+                with self.profiler.measure('features'):
+                    num_hands = self.hand_features.update(results.hand_landmarks, roi_offset, roi_scale)
+                    self.roi.update(self.hand_features.bbox() if num_hands else None, frame.shape)
 
                 if results.hand_landmarks:
-                    # FIX: SORT HANDS Left-to-Right to match training data
-                    sorted_hands = sorted(results.hand_landmarks, key=lambda h: h[0].x)
-                    
-                    for hand_landmarks in sorted_hands:
-                        for landmark in hand_landmarks:
-                            x_px = int(landmark.x * W)
-                            y_px = int(landmark.y * H)
-                            cv2.circle(frame, (x_px, y_px), 5, (0, 255, 0), -1)
+                    if num_hands:
+                        data_aux = self.hand_features.flat
                         
-                        for landmark in hand_landmarks:
-                            x_.append(landmark.x)
-                            y_.append(landmark.y)
-
-                    if x_ and y_:
-                        min_x = min(x_)
-                        min_y = min(y_)
-                        for hand_landmarks in sorted_hands:
-                            for landmark in hand_landmarks:
-                                data_aux.append(landmark.x - min_x)
-                                data_aux.append(landmark.y - min_y)
-
-                        if len(data_aux) == 42:
-                            data_aux.extend([0.0] * 42)
+                        # 1. Update rolling buffer for Words
+                        self.frame_buffer.append(data_aux)
                         
-                        if len(data_aux) == 84:
-                            # 1. Update rolling buffer for Words
-                            self.frame_buffer.append(data_aux)
-                            if len(self.frame_buffer) > self.SEQUENCE_LENGTH:
-                                self.frame_buffer.pop(0)
-                            
-                            prediction_source = None
-                            predicted_character = None
-                            
-                            # 2. Sequence Prediction (Words - Priority)
-                            # EXECUTÉ SEULEMENT SI LE MODE EST "MOTS"
-                            if self.interface.detection_mode == "MOTS":
-                                if len(self.frame_buffer) == self.SEQUENCE_LENGTH:
-                                    seq_input = np.array(self.frame_buffer).flatten()
-                                    seq_probs = self.interface.model_sequence.predict_proba([seq_input])[0]
-                                    max_prob = np.max(seq_probs)
-                                    idx = np.argmax(seq_probs)
-                                    candidate = self.interface.model_sequence.classes_[idx]
-                                    
-                                    # --- DEBUG: PROUVER LA COMPARAISON ---
-                                    print(f"🔍 Analyzing Sequence... Top Candidate: '{candidate}' (Confidence: {max_prob:.2f})")
-                                    
-                                    # --- LOGIC OPTIMISÉE (VOTE GLISSANT) ---
-                                    # Au lieu de compter les frames consécutives (fragile), on regarde l'historique
-                                    if not hasattr(self, 'candidate_history'):
-                                        self.candidate_history = []
-                                    
-                                    self.candidate_history.append(candidate)
-                                    if len(self.candidate_history) > 10: # Garder les 10 derniers resultats
-                                        self.candidate_history.pop(0)
-
-                                    # Compter les votes dans l'historique
-                                    counts = Counter(self.candidate_history)
-                                    most_common, frequency = counts.most_common(1)[0]
-                                    
-                                    # CRITÈRE DE VALIDATION :
-                                    # 1. Le mot est majoritaire dans les 10 dernières images (au moins 5 fois)
-                                    # 2. La confiance actuelle est au moins > 0.15 (très permissif)
-                                    if most_common == candidate and frequency >= 5 and max_prob > 0.15:
-                                        # Anti-spam: ne pas répéter le même mot instantanément
-                                        if self.interface.phrase_keys and self.interface.phrase_keys[-1] == candidate and (time.time() - self.interface.last_time_added < 2.0):
-                                            pass
-                                        else:
-                                            predicted_character = candidate
-                                            prediction_source = "WORD"
-                                            self.candidate_history = [] # Reset après validation
-                                            print(f"✅ VOTE VALIDATED: {candidate} (Freq: {frequency}/10 | Score: {max_prob:.2f})")
-
-                            # 3. Static Prediction (Letters - Fallback)
-                            # EXECUTÉ SEULEMENT SI LE MODE EST "LETTRES" 
-                            # (OU si on veut un fallback "hybrid" - mais l'utilisateur a demandé strict)
-                            if self.interface.detection_mode == "LETTRES":
-                                # Seulement si on n'est pas en train de détecter un mot probable
-                                word_confidence = max_prob if 'max_prob' in locals() else 0
+                        prediction_source = None
+                        predicted_character = None
+                        
+                        # 2. Sequence Prediction (Words - Priority)
+                        # EXECUTÉ SEULEMENT SI LE MODE EST "MOTS"
+                        if self.interface.detection_mode == "MOTS":
+                            if self.frame_buffer.is_full():
+                                seq_input = self.frame_buffer.window()
+                                with self.profiler.measure('sequence_predict'):
+                                    seq_probs = self.interface.model_sequence.predict_proba(seq_input[None])[0]
+                                max_prob = np.max(seq_probs)
+                                idx = np.argmax(seq_probs)
+                                candidate = self.interface.model_sequence.classes_[idx]
                                 
-                                if not prediction_source:
-                                    static_probs = self.interface.model_static.predict_proba([np.asarray(data_aux)])[0]
-                                    if np.max(static_probs) > 0.4: # Seuil réduit pour capter plus de lettres
-                                        idx = np.argmax(static_probs)
-                                        predicted_character = self.interface.model_static.classes_[idx]
-                                        prediction_source = "LETTER"
-
-                            if predicted_character:
-                                print(f"Detected {prediction_source}: {predicted_character}")
-                                self.detected_letters.append(predicted_character)
+                                # --- DEBUG: PROUVER LA COMPARAISON ---
+                                print(f"🔍 Analyzing Sequence... Top Candidate: '{candidate}' (Confidence: {max_prob:.2f})")
                                 
-                                x1, y1 = int(min(x_) * W) - 10, int(min(y_) * H) - 10
-                                x2, y2 = int(max(x_) * W) + 10, int(max(y_) * H) + 10
-                                color = (255, 0, 0) if prediction_source == "WORD" else (0, 0, 0)
+                                # --- LOGIC OPTIMISÉE (VOTE GLISSANT) ---
+                                # Au lieu de compter les frames consécutives (fragile), on regarde l'historique
+                                if not hasattr(self, 'candidate_history'):
+                                    self.candidate_history = []
                                 
-                                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 4)
-                                cv2.putText(frame, predicted_character, (x1, y1 - 10), 
-                                            cv2.FONT_HERSHEY_SIMPLEX, 1.3, color, 3, cv2.LINE_AA)
+                                self.candidate_history.append(candidate)
+                                if len(self.candidate_history) > 10: # Garder les 10 derniers resultats
+                                    self.candidate_history.pop(0)
 
-                                self.interface.build_phrase(self.detected_letters)
+                                # Compter les votes dans l'historique
+                                counts = Counter(self.candidate_history)
+                                most_common, frequency = counts.most_common(1)[0]
+                                
+                                # CRITÈRE DE VALIDATION :
+                                # 1. Le mot est majoritaire dans les 10 dernières images (au moins 5 fois)
+                                # 2. La confiance actuelle est au moins > 0.15 (très permissif)
+                                if most_common == candidate and frequency >= 5 and max_prob > 0.15:
+                                    # Anti-spam: ne pas répéter le même mot instantanément
+                                    if self.interface.phrase_keys and self.interface.phrase_keys[-1] == candidate and (time.time() - self.interface.last_time_added < 2.0):
+                                        pass
+                                    else:
+                                        predicted_character = candidate
+                                        prediction_source = "WORD"
+                                        self.candidate_history = [] # Reset après validation
+                                        print(f"✅ VOTE VALIDATED: {candidate} (Freq: {frequency}/10 | Score: {max_prob:.2f})")
+
+                        # 3. Static Prediction (Letters - Fallback)
+                        # EXECUTÉ SEULEMENT SI LE MODE EST "LETTRES" 
+                        # (OU si on veut un fallback "hybrid" - mais l'utilisateur a demandé strict)
+                        if self.interface.detection_mode == "LETTRES":
+                            # Seulement si on n'est pas en train de détecter un mot probable
+                            word_confidence = max_prob if 'max_prob' in locals() else 0
+                            
+                            if not prediction_source:
+                                with self.profiler.measure('static_predict'):
+                                    static_probs = self.letter_gate.run(
+                                        data_aux, lambda f: self.interface.model_static.predict_proba(f[None])[0])
+                                if np.max(static_probs) > 0.4: # Seuil réduit pour capter plus de lettres
+                                    idx = np.argmax(static_probs)
+                                    predicted_character = self.interface.model_static.classes_[idx]
+                                    prediction_source = "LETTER"
+
+                        if predicted_character:
+                            print(f"Detected {prediction_source}: {predicted_character}")
+                            self.detected_letters.append(predicted_character)
+                            
+                            min_x, min_y, max_x, max_y = self.hand_features.bbox()
+                            x1, y1 = int(min_x * W) - 10, int(min_y * H) - 10
+                            x2, y2 = int(max_x * W) + 10, int(max_y * H) + 10
+                            color = (255, 0, 0) if prediction_source == "WORD" else (0, 0, 0)
+                            
+                            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 4)
+                            cv2.putText(frame, predicted_character, (x1, y1 - 10), 
+                                        cv2.FONT_HERSHEY_SIMPLEX, 1.3, color, 3, cv2.LINE_AA)
 
-                    # --- DEBUG VISUEL : Afficher l'état du buffer ---
-                    # Cela permet de voir si le système "enregistre" bien la séquence
-                    cv2.putText(frame, f"Seq Buffer: {len(self.frame_buffer)}/{self.SEQUENCE_LENGTH}", (10, 30), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                            # Widgets Tk modifiés uniquement depuis la boucle principale
+                            self.display.call_soon(self.interface.build_phrase, list(self.detected_letters))
+
+                with self.profiler.measure('overlay'):
+                    for x_px, y_px in self.hand_features.pixel_points(W, H):
+                        cv2.circle(frame, (int(x_px), int(y_px)), 5, (0, 255, 0), -1)
                     
-                    if len(self.frame_buffer) == self.SEQUENCE_LENGTH:
-                         cv2.putText(frame, "READY", (250, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    if results.hand_landmarks:
+                        # --- DEBUG VISUEL : Afficher l'état du buffer ---
+                        # Cela permet de voir si le système "enregistre" bien la séquence
+                        cv2.putText(frame, f"Seq Buffer: {len(self.frame_buffer)}/{self.SEQUENCE_LENGTH}", (10, 30), 
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                        
+                        if self.frame_buffer.is_full():
+                             cv2.putText(frame, "READY", (250, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                        
+                        if self.interface.detection_mode == "LETTRES":
+                            gate = self.letter_gate.stats()
+                            cv2.putText(frame, f"Skipped: {gate['skipped']} / Run: {gate['executed']}", (10, 60), 
+                                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                    
+                    # Latence par étape (p50/p95/p99, FPS)
+                    if self.SHOW_LATENCY:
+                        self.profiler.draw(frame)
 
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frame = Image.fromarray(frame)
-                frame = ImageTk.PhotoImage(image=frame)
-                self.label.config(image=frame)
-                self.label.image = frame
-                self.letters_label.config(text=" ".join(self.detected_letters))
+                self.display.submit(frame)
+                self.profiler.maybe_snapshot()
+                letters_text = " ".join(self.detected_letters)
+                if letters_text != self._letters_text:
+                    self._letters_text = letters_text
+                    self.display.call_soon(self._show_letters, letters_text)
 
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     break
@@ -309,8 +329,12 @@ class Camera:
                 time.sleep(0.1)
 
         self.cap.release()
+        self.tracker.close()
         cv2.destroyAllWindows()
 
+    def _show_letters(self, text):
+        self.letters_label.config(text=text)
+
 
 
 class InterfaceUtilisateur:
@@ -379,6 +403,7 @@ class InterfaceUtilisateur:
         self.model_sequence = model_sequence
 
         self.camera = Camera(self.camera_label, self.letters_label, self)
+        self.camera.display.start()
         threading.Thread(target=self.camera.open_camera_thread, daemon=True).start()
 
         self.phrase_text = ""
@@ -389,11 +414,11 @@ class InterfaceUtilisateur:
         if self.detection_mode == "MOTS":
             self.detection_mode = "LETTRES"
             self.btn_mode.configure(text="Mode: LETTRES", fg_color="#4CAF50", hover_color="#388E3C")
-            self.camera.frame_buffer = [] # Reset buffer
+            self.camera.request_reset()
         else:
             self.detection_mode = "MOTS"
             self.btn_mode.configure(text="Mode: MOTS", fg_color="#E91E63", hover_color="#D81B60")
-            self.camera.frame_buffer = []
+            self.camera.request_reset()
 
     def load_translations(self):
         try:
@@ -565,7 +590,7 @@ class InterfaceUtilisateur:
 
 if __name__ == "__main__":
     def load_model(path):
-        try: return pickle.load(open(path, 'rb'))['model']
+        try: return load_forest(path)
         except: return None
 
     m_static = load_model('./model.p')
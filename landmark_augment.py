@@ -0,0 +1,103 @@
+"""Augmentation vectorisée des features de landmarks, appliquée à l'entraînement.
+
+Travaille sur des lots (N, T * 84) (T = 1 pour les lettres) : chaque échantillon
+reçoit sa propre transformation, identique sur toutes ses frames.
+
+- rotation et échelle autour du centre des mains présentes
+- décalage relatif entre les deux mains (une translation globale serait annulée par
+  la normalisation des features)
+- miroir gauche/droite (signeur gaucher) : x inversé puis mains retriées par x du poignet
+- vitesse (séquences) : rééchantillonnage temporel autour du milieu de la fenêtre
+
+Les features sont renormalisées frame par frame comme dans HandFeatureExtractor
+(minimum à 0, main absente = 0), rien n'est stocké dans le dataset.
+"""
+import numpy as np
+
+from hand_features import NUM_HANDS, NUM_LANDMARKS, NUM_FEATURES
+
+
+class LandmarkAugmenter:
+    def __init__(self, rotation_deg=10.0, scale=0.1, hand_shift=0.02, mirror_prob=0.5,
+                 speed=(0.8, 1.25), seed=None):
+        self.rotation_deg = rotation_deg
+        self.scale = scale
+        self.hand_shift = hand_shift
+        self.mirror_prob = mirror_prob
+        self.speed = speed
+        self.rng = np.random.default_rng(seed)
+
+    def augment(self, X):
+        """Retourne une copie augmentée du lot (N, T * 84)."""
+        X = np.asarray(X, dtype=np.float32)
+        n = len(X)
+        frames = X.shape[1] // NUM_FEATURES
+        # (N, T, mains, points, xy)
+        pts = X.reshape(n, frames, NUM_HANDS, NUM_LANDMARKS, 2).copy()
+        if n == 0:
+            return pts.reshape(X.shape)
+        if frames > 1 and self.speed:
+            pts = self._warp_speed(pts)
+
+        active = pts.reshape(n, frames, NUM_HANDS, -1).any(axis=3)  # (N, T, mains)
+        mask = active[..., None, None]
+
+        # Décalage relatif des mains (sans effet sur une main seule)
+        if self.hand_shift:
+            shift = self.rng.uniform(-self.hand_shift, self.hand_shift, (n, 1, NUM_HANDS, 1, 2))
+            pts += shift.astype(np.float32)
+
+        # Rotation + échelle autour du centre des points présents
+        angle = np.deg2rad(self.rng.uniform(-self.rotation_deg, self.rotation_deg, n))
+        factor = 1.0 + self.rng.uniform(-self.scale, self.scale, n)
+        cos, sin = np.cos(angle) * factor, np.sin(angle) * factor
+        transform = np.stack([np.stack([cos, -sin], -1), np.stack([sin, cos], -1)], -2).astype(np.float32)
+        counts = np.maximum(mask.sum(axis=(2, 3)), 1)
+        center = (pts * mask).sum(axis=(2, 3)) / counts  # (N, T, 2)
+        centered = pts - center[:, :, None, None, :]
+        pts = np.einsum('nij,nthpj->nthpi', transform, centered) + center[:, :, None, None, :]
+
+        if self.mirror_prob:
+            flip = self.rng.random(n) < self.mirror_prob
+            pts[flip, ..., 0] *= -1
+            # Ordre gauche -> droite par x du poignet, comme à l'extraction
+            both = active.all(axis=2)
+            swap = flip[:, None] & both & (pts[:, :, 1, 0, 0] < pts[:, :, 0, 0, 0])
+            pts[swap] = pts[swap][:, ::-1]
+
+        return _renormalize(pts, mask).reshape(X.shape)
+
+    def expand(self, X, y, copies=1):
+        """Lot original + `copies` versions augmentées (labels répétés)."""
+        if copies <= 0:
+            return np.asarray(X), np.asarray(y)
+        X = np.asarray(X, dtype=np.float32)
+        parts = [X] + [self.augment(X) for _ in range(copies)]
+        return np.concatenate(parts), np.tile(np.asarray(y), copies + 1)
+
+    def batches(self, X, y, batch_size=32):
+        """Générateur infini de lots pour Keras (ordre mélangé à chaque époque) : chaque lot
+        réel est suivi de sa version augmentée (2 x batch_size), les originaux restent vus."""
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y)
+        while True:
+            order = self.rng.permutation(len(X))
+            for start in range(0, len(order), batch_size):
+                idx = order[start:start + batch_size]
+                yield self.expand(X[idx], y[idx], copies=1)
+
+    def _warp_speed(self, pts):
+        n, frames = pts.shape[:2]
+        factor = self.rng.uniform(self.speed[0], self.speed[1], (n, 1))
+        middle = (frames - 1) / 2
+        positions = np.rint(middle + (np.arange(frames) - middle) * factor)
+        positions = np.clip(positions, 0, frames - 1).astype(np.intp)
+        return pts[np.arange(n)[:, None], positions]
+
+
+def _renormalize(pts, mask):
+    """Min des points présents à 0 par frame, mains absentes à 0."""
+    big = np.float32(np.inf)
+    minimum = np.where(mask, pts, big).min(axis=(2, 3), keepdims=True)
+    minimum = np.where(np.isfinite(minimum), minimum, 0)
+    return np.where(mask, pts - minimum, 0).astype(np.float32)
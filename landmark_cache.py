@@ -0,0 +1,126 @@
+"""Cache persistant des features par image pour les reconstructions du dataset.
+
+Chaque image est identifiée par son chemin (relatif au dossier Data/), sa taille et
+son mtime ; avec `use_hash=True` le contenu (SHA-1) remplace le mtime, ce qui survit
+aux copies et aux `touch`. La valeur stockée est le vecteur float32 (84,) ou NULL
+quand aucune main n'a été détectée. Seules les images nouvelles ou modifiées
+repassent donc par le décodage JPEG et MediaPipe. Un fichier vidéo est stocké en
+une entrée (frames, 84), distinguée par `variant` (ex: sous-échantillonnage) : seules
+les frames avec main y sont, les comptes de la vidéo (frames lues, sans main, non
+décodées) sont gardés à côté pour le rapport de construction.
+
+La `signature` (modèle + seuils du détecteur) est enregistrée dans la base : si elle
+change, le cache est vidé. SQLite en mode WAL : plusieurs workers peuvent partager
+le même fichier.
+"""
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+
+from hand_features import NUM_FEATURES
+
+MISSING = object()  # Image absente du cache (≠ None = "pas de main")
+
+
+class LandmarkCache:
+    def __init__(self, db_path, root='.', signature='', use_hash=False):
+        self.db_path = db_path
+        self.root = root
+        self.use_hash = use_hash
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(db_path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha1 TEXT, data BLOB)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS video_counts ("
+            " path TEXT PRIMARY KEY, frames INTEGER, no_hand INTEGER, decode_failures INTEGER)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        if row is None or row[0] != signature:
+            if row is not None:
+                print(f"[WARNING] Détecteur modifié, cache des landmarks vidé ({db_path})")
+            self._conn.execute("DELETE FROM features")
+            self._conn.execute("DELETE FROM video_counts")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (signature,))
+        self._conn.commit()
+
+    def _key(self, path, variant=None):
+        key = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return f"{key}#{variant}" if variant else key
+
+    def _identity(self, path):
+        st = os.stat(path)
+        sha1 = _file_sha1(path) if self.use_hash else None
+        return st.st_size, st.st_mtime_ns, sha1
+
+    def get(self, path, variant=None):
+        """Features en cache (array ou None si pas de main), MISSING si absente ou périmée.
+
+        Avec `variant` (fichier vidéo), retourne la matrice (frames, 84).
+        """
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, sha1, data FROM features WHERE path = ?", (self._key(path, variant),)).fetchone()
+        if row is not None:
+            size, mtime_ns, sha1 = self._identity(path)
+            fresh = row[0] == size and (row[2] == sha1 if self.use_hash else row[1] == mtime_ns)
+            if fresh:
+                self.hits += 1
+                if row[3] is None:
+                    return None
+                features = np.frombuffer(row[3], dtype=np.float32).copy()
+                return features.reshape(-1, NUM_FEATURES) if variant else features
+        self.misses += 1
+        return MISSING
+
+    def get_counts(self, path, variant):
+        """Comptes {'frames', 'no_hand', 'decode_failures'} d'une vidéo, None si absents."""
+        row = self._conn.execute(
+            "SELECT frames, no_hand, decode_failures FROM video_counts WHERE path = ?",
+            (self._key(path, variant),)).fetchone()
+        return None if row is None else dict(zip(('frames', 'no_hand', 'decode_failures'), row))
+
+    def put(self, path, features, variant=None, counts=None):
+        """Enregistre les features d'une image (None = pas de main détectée) ou d'une vidéo (`variant`).
+
+        `counts` : comptes de la vidéo (voir get_counts), les frames sans main n'étant pas stockées.
+        """
+        size, mtime_ns, sha1 = self._identity(path)
+        data = None
+        if features is not None:
+            shape = (-1, NUM_FEATURES) if variant else (NUM_FEATURES,)
+            data = np.ascontiguousarray(features, dtype=np.float32).reshape(shape).tobytes()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?)",
+            (self._key(path, variant), size, mtime_ns, sha1, data))
+        if counts is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_counts VALUES (?, ?, ?, ?)",
+                (self._key(path, variant), counts['frames'], counts['no_hand'], counts['decode_failures']))
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def _file_sha1(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,52 @@
+"""Création des HandLandmarker MediaPipe (Tasks API) partagée par les applications et le dataset.
+
+- Mode VIDEO (flux caméra, séquences) : `detect_for_video` avec timestamps monotones,
+  les landmarks d'une main suivie servent de région à la frame suivante. Le détecteur
+  de paume n'est sauté que si les `num_hands` mains sont toutes suivies : avec
+  num_hands=2 et une seule main visible, il tourne encore sur chaque image (sur le
+  crop HandROI, donc une image réduite). Mesurer avec LatencyProfiler ('detection').
+- Mode IMAGE : images fixes indépendantes (lettres du dataset).
+"""
+import time
+
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+import mediapipe as mp
+
+MODEL_PATH = 'hand_landmarker.task'
+
+
+def create_landmarker(running_mode=vision.RunningMode.IMAGE, model_path=MODEL_PATH, num_hands=2, confidence=0.3):
+    """HandLandmarker avec les seuils utilisés à l'entraînement (0.3)."""
+    base_options = python.BaseOptions(model_asset_path=model_path)
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        running_mode=running_mode,
+        num_hands=num_hands,
+        min_hand_detection_confidence=confidence,
+        min_hand_presence_confidence=confidence,
+        min_tracking_confidence=confidence
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+
+class HandTracker:
+    """HandLandmarker en mode VIDEO avec timestamps strictement croissants."""
+
+    def __init__(self, model_path=MODEL_PATH, num_hands=2, confidence=0.3):
+        self.detector = create_landmarker(vision.RunningMode.VIDEO, model_path, num_hands, confidence)
+        self._start = time.monotonic()
+        self._last_timestamp_ms = -1
+
+    def detect(self, image_rgb, timestamp_ms=None):
+        """Détecte/suit les mains d'une frame RGB. Sans `timestamp_ms`, utilise l'horloge monotone."""
+        if timestamp_ms is None:
+            timestamp_ms = int((time.monotonic() - self._start) * 1000)
+        # MediaPipe rejette un timestamp identique ou antérieur au précédent
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+        return self.detector.detect_for_video(mp_image, timestamp_ms)
+
+    def close(self):
+        self.detector.close()
@@ -0,0 +1,125 @@
+"""Mesure de la latence par étape de la boucle caméra (p50/p95/p99, FPS).
+
+Usage:
+    profiler = LatencyProfiler(snapshot_path='latency_stats.json')
+    with profiler.measure('detection'):
+        results = detector.detect(...)
+    profiler.maybe_snapshot()   # écrit le JSON toutes les `snapshot_interval` secondes
+
+Thread-safe : les étapes du pipeline Kivy enregistrent depuis des threads différents.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Ordre d'affichage des étapes connues (les autres suivent par ordre d'apparition)
+STAGES = ('capture', 'color', 'detection', 'features', 'static_predict', 'sequence_predict', 'overlay', 'display')
+
+
+class _StageWindow:
+    """Fenêtre glissante préallouée des `size` dernières durées et instants de fin."""
+
+    def __init__(self, size):
+        self.durations = np.zeros(size, dtype=np.float64)
+        self.ends = np.zeros(size, dtype=np.float64)
+        self.next = 0
+        self.count = 0
+        self.total = 0
+
+    def add(self, duration, end):
+        self.durations[self.next] = duration
+        self.ends[self.next] = end
+        self.next = (self.next + 1) % len(self.durations)
+        self.count = min(self.count + 1, len(self.durations))
+        self.total += 1
+
+    def stats(self):
+        durations = self.durations[:self.count] * 1000.0
+        p50, p95, p99 = np.percentile(durations, (50, 95, 99))
+        ends = self.ends[:self.count]
+        span = ends.max() - ends.min()
+        return {
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'p99_ms': round(float(p99), 3),
+            'fps': round((self.count - 1) / span, 2) if span > 0 else 0.0,
+            'count': self.total,
+        }
+
+
+class LatencyProfiler:
+    def __init__(self, window=300, snapshot_path=None, snapshot_interval=10.0, enabled=True):
+        self.window = window
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.enabled = enabled
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._last_snapshot = time.monotonic()
+
+    @contextmanager
+    def measure(self, stage):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            window = self._stages.get(stage)
+            if window is None:
+                window = self._stages[stage] = _StageWindow(self.window)
+            window.add(seconds, time.perf_counter())
+
+    def stats(self):
+        """{étape: {p50_ms, p95_ms, p99_ms, fps, count}} dans l'ordre de la boucle."""
+        with self._lock:
+            names = [s for s in STAGES if s in self._stages]
+            names += [s for s in self._stages if s not in STAGES]
+            return {name: self._stages[name].stats() for name in names}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def overlay_lines(self):
+        return [f"{name:<16} p50 {s['p50_ms']:6.1f}  p95 {s['p95_ms']:6.1f}  p99 {s['p99_ms']:6.1f} ms  {s['fps']:5.1f} fps"
+                for name, s in self.stats().items()]
+
+    def draw(self, frame, origin=(10, 90)):
+        """Dessine les statistiques sur la frame BGR (overlay optionnel)."""
+        import cv2
+        x, y = origin
+        for line in self.overlay_lines():
+            cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 255), 1, cv2.LINE_AA)
+            y += 16
+
+    def snapshot(self, path=None):
+        """Écrit les statistiques courantes en JSON."""
+        path = path or self.snapshot_path
+        data = {'timestamp': time.time(), 'window': self.window, 'stages': self.stats()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return data
+
+    def maybe_snapshot(self):
+        """Snapshot JSON périodique ; à appeler une fois par frame."""
+        if not self.enabled or not self.snapshot_path:
+            return
+        now = time.monotonic()
+        if now - self._last_snapshot < self.snapshot_interval:
+            return
+        self._last_snapshot = now
+        try:
+            self.snapshot()
+        except Exception as e:
+            print(f"[WARNING] Snapshot latence impossible: {e}")
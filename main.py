@@ -31,7 +31,6 @@ except ImportError as e:
     print(f"[CRITICAL] Failed to import numpy: {e}")
     np = None
 
-import pickle
 import time
 import os
 
@@ -62,11 +61,19 @@ Config.set('input', 'wm_touch', '')
 Config.set('input', 'wm_pen', '')
 
 import threading
+import queue
 from kivy.clock import mainthread
 from speech_to_gesture import create_speech_recognizer
 from gesture_display_utils import get_gesture_image
 from gesture_display_utils import get_gesture_image
 from speech_to_image_model import SpeechToImageModel # Module IA/Web
+from hand_features import HandFeatureExtractor
+from sequence_buffer import SequenceBuffer
+from model_artifact import load_model, artifact_path
+from frame_pipeline import FramePipeline
+from motion_gate import MotionGate
+from hand_roi import HandROI
+from latency_profiler import LatencyProfiler
 
 # Optional imports for Arabic text support (may fail on some Android builds)
 try:
@@ -343,13 +350,12 @@ class HandGestureApp(App):
             model_path = get_file_path('model.p')
             print(f"[INFO] Chemin du modèle: {model_path}")
             
-            if not os.path.exists(model_path):
-                print(f"[ERROR] Fichier model.p introuvable: {model_path}")
+            # model.forest mappé en mémoire s'il existe, sinon pickle compilé en tableaux NumPy
+            self.model_static = load_model(model_path)
+            if self.model_static is None:
+                print(f"[ERROR] Modèle introuvable: {artifact_path(model_path)} (python model_artifact.py)")
             else:
-                with open(model_path, 'rb') as f:
-                    model_dict = pickle.load(f)
-                    self.model_static = model_dict['model'] 
-                    self.model = self.model_static # Compatibilité totale
+                self.model = self.model_static # Compatibilité totale
                 print("[OK] Modèle statique chargé")
         except Exception as e:
             print(f"[ERROR] Erreur chargement modèle statique: {e}")
@@ -357,9 +363,9 @@ class HandGestureApp(App):
             self.model = None
                 
         try:
-            seq_path = get_file_path('model_sequence.p')
-            with open(seq_path, 'rb') as f:
-                self.model_sequence = pickle.load(f)['model']
+            self.model_sequence = load_model(get_file_path('model_sequence.p'))
+            if self.model_sequence is None:
+                raise FileNotFoundError('model_sequence.p')
             print("[OK] Modèle séquence chargé")
         except:
             self.model_sequence = None
@@ -371,11 +377,18 @@ class HandGestureApp(App):
             self.mp_hands = mp.solutions.hands
             self.mp_drawing = mp.solutions.drawing_utils
             self.mp_drawing_styles = mp.solutions.drawing_styles
-            self.hands = self.mp_hands.Hands(static_image_mode=True, min_detection_confidence=0.3)
+            # Mode vidéo: suivi des landmarks entre frames. La détection de paume n'est sautée que
+            # si max_num_hands mains sont suivies: avec une seule main visible elle tourne à chaque frame
+            self.hands = self.mp_hands.Hands(static_image_mode=False, max_num_hands=2,
+                                             min_detection_confidence=0.3, min_tracking_confidence=0.3)
             print("[OK] MediaPipe initialisé")
         except Exception as e:
             print(f"[ERROR] Erreur MediaPipe: {e}")
             self.hands = None
+        self.hand_features = HandFeatureExtractor()
+        # Détection sur un crop réduit autour de la dernière main (frame complète si main perdue)
+        # Crop figé pendant le suivi (static_image_mode=False), pas de rafraîchissement périodique
+        self.roi = HandROI(margin=0.3, input_size=256, tracking=True)
 
         # Labels
         self.labels_dict = {
@@ -388,6 +401,9 @@ class HandGestureApp(App):
 
         # State variables
         self.detected_letters = []
+        # Détections de chaque frame classifiée (thread classification -> UI) : file sans
+        # perte, contrairement aux frames du pipeline qui peuvent être abandonnées
+        self.detections = queue.Queue()
         self.phrase_text = ""
         self.phrase_keys = []  # Pour traduction
         self.last_time_letter_added = time.time()
@@ -397,9 +413,21 @@ class HandGestureApp(App):
 
         # Gestion des modes
         self.detection_mode = "LETTRES" # Default
-        self.frame_buffer = []
         self.SEQUENCE_LENGTH = 15
+        self.frame_buffer = SequenceBuffer(self.SEQUENCE_LENGTH)
         self.candidate_history = []
+        # Mode LETTRES: pas de nouvelle prédiction si la main bouge moins que ce seuil
+        self.MOTION_THRESHOLD = 0.01
+        self.letter_gate = MotionGate(self.MOTION_THRESHOLD)
+        # Remise à zéro des buffers demandée par l'UI, appliquée par le thread classification
+        self._reset_requested = threading.Event()
+        # Changement de caméra demandé par l'UI, appliqué par le thread capture (seul à lire/libérer)
+        self._source_lock = threading.Lock()
+        self._pending_source = None
+
+        # Latence par étape (p50/p95/p99, FPS) : JSON périodique + overlay optionnel
+        self.SHOW_LATENCY = False
+        self.profiler = LatencyProfiler(snapshot_path=get_file_path('latency_stats.json'))
 
         # Charger traductions
         print("[INFO] Chargement des traductions...")
@@ -438,13 +466,15 @@ class HandGestureApp(App):
             self.capture = self._init_camera()
             if self.capture and self.capture.isOpened():
                 print("[OK] Caméra initialisée avec succès")
-                Clock.schedule_interval(self.update, 1.0 / 30.0) # 30 FPS
             else:
                 print("[WARNING] Caméra non disponible, mode ESP32 seulement")
                 self.capture = None
         except Exception as e:
             print(f"[ERROR] Erreur initialisation caméra: {e}")
             self.capture = None
+        
+        # Pipeline démarré même sans caméra : l'étape capture attend une source (ex: ESP32)
+        self._start_pipeline()
             
         print("[OK] Initialisation terminée")
 
@@ -523,9 +553,7 @@ class HandGestureApp(App):
         if new_cap.isOpened():
             ret, frame = new_cap.read()
             if ret:
-                if self.capture:
-                    self.capture.release()
-                self.capture = new_cap
+                self._request_source(new_cap)
                 self.using_esp32 = True
                 # cam_btn supprimé - pas de feedback visuel sur bouton
                 print("✓ Connexion ESP32 réussie!")
@@ -548,15 +576,30 @@ class HandGestureApp(App):
         self.gesture_image.reload()
         self.gesture_image.opacity = 0  # Invisible
         
-        # Gestion de la caméra
-        if self.capture:
-            self.capture.release()
-            
         self.using_esp32 = False
         # cam_btn supprimé - pas de feedback visuel sur bouton
         
-        # Init caméra locale
-        self.capture = self._init_camera()
+        # Caméra locale : ouverte par le thread capture après libération de l'ancienne
+        self._request_source('local')
+
+    def _request_source(self, source):
+        """Demande au thread capture de passer sur `source` (VideoCapture ouvert ou 'local')"""
+        with self._source_lock:
+            previous, self._pending_source = self._pending_source, source
+        # Demande précédente jamais appliquée : personne d'autre ne lit ce flux
+        if previous is not None and previous != 'local':
+            previous.release()
+
+    def _apply_pending_source(self):
+        """Thread capture: libère l'ancienne caméra et installe la nouvelle source"""
+        with self._source_lock:
+            source, self._pending_source = self._pending_source, None
+        if source is None:
+            return
+        if self.capture:
+            self.capture.release()
+        self.capture = self._init_camera() if source == 'local' else source
+        self._consecutive_errors = 0
 
     def set_letters_mode(self, instance):
         """Basculer en mode LETTRES"""
@@ -564,9 +607,8 @@ class HandGestureApp(App):
         # UI Update
         self.letters_mode_btn.canvas.before.children[0].rgba = (0.26, 0.67, 0.45, 1)  # Green
         self.words_mode_btn.canvas.before.children[0].rgba = (0.5, 0.5, 0.5, 1)  # Gray
-        # Reset buffers
-        self.frame_buffer = []
-        self.candidate_history = []
+        # Reset buffers (par le thread classification, qui les utilise)
+        self._reset_requested.set()
         # Feedback
         self.letters_label.text = "Mode: LETTRES"
 
@@ -576,235 +618,288 @@ class HandGestureApp(App):
         # UI Update
         self.letters_mode_btn.canvas.before.children[0].rgba = (0.5, 0.5, 0.5, 1)  # Gray
         self.words_mode_btn.canvas.before.children[0].rgba = (0.26, 0.67, 0.45, 1)  # Green
-        # Reset buffers
-        self.frame_buffer = []
-        self.candidate_history = []
+        # Reset buffers (par le thread classification, qui les utilise)
+        self._reset_requested.set()
         # Feedback
         self.letters_label.text = "Mode: MOTS (Séquence)"
 
 
-    def update(self, dt):
-        """Mise à jour du flux vidéo avec gestion d'erreurs robuste"""
-        try:
-            # Vérifier que la caméra existe
-            if not self.capture:
-                return
-                
+    def _start_pipeline(self):
+        """Démarre les threads capture -> détection -> classification -> rendu"""
+        self._consecutive_errors = 0
+        self.pipeline = FramePipeline([
+            ('capture', self._capture_stage),
+            ('detection', self._detection_stage),
+            ('classification', self._classification_stage),
+            ('render', self._render_stage),
+        ]).start()
+        # Le thread UI ne fait plus que l'affichage de la dernière frame annotée
+        Clock.schedule_interval(self.update, 1.0 / 30.0) # 30 FPS
+
+    def _capture_stage(self):
+        """Étape 1 (thread capture): lecture caméra avec reconnexion automatique"""
+        self._apply_pending_source()
+        capture = self.capture
+        if not capture:
+            time.sleep(0.1)
+            return None
+            
+        with self.profiler.measure('capture'):
+            ret, frame = capture.read()
+        if not ret or frame is None:
             # Anti-blocage: compteur d'erreurs
-            if not hasattr(self, '_consecutive_errors'):
-                self._consecutive_errors = 0
-                
-            ret, frame = self.capture.read()
-            if not ret or frame is None:
-                self._consecutive_errors += 1
-                if self._consecutive_errors >= 30:  # ~1 seconde d'erreurs
-                    print("[WARNING] Trop d'erreurs caméra, tentative reconnexion...")
-                    try:
-                        self.capture.release()
-                        time.sleep(1)
-                        self.capture = self._init_camera()
-                        self._consecutive_errors = 0
-                    except:
-                        pass
-                return
+            self._consecutive_errors += 1
+            if self._consecutive_errors >= 30:  # ~1 seconde d'erreurs
+                print("[WARNING] Trop d'erreurs caméra, tentative reconnexion...")
+                try:
+                    capture.release()
+                    time.sleep(1)
+                    self.capture = self._init_camera()
+                    self._consecutive_errors = 0
+                except:
+                    pass
+            time.sleep(1.0 / 30.0)
+            return None
+        
+        # Réinitialiser le compteur si lecture réussie
+        self._consecutive_errors = 0
+        return {'frame': frame, 'num_hands': 0,
+                'prediction_source': None, 'predicted_character': None}
+
+    def _detection_stage(self, packet):
+        """Étape 2 (thread détection): MediaPipe + extraction des features"""
+        if not self.hands:
+            return packet
             
-            # Réinitialiser le compteur si lecture réussie
-            self._consecutive_errors = 0
-        except Exception as e:
-            print(f"[ERROR] Exception dans update: {e}")
-            return
-
+        frame = packet['frame']
         H, W, _ = frame.shape
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with self.profiler.measure('color'):
+            detector_rgb, roi_offset, roi_scale = self.roi.prepare(frame)
+        with self.profiler.measure('detection'):
+            results = self.hands.process(detector_rgb)
         
-        # MediaPipe Processing
-        data_aux = []
-        x_ = []
-        y_ = []
-        self.detected_letters = [] # Reset for this frame
-        
-        if self.hands:
-            results = self.hands.process(frame_rgb)
+        # Tri gauche -> droite + normalisation partagés avec create_dataset (hand_features.py),
+        # landmarks du crop ramenés en coordonnées de la frame complète
+        with self.profiler.measure('features'):
+            num_hands = self.hand_features.update(results.multi_hand_landmarks, roi_offset, roi_scale)
+            self.roi.update(self.hand_features.bbox() if num_hands else None, frame.shape)
+            if num_hands:
+                # Copies: hand_features est réécrit dès la frame suivante
+                packet['num_hands'] = num_hands
+                packet['features'] = self.hand_features.flat.copy()
+                packet['pixel_points'] = self.hand_features.pixel_points(W, H)
+                packet['bbox'] = self.hand_features.bbox()
+        return packet
+
+    def _classification_stage(self, packet):
+        """Étape 3 (thread classification): modèles séquence (MOTS) ou statique (LETTRES)"""
+        if self._reset_requested.is_set():
+            self._reset_requested.clear()
+            self.frame_buffer.reset()
+            self.candidate_history = []
+            self.letter_gate.reset()
             
-            if results.multi_hand_landmarks:
-                # FIX: SORT HANDS Left-to-Right match training data logic from inference_classifier.py
-                # Trie les mains par position X (landmark 0 = poignet) pour ordre constant Gauche -> Droite
-                sorted_hands = sorted(results.multi_hand_landmarks, key=lambda h: h.landmark[0].x)
+        # Détections de cette frame : envoyées à l'UI par self.detections, jamais abandonnées
+        detected_letters = []
+        try:
+            if packet['num_hands']:
+                self._classify(packet, detected_letters)
+        finally:
+            self.detections.put(detected_letters)
+        return packet
+
+    def _classify(self, packet, detected_letters):
+        # Features (84 = 2 mains, main absente remplie de zéros)
+        data_aux_padded = packet['features']
+        prediction_source = None
+        predicted_character = None
+        
+        # 1. MODE MOTS (SEQUENCE)
+        if self.detection_mode == "MOTS" and self.model_sequence:
+            self.frame_buffer.append(data_aux_padded)
                 
-                for hand_landmarks in sorted_hands:
-                    # Dessiner les points seulement (pas de lignes squelette)
-                    for landmark in hand_landmarks.landmark:
-                        x_px = int(landmark.x * W)
-                        y_px = int(landmark.y * H)
-                        # Points verts comme dans inference_classifier
-                        cv2.circle(frame, (x_px, y_px), 5, (0, 255, 0), -1) 
+            if self.frame_buffer.is_full():
+                seq_input = self.frame_buffer.window()
+                try:
+                    with self.profiler.measure('sequence_predict'):
+                        seq_probs = self.model_sequence.predict_proba(seq_input[None])[0]
+                    max_prob = np.max(seq_probs)
+                    idx = np.argmax(seq_probs)
+                    candidate = self.model_sequence.classes_[idx]
                     
-                    # Collecter X et Y pour la bounding box globale
-                    for landmark in hand_landmarks.landmark:
-                        x_.append(landmark.x)
-                        y_.append(landmark.y)
-
-                # Calculer data_aux (features normalisées)
-                if x_ and y_:
-                    min_x = min(x_)
-                    min_y = min(y_)
-                    for hand_landmarks in sorted_hands:
-                        for landmark in hand_landmarks.landmark:
-                            data_aux.append(landmark.x - min_x)
-                            data_aux.append(landmark.y - min_y)
-                
-                # FIX: Pad data to 84 features if model expects it (2 hands)
-            # Model expects 84 features (2 hands) but we have 42 (1 hand)
-            if len(data_aux) == 42:
-                # Pad with zeros for the second hand
-                data_aux_padded = data_aux + [0] * 42  # Total = 84 features
-            elif len(data_aux) == 84:
-                data_aux_padded = data_aux  # Already 2 hands
-            else:
-                # Unexpected size, skip
-                data_aux_padded = None
-            
-            if data_aux_padded:
-                prediction_source = None
-                predicted_character = None
-                
-                # 1. MODE MOTS (SEQUENCE)
-                if self.detection_mode == "MOTS" and self.model_sequence:
-                    self.frame_buffer.append(data_aux_padded)
-                    if len(self.frame_buffer) > self.SEQUENCE_LENGTH:
-                        self.frame_buffer.pop(0)
-                        
-                    if len(self.frame_buffer) == self.SEQUENCE_LENGTH:
-                        seq_input = np.array(self.frame_buffer).flatten()
-                        try:
-                            seq_probs = self.model_sequence.predict_proba([seq_input])[0]
-                            max_prob = np.max(seq_probs)
-                            idx = np.argmax(seq_probs)
-                            candidate = self.model_sequence.classes_[idx]
+                    # Log terminal pour debug
+                    if max_prob > 0.1: # Ne pas spammer si très faible confiance
+                        print(f"[DEBUG] Candidat: {candidate} ({max_prob:.2f})")
+                    
+                    if max_prob > 0.3: # Seuil confiance abaissé
+                        # Filtrage simple
+                        self.candidate_history.append(candidate)
+                        if len(self.candidate_history) > 10:
+                            self.candidate_history.pop(0)
                             
-                            # Log terminal pour debug
-                            if max_prob > 0.1: # Ne pas spammer si très faible confiance
-                                print(f"[DEBUG] Candidat: {candidate} ({max_prob:.2f})")
+                        from collections import Counter
+                        counts = Counter(self.candidate_history)
+                        most_common, frequency = counts.most_common(1)[0]
+                        
+                        # Détection plus rapide (3 frames)
+                        if most_common == candidate and frequency >= 3:
+                            # Gestion de la validation temporelle
+                            current_time = time.time()
                             
-                            if max_prob > 0.3: # Seuil confiance abaissé
-                                # Filtrage simple
-                                self.candidate_history.append(candidate)
-                                if len(self.candidate_history) > 10:
-                                    self.candidate_history.pop(0)
-                                    
-                                from collections import Counter
-                                counts = Counter(self.candidate_history)
-                                most_common, frequency = counts.most_common(1)[0]
+                            # Si c'est un nouveau candidat stable
+                            if self.last_candidate != candidate:
+                                self.last_candidate = candidate
+                                self.validation_start_time = current_time
                                 
-                                # Détection plus rapide (3 frames)
-                                if most_common == candidate and frequency >= 3:
-                                    # Gestion de la validation temporelle
-                                    current_time = time.time()
+                            # Si le candidat est maintenu assez longtemps (1.0 sec)
+                            elif (current_time - self.validation_start_time) > self.VALIDATION_DELAY:
+                                # Ajouter seulement si différent du dernier validé
+                                if not (detected_letters and detected_letters[-1] == candidate):
+                                    detected_letters.append(candidate)
+                                    # Reset pour ne pas spammer tout de suite (petite pause)
+                                    self.validation_start_time = current_time + 1.0 
                                     
-                                    # Si c'est un nouveau candidat stable
-                                    if self.last_candidate != candidate:
-                                        self.last_candidate = candidate
-                                        self.validation_start_time = current_time
-                                        
-                                    # Si le candidat est maintenu assez longtemps (1.0 sec)
-                                    elif (current_time - self.validation_start_time) > self.VALIDATION_DELAY:
-                                        # Ajouter seulement si différent du dernier validé
-                                        if not (self.detected_letters and self.detected_letters[-1] == candidate):
-                                            self.detected_letters.append(candidate)
-                                            # Reset pour ne pas spammer tout de suite (petite pause)
-                                            self.validation_start_time = current_time + 1.0 
-                                            
-                                    # Pour l'affichage (Bleu pour mot détecté)
-                                    prediction_source = "WORD"
-                                    predicted_character = candidate 
-                        except Exception as e:
-                            pass # Silencieux en sequence
+                            # Pour l'affichage (Bleu pour mot détecté)
+                            prediction_source = "WORD"
+                            predicted_character = candidate 
+                except Exception as e:
+                    pass # Silencieux en sequence
 
-                # 2. MODE LETTRES (STATIC)
+        # 2. MODE LETTRES (STATIC)
+        else:
+            try:
+                # Priorité à model_static, fallback sur model
+                model_to_use = getattr(self, 'model_static', None) or getattr(self, 'model', None)
+                    
+                if model_to_use:
+                    # Réutilise la prédiction précédente si la pose est tenue (voir letter_gate.stats())
+                    with self.profiler.measure('static_predict'):
+                        predicted_value = self.letter_gate.run(
+                            data_aux_padded, lambda f: model_to_use.predict(f[None])[0])
+                    
+                    # FIX: Le modèle peut retourner soit un index (int) soit une lettre (str)
+                    if isinstance(predicted_value, (int, np.integer)):
+                        # C'est un index, utiliser labels_dict
+                        predicted_character = self.labels_dict[int(predicted_value)]
+                    else:
+                        # C'est déjà une lettre (str)
+                        predicted_character = str(predicted_value)
+                    
+                    detected_letters.append(predicted_character)
                 else:
-                    try:
-                        # Priorité à model_static, fallback sur model
-                        model_to_use = getattr(self, 'model_static', None) or getattr(self, 'model', None)
-                            
-                        if model_to_use:
-                            prediction = model_to_use.predict([np.asarray(data_aux_padded)])
-                            
-                            # FIX: Le modèle peut retourner soit un index (int) soit une lettre (str)
-                            predicted_value = prediction[0]
-                            if isinstance(predicted_value, (int, np.integer)):
-                                # C'est un index, utiliser labels_dict
-                                predicted_character = self.labels_dict[int(predicted_value)]
-                            else:
-                                # C'est déjà une lettre (str)
-                                predicted_character = str(predicted_value)
-                            
-                            self.detected_letters.append(predicted_character)
-                        else:
-                            if not hasattr(self, '_model_warned'):
-                                print("[WARNING] Aucun modèle de détection chargé.")
-                                self._model_warned = True
-                    except Exception as e:
-                        print(f"Prediction error: {e}")
-
-            # Modern UI with gradient box and animated text
-            if x_:  # Vérifier que des points ont été détectés
-                x1 = int(min(x_) * W) - 10
-                y1 = int(min(y_) * H) - 10
-                x2 = int(max(x_) * W) - 10
-                y2 = int(max(y_) * H) - 10
-
-                # Draw modern detection box with glow effect
-                # Outer glow
-                cv2.rectangle(frame, (x1-3, y1-3), (x2+3, y2+3), (50, 200, 255), 2)
-                # Main rectangle with cyan color
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 255), 3)
-                
-                x1, y1 = int(min(x_) * W) - 10, int(min(y_) * H) - 10
-                x2, y2 = int(max(x_) * W) + 10, int(max(y_) * H) + 10
-                
-                # Couleur BLEUE (BGR) pour mot détecté, comme inference_classifier.py
-                color = (255, 0, 0) if prediction_source == "WORD" else (0, 0, 0) 
+                    if not hasattr(self, '_model_warned'):
+                        print("[WARNING] Aucun modèle de détection chargé.")
+                        self._model_warned = True
+            except Exception as e:
+                print(f"Prediction error: {e}")
+
+        packet['prediction_source'] = prediction_source
+        packet['predicted_character'] = predicted_character
+
+    def _render_stage(self, packet):
+        """Étape 4 (thread rendu): overlay de détection + statistiques de latence optionnelles"""
+        with self.profiler.measure('overlay'):
+            if packet['num_hands']:
+                self._draw_detection(packet)
+            if self.SHOW_LATENCY:
+                self.profiler.draw(packet['frame'])
+        return packet
+
+    def _draw_detection(self, packet):
+        """Dessin des landmarks, de la boîte et de la barre de progression"""
+        frame = packet['frame']
+        H, W, _ = frame.shape
+        prediction_source = packet['prediction_source']
+        predicted_character = packet['predicted_character']
+        
+        # Dessiner les points seulement (pas de lignes squelette), verts comme dans inference_classifier
+        for x_px, y_px in packet['pixel_points']:
+            cv2.circle(frame, (int(x_px), int(y_px)), 5, (0, 255, 0), -1)
+
+        # Modern UI with gradient box and animated text
+        min_x, min_y, max_x, max_y = packet['bbox']
+        x1 = int(min_x * W) - 10
+        y1 = int(min_y * H) - 10
+        x2 = int(max_x * W) - 10
+        y2 = int(max_y * H) - 10
+
+        # Draw modern detection box with glow effect
+        # Outer glow
+        cv2.rectangle(frame, (x1-3, y1-3), (x2+3, y2+3), (50, 200, 255), 2)
+        # Main rectangle with cyan color
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 255), 3)
+        
+        x1, y1 = int(min_x * W) - 10, int(min_y * H) - 10
+        x2, y2 = int(max_x * W) + 10, int(max_y * H) + 10
+        
+        # Couleur BLEUE (BGR) pour mot détecté, comme inference_classifier.py
+        color = (255, 0, 0) if prediction_source == "WORD" else (0, 0, 0) 
+        
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 4)
+        
+        # Afficher le label au-dessus (Texte uniquement sans EMOJI car OpenCV ne supporte pas)
+        if predicted_character:
+            label_text = str(predicted_character)
+            
+            cv2.putText(frame, label_text, (x1, y1 - 10), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.3, color, 3, cv2.LINE_AA)
+
+        # --- Barre de progression de validation (RELAURÉ) ---
+        if self.last_candidate and prediction_source == "WORD":
+            elapsed = time.time() - self.validation_start_time
+            progress = min(elapsed / self.VALIDATION_DELAY, 1.0)
+            
+            if elapsed < 2.0: # Ne pas garder éternellement si on bouge
+                # Barre de fond noire
+                bx1, by1 = x1, y2 + 10
+                bx2, by2 = x2, y2 + 22
+                cv2.rectangle(frame, (bx1, by1), (bx2, by2), (0, 0, 0), -1)
                 
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 4)
+                # Remplissage vert/cyan
+                fw = int((bx2 - bx1) * progress)
+                fcol = (0, 255, 0) if progress >= 1.0 else (0, 255, 255)
+                if fw > 0:
+                    cv2.rectangle(frame, (bx1, by1), (bx1 + fw, by2), fcol, -1)
                 
-                # Afficher le label au-dessus (Texte uniquement sans EMOJI car OpenCV ne supporte pas)
-                if predicted_character:
-                    label_text = str(predicted_character)
-                    
-                    cv2.putText(frame, label_text, (x1, y1 - 10), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1.3, color, 3, cv2.LINE_AA)
-
-                # --- Barre de progression de validation (RELAURÉ) ---
-                if self.last_candidate and prediction_source == "WORD":
-                    elapsed = time.time() - self.validation_start_time
-                    progress = min(elapsed / self.VALIDATION_DELAY, 1.0)
-                    
-                    if elapsed < 2.0: # Ne pas garder éternellement si on bouge
-                        # Barre de fond noire
-                        bx1, by1 = x1, y2 + 10
-                        bx2, by2 = x2, y2 + 22
-                        cv2.rectangle(frame, (bx1, by1), (bx2, by2), (0, 0, 0), -1)
-                        
-                        # Remplissage vert/cyan
-                        fw = int((bx2 - bx1) * progress)
-                        fcol = (0, 255, 0) if progress >= 1.0 else (0, 255, 255)
-                        if fw > 0:
-                            cv2.rectangle(frame, (bx1, by1), (bx1 + fw, by2), fcol, -1)
-                        
-                        # Texte OK!
-                        if progress >= 1.0:
-                            cv2.putText(frame, "OK!", (bx2 + 5, by2), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                # Texte OK!
+                if progress >= 1.0:
+                    cv2.putText(frame, "OK!", (bx2 + 5, by2), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+    def _upload_frame(self, frame):
+        """Envoie la frame BGR au GPU dans une texture réutilisée (une par résolution)"""
+        h, w = frame.shape[:2]
+        texture = getattr(self, '_camera_texture', None)
+        if texture is None or texture.size != (w, h):
+            texture = Texture.create(size=(w, h), colorfmt='bgr')
+            # Retournement vertical par les coordonnées de texture (pas de copie cv2.flip)
+            texture.flip_vertical()
+            self._camera_texture = texture
+            self.image.texture = texture
+            
+        # Upload direct depuis le buffer contigu de la frame (pas de .tobytes())
+        texture.blit_buffer(np.ascontiguousarray(frame).reshape(-1), colorfmt='bgr', bufferfmt='ubyte')
+        self.image.canvas.ask_update()
 
-            # Build Phrase
+    def update(self, dt):
+        """Thread UI: phrase depuis toutes les détections, affichage de la dernière frame annotée"""
+        # Build Phrase : une fois par frame classifiée, même si sa frame n'est jamais affichée
+        drained = False
+        while True:
+            try:
+                self.detected_letters = self.detections.get_nowait()
+            except queue.Empty:
+                break
+            drained = True
             self.build_phrase(self.detected_letters)
 
-
-        # Update Kivy Image
-        buf1 = cv2.flip(frame, 0)
-        buf = buf1.tobytes()
-        image_texture = Texture.create(size=(frame.shape[1], frame.shape[0]), colorfmt='bgr')
-        image_texture.blit_buffer(buf, colorfmt='bgr', bufferfmt='ubyte')
-        self.image.texture = image_texture
+        # Update Kivy Image (les frames périmées sont ignorées)
+        packet = self.pipeline.output.get_nowait()
+        if packet is not None:
+            with self.profiler.measure('display'):
+                self._upload_frame(packet['frame'])
+            self.profiler.maybe_snapshot()
+        if not drained:
+            return
         
         # Update Labels with modern format and animation
         if self.detected_letters:
@@ -1141,6 +1236,10 @@ class HandGestureApp(App):
             return False
 
     def on_stop(self):
+        if hasattr(self, 'pipeline'):
+            self.pipeline.stop()
+        if hasattr(self, 'profiler') and self.profiler.snapshot_path:
+            self.profiler.snapshot()
         if hasattr(self, 'capture') and self.capture:
             self.capture.release()
 
@@ -0,0 +1,194 @@
+"""Artefact binaire compact des forêts : un seul fichier .forest, mappable en mémoire.
+
+model.p (pickle sklearn) est lent à charger, impose sklearn sur l'appareil et garde
+chaque arbre sous forme d'objets Python. Le fichier .forest contient les tableaux de
+noeuds de ForestPredictor, indices dans le plus petit type entier suffisant, seuils
+float32 ou int16 :
+
+    octets 0-7     MAGIC b'SLFOREST'
+    octets 8-15    version, taille de l'en-tête JSON (uint32 little-endian)
+    en-tête JSON   classes, max_depth, scale, {nom: [dtype, forme, offset]}
+    tableaux       alignés sur 64 octets
+
+Le tout est un tableau uint8 au format .npy : `np.load(path, mmap_mode='r')` l'ouvre
+sans copie et plusieurs processus partagent les mêmes pages. Avec `compress=True`
+c'est un .npz compressé (plus petit, mais décompressé en mémoire au chargement).
+
+    python model_artifact.py model.p model_sequence.p [--int16] [--compress]
+"""
+import json
+import os
+import pickle
+import struct
+import time
+
+import numpy as np
+
+from forest_predictor import ForestPredictor, compile_forest, quantize
+
+MAGIC = b'SLFOREST'
+FORMAT_VERSION = 1
+ALIGN = 64
+# int16 : le plus grand seuil absolu est ramené sous cette valeur (marge pour les entrées hors plage)
+INT16_RANGE = 16384
+
+_INDEX_ARRAYS = ('roots', 'feature', 'left', 'right', 'leaf_id')
+
+
+def artifact_path(model_path):
+    """model.p -> model.forest"""
+    return os.path.splitext(model_path)[0] + '.forest'
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _index_dtype(array):
+    for dtype in (np.uint8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if len(array) == 0 or (info.min <= array.min() and array.max() <= info.max):
+            return dtype
+    return np.int64
+
+
+def save_artifact(forest, path, precision='float32', compress=False):
+    """Écrit un ForestPredictor (float32) dans `path`. Retourne le chemin."""
+    if forest.scale:
+        raise ValueError("Forêt déjà quantifiée : exporter depuis la forêt float32")
+    arrays = {name: getattr(forest, name) for name in _INDEX_ARRAYS}
+    for name, array in arrays.items():
+        arrays[name] = array.astype(_index_dtype(array))
+    arrays['leaf_values'] = forest.leaf_values
+    scale = None
+    if precision == 'int16':
+        # Puissance de 2 : floor(x * scale) exact en float32
+        peak = float(np.abs(forest.threshold).max()) or 1.0
+        scale = float(2 ** np.floor(np.log2(INT16_RANGE / peak)))
+        arrays['threshold'] = quantize(forest.threshold, scale)
+    elif precision == 'float32':
+        arrays['threshold'] = forest.threshold
+    else:
+        raise ValueError(f"Précision non supportée: {precision} (float32 ou int16)")
+
+    table, chunks, offset = {}, [], 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        table[name] = [array.dtype.str, list(array.shape), offset]
+        chunks.append((offset, array))
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({
+        'classes': np.asarray(forest.classes_).tolist(),
+        'max_depth': forest.max_depth,
+        'precision': precision,
+        'scale': scale,
+        'arrays': table,
+    }, ensure_ascii=False).encode('utf-8')
+
+    start = _align(16 + len(header))
+    blob = np.zeros(start + offset, dtype=np.uint8)
+    blob[:16] = np.frombuffer(MAGIC + struct.pack('<II', FORMAT_VERSION, len(header)), dtype=np.uint8)
+    blob[16:16 + len(header)] = np.frombuffer(header, dtype=np.uint8)
+    for chunk_offset, array in chunks:
+        blob[start + chunk_offset:start + chunk_offset + array.nbytes] = array.reshape(-1).view(np.uint8)
+
+    # Écriture atomique : l'application peut avoir l'ancien fichier mappé
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        if compress:
+            np.savez_compressed(f, forest=blob)
+        else:
+            np.save(f, blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_artifact(path, mmap=True):
+    """ForestPredictor dont les tableaux sont des vues sur le fichier (memmap si non compressé)."""
+    loaded = np.load(path, mmap_mode='r' if mmap else None)
+    if hasattr(loaded, 'files'):  # .npz compressé
+        with loaded:
+            blob = loaded['forest']
+    else:
+        blob = loaded
+    if bytes(blob[:8]) != MAGIC:
+        raise ValueError(f"{path}: pas un artefact de forêt")
+    version, header_len = struct.unpack('<II', bytes(blob[8:16]))
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Version d'artefact non supportée: {version} ({path})")
+    header = json.loads(bytes(blob[16:16 + header_len]).decode('utf-8'))
+
+    start = _align(16 + header_len)
+    arrays = {}
+    for name, (dtype, shape, offset) in header['arrays'].items():
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        arrays[name] = blob[start + offset:start + offset + size].view(dtype).reshape(shape)
+    return ForestPredictor(header['classes'], max_depth=header['max_depth'], scale=header['scale'], **arrays)
+
+
+def load_model(model_path):
+    """Forêt pour `model_path` (model.p) : model.forest s'il est à jour, sinon pickle + compile_forest.
+
+    Le pickle peut être absent (APK livré avec le seul .forest). None si rien n'existe.
+    """
+    forest_path = artifact_path(model_path)
+    if os.path.exists(forest_path) and (not os.path.exists(model_path)
+                                        or os.path.getmtime(forest_path) >= os.path.getmtime(model_path)):
+        return load_artifact(forest_path)
+    if not os.path.exists(model_path):
+        return None
+    with open(model_path, 'rb') as f:
+        return compile_forest(pickle.load(f)['model'])
+
+
+def compare(model_path, forest_path, repeats=5, samples=1000):
+    """Taille, temps de chargement et accord des prédictions : pickle + compile_forest vs artefact."""
+    def best_time(load):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = load()
+            timings.append(time.perf_counter() - start)
+        return result, min(timings)
+
+    def load_pickle():
+        with open(model_path, 'rb') as f:
+            return compile_forest(pickle.load(f)['model'])
+
+    reference, pickle_s = best_time(load_pickle)
+    forest, artifact_s = best_time(lambda: load_artifact(forest_path))
+    X = np.random.default_rng(0).random((samples, int(reference.feature.max()) + 1), dtype=np.float32)
+    result = {
+        'pickle_mb': os.path.getsize(model_path) / 1e6,
+        'artifact_mb': os.path.getsize(forest_path) / 1e6,
+        'pickle_load_ms': pickle_s * 1000,
+        'artifact_load_ms': artifact_s * 1000,
+        'agreement': float(np.mean(reference.predict(X) == forest.predict(X))),
+        'max_proba_diff': float(np.abs(reference.predict_proba(X) - forest.predict_proba(X)).max()),
+    }
+    print(f"{os.path.basename(model_path)}: {result['pickle_mb']:.2f} MB, {result['pickle_load_ms']:.1f} ms | "
+          f"{os.path.basename(forest_path)}: {result['artifact_mb']:.2f} MB, {result['artifact_load_ms']:.1f} ms | "
+          f"accord {result['agreement']:.2%} (écart proba max {result['max_proba_diff']:.1e})")
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export des forêts model.p vers l'artefact .forest")
+    parser.add_argument('models', nargs='*', default=['model.p', 'model_sequence.p'])
+    parser.add_argument('--int16', action='store_true', help="Seuils quantifiés en int16 (approximation)")
+    parser.add_argument('--compress', action='store_true', help="Compressé (non mappable en mémoire)")
+    args = parser.parse_args()
+
+    for model_path in args.models:
+        if not os.path.exists(model_path):
+            print(f"⚠️  {model_path} not found. Skipping.")
+            continue
+        with open(model_path, 'rb') as f:
+            forest = ForestPredictor.from_sklearn(pickle.load(f)['model'])
+        path = save_artifact(forest, artifact_path(model_path),
+                             precision='int16' if args.int16 else 'float32', compress=args.compress)
+        print(f"✅ {model_path} -> {path}")
+        compare(model_path, path)
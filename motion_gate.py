@@ -0,0 +1,54 @@
+"""Saut de la classification quand la main ne bouge pas (poses tenues en mode LETTRES)."""
+import numpy as np
+
+from hand_features import NUM_FEATURES
+
+
+class MotionGate:
+    """Réutilise la dernière prédiction tant que les landmarks bougent moins que `threshold`.
+
+    Le déplacement est le plus grand écart euclidien d'un landmark entre les features
+    courantes et celles de la dernière prédiction réellement exécutée (coordonnées
+    normalisées, donc insensible à la translation de la main dans l'image).
+    """
+
+    def __init__(self, threshold=0.01, num_features=NUM_FEATURES):
+        self.threshold = threshold
+        self._last_features = np.zeros(num_features, dtype=np.float32)
+        self._diff = np.zeros(num_features, dtype=np.float32)
+        self._last_result = None
+        self._has_result = False
+        self.executed = 0
+        self.skipped = 0
+
+    def displacement(self, features):
+        """Déplacement maximal d'un landmark depuis la dernière prédiction exécutée."""
+        np.subtract(np.reshape(features, -1), self._last_features, out=self._diff)
+        np.square(self._diff, out=self._diff)
+        return float(np.sqrt(self._diff.reshape(-1, 2).sum(axis=1).max()))
+
+    def run(self, features, predict):
+        """Retourne `predict(features)`, ou la prédiction précédente si la main est immobile."""
+        if self._has_result and self.displacement(features) < self.threshold:
+            self.skipped += 1
+            return self._last_result
+
+        result = predict(features)
+        self._last_features[:] = np.reshape(features, -1)
+        self._last_result = result
+        self._has_result = True
+        self.executed += 1
+        return result
+
+    def reset(self):
+        """Oublie la dernière prédiction (changement de mode ou de modèle)."""
+        self._has_result = False
+        self._last_result = None
+
+    def stats(self):
+        total = self.executed + self.skipped
+        return {
+            'executed': self.executed,
+            'skipped': self.skipped,
+            'skip_ratio': self.skipped / total if total else 0.0,
+        }
@@ -0,0 +1,49 @@
+"""Buffer circulaire préalloué pour la fenêtre de séquence (mode MOTS)."""
+import numpy as np
+
+from hand_features import NUM_FEATURES
+
+
+class SequenceBuffer:
+    """Fenêtre glissante de `length` frames de `num_features` valeurs float32.
+
+    Chaque frame est écrite deux fois (positions i et i + length) : les `length`
+    dernières frames forment donc toujours une tranche contiguë du tableau interne,
+    et `window()` la retourne à plat sans recopier les 15 frames à chaque prédiction.
+    """
+
+    def __init__(self, length, num_features=NUM_FEATURES):
+        self.length = length
+        self.num_features = num_features
+        self._data = np.zeros((2 * length, num_features), dtype=np.float32)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.length
+
+    def append(self, frame):
+        """Ajoute une frame (84 valeurs, n'importe quelle forme) en écrasant la plus ancienne."""
+        frame = np.reshape(frame, self.num_features)
+        self._data[self._next] = frame
+        self._data[self._next + self.length] = frame
+        self._next = (self._next + 1) % self.length
+        self._count = min(self._count + 1, self.length)
+
+    def window(self):
+        """Vue (length * num_features,) des frames, de la plus ancienne à la plus récente.
+
+        Valide uniquement jusqu'au prochain `append` ; copier si elle doit être conservée.
+        """
+        if not self.is_full():
+            raise ValueError(f"Séquence incomplète: {self._count}/{self.length} frames")
+        start = self._next
+        return self._data[start:start + self.length].reshape(-1)
+
+    def reset(self):
+        """Vide la fenêtre (changement de mode, mot validé...)."""
+        self._next = 0
+        self._count = 0
@@ -0,0 +1,50 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from build_report import BuildReport, count_hands
+
+
+class TestBuildReport(unittest.TestCase):
+    def setUp(self):
+        self.one = np.zeros(84, dtype=np.float32)
+        self.one[:42] = 0.5
+        self.two = np.full(84, 0.5, dtype=np.float32)
+
+    def test_hand_counts_and_failure_rate(self):
+        report = BuildReport()
+        report.add_image('A', 'static', self.one, detect_s=0.01)
+        report.add_image('A', 'static', self.two, cached=True)
+        report.add_image('A', 'static', None, detect_s=0.01)
+        report.add_image('A', 'static', None, decode_failed=True)
+        report.add_time('A', 'static', wall_s=2.0, decode_s=0.5)
+        a = report.to_dict(elapsed_s=4.0)['classes']['A']
+        self.assertEqual((a['one_hand'], a['two_hands'], a['no_hand'], a['decode_failures']), (1, 1, 1, 1))
+        self.assertEqual(a['failure_rate'], 0.5)
+        self.assertEqual(a['images_per_s'], 2.0)
+        self.assertEqual(count_hands(None), 0)
+
+    def test_merge_worker_states_and_save(self):
+        main, worker = BuildReport(), BuildReport()
+        main.add_image('bonjour', 'sequence', self.one)
+        worker.add_image('bonjour', 'sequence', self.two)
+        worker.add_sequence('bonjour', 'bonjour/a.mp4', frames=40, hand_frames=38, windows=24)
+        main.merge(worker.state())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.json')
+            main.save(path, elapsed_s=1.0)
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        self.assertEqual(data['images'], 2)
+        self.assertEqual(data['classes']['bonjour']['two_hands'], 1)
+        self.assertEqual(data['sequences'][0]['windows'], 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
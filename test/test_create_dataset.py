@@ -0,0 +1,182 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+import cv2
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# MediaPipe factice (pas de modèle requis) : landmarks tirés des pixels de l'image, aucune main
+# si le canal vert du premier pixel est sombre. En mode VIDEO le résultat dépend du nombre de
+# frames déjà vues (comme le suivi) et un timestamp non croissant lève, comme MediaPipe.
+FAKE_MEDIAPIPE = {
+    'mediapipe/__init__.py': """
+        class ImageFormat:
+            SRGB = 1
+
+        class Image:
+            def __init__(self, image_format, data):
+                self.data = data
+    """,
+    'mediapipe/tasks/__init__.py': """
+        from . import python
+    """,
+    'mediapipe/tasks/python/__init__.py': """
+        class BaseOptions:
+            def __init__(self, model_asset_path=None):
+                self.model_asset_path = model_asset_path
+
+        from . import vision
+    """,
+    'mediapipe/tasks/python/vision.py': """
+        import os
+        from types import SimpleNamespace
+
+        class RunningMode:
+            IMAGE = 'image'
+            VIDEO = 'video'
+
+        class HandLandmarkerOptions:
+            def __init__(self, running_mode=RunningMode.IMAGE, **kwargs):
+                self.running_mode = running_mode
+
+        class HandLandmarker:
+            created = 0
+
+            def __init__(self, running_mode):
+                HandLandmarker.created += 1
+                self.key = f"{os.getpid()}-{HandLandmarker.created}"
+                self.running_mode = running_mode
+                self.frames = 0
+                self.last_timestamp = -1
+
+            @classmethod
+            def create_from_options(cls, options):
+                return cls(options.running_mode)
+
+            def detect(self, image):
+                assert self.running_mode == RunningMode.IMAGE
+                return self._landmarks(image.data, 0.0)
+
+            def detect_for_video(self, image, timestamp_ms):
+                assert self.running_mode == RunningMode.VIDEO
+                if timestamp_ms <= self.last_timestamp:
+                    raise ValueError(f"timestamp {timestamp_ms} <= {self.last_timestamp}")
+                self.last_timestamp = timestamp_ms
+                with open(os.environ['FAKE_MEDIAPIPE_LOG'], 'a') as f:
+                    f.write(f"{self.key} {timestamp_ms}\\n")
+                self.frames += 1
+                return self._landmarks(image.data, 1e-3 * self.frames)
+
+            def _landmarks(self, data, drift):
+                if data[0, 0, 1] < 40:
+                    return SimpleNamespace(hand_landmarks=[])
+                h, w = data.shape[:2]
+                hand = [SimpleNamespace(x=data[i % h, (3 * i) % w, 0] / 255 + drift,
+                                        y=data[(5 * i) % h, i % w, 2] / 255) for i in range(21)]
+                return SimpleNamespace(hand_landmarks=[hand])
+
+            def close(self):
+                pass
+    """,
+}
+
+BUILD_SCRIPT = """
+import json, sys
+import create_dataset
+
+create_dataset.STATIC_SHARD_SIZE = 4  # plusieurs lots par lettre : ordre de fusion testé
+results = {}
+for name, workers, use_cache in [('sequential', 1, False), ('parallel', 3, True), ('parallel_cached', 3, True)]:
+    extractor = create_dataset.HandLandmarkExtractor('Data', workers=workers, use_cache=use_cache,
+                                                     dedup_threshold=0)
+    extractor.dataset_static = name + '_data'
+    extractor.dataset_sequence = name + '_sequence_data'
+    results[name] = extractor.extract_landmarks()
+print(json.dumps(results))
+"""
+
+
+class TestParallelExtraction(unittest.TestCase):
+    """Même Data/ construit en séquentiel, en parallèle, puis en parallèle depuis le cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = cls.root = cls.tmp.name
+        for path, source in FAKE_MEDIAPIPE.items():
+            path = os.path.join(root, 'stub', path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(textwrap.dedent(source))
+
+        rng = np.random.default_rng(0)
+        cls.images = 0
+        for label, count in (('A', 10), ('B', 7), ('bonjour', 12), ('merci', 9)):
+            folder = os.path.join(root, 'Data', label)
+            os.makedirs(folder)
+            for i in range(count):
+                img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+                cv2.imwrite(os.path.join(folder, f'{label}({i + 1}).png'), img)
+                cls.images += 1
+        os.makedirs(os.path.join(root, 'Data', 'salut'))
+        writer = cv2.VideoWriter(os.path.join(root, 'Data', 'salut', 'salut.avi'),
+                                 cv2.VideoWriter_fourcc(*'MJPG'), 30, (32, 32))
+        for _ in range(20):
+            writer.write(rng.integers(0, 256, (32, 32, 3), dtype=np.uint8))
+        writer.release()
+
+        cls.log = os.path.join(root, 'timestamps.log')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(root, 'stub'), ROOT]),
+                   FAKE_MEDIAPIPE_LOG=cls.log)
+        cls.result = subprocess.run([sys.executable, '-c', BUILD_SCRIPT], cwd=root, env=env,
+                                    capture_output=True, text=True, timeout=300)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.assertEqual(self.result.returncode, 0, self.result.stderr)
+
+    def test_parallel_build_matches_sequential(self):
+        root = self.root
+        stats = json.loads(self.result.stdout.strip().splitlines()[-1])
+        for dataset in ('data', 'sequence_data'):
+            with open(os.path.join(root, f'sequential_{dataset}.npy'), 'rb') as f:
+                reference = f.read()
+            with open(os.path.join(root, f'sequential_{dataset}.json')) as f:
+                header = json.load(f)
+            self.assertGreater(header['shape'][0], 0)
+            for name in ('parallel', 'parallel_cached'):
+                with open(os.path.join(root, f'{name}_{dataset}.npy'), 'rb') as f:
+                    self.assertEqual(f.read(), reference, f"{name}_{dataset}.npy")
+                with open(os.path.join(root, f'{name}_{dataset}.json')) as f:
+                    other = json.load(f)
+                self.assertEqual((other['labels'], other.get('offsets')), (header['labels'], header.get('offsets')))
+
+        # Statistiques du cache cumulées sur les workers : une entrée par image + une par vidéo
+        entries = self.images + 1
+        self.assertEqual((stats['parallel']['hits'], stats['parallel']['misses']), (0, entries))
+        self.assertEqual((stats['parallel_cached']['hits'], stats['parallel_cached']['misses']), (entries, 0))
+
+    def test_sequence_tracking_uses_one_video_landmarker_per_sequence(self):
+        timestamps = {}
+        with open(self.log) as f:
+            for line in f:
+                key, timestamp = line.split()
+                timestamps.setdefault(key, []).append(int(timestamp))
+        # bonjour (12 images), merci (9), salut.avi (20 frames), en séquentiel puis en parallèle ;
+        # la build depuis le cache ne relance pas la détection
+        self.assertEqual(sorted(len(t) for t in timestamps.values()), [9, 9, 12, 12, 20, 20])
+        for values in timestamps.values():
+            self.assertTrue(all(a < b for a, b in zip(values, values[1:])), values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataset_dedup import prune_dataset, near_duplicate_mask, max_displacement
+
+
+class TestDatasetDedup(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.poses = rng.random((5, 84)).astype(np.float32)
+        # 20 frames par pose, jitter < seuil
+        self.data = np.repeat(self.poses, 20, axis=0) + rng.uniform(-0.001, 0.001, (100, 84)).astype(np.float32)
+        self.labels = np.array(['A'] * 60 + ['B'] * 40)
+
+    def test_jittered_frames_collapse_per_pose(self):
+        keep, report = prune_dataset(self.data, self.labels, threshold=0.005)
+        self.assertEqual(keep.tolist(), [0, 20, 40, 60, 80])
+        self.assertEqual(report['A'], {'before': 60, 'after': 3, 'removed': 57})
+
+    def test_same_pose_in_two_classes_is_kept(self):
+        labels = np.array(['A'] * 10 + ['B'] * 10)
+        keep, _ = prune_dataset(self.data[:20], labels, threshold=0.005)
+        self.assertEqual(keep.tolist(), [0, 10])
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        data = rng.random((200, 84)).astype(np.float32) * 0.02
+        threshold = 0.012
+        expected = np.zeros(200, dtype=bool)
+        kept = []
+        for i in range(200):
+            if not kept or max_displacement(data[kept], data[i]).min() >= threshold:
+                kept.append(i)
+        # Le glouton ne compare qu'aux échantillons gardés, comme la version KD-tree
+        expected[kept] = True
+        np.testing.assert_array_equal(near_duplicate_mask(data, threshold), expected)
+
+    def test_budget_per_class(self):
+        keep, report = prune_dataset(self.data, self.labels, threshold=0, max_per_class=10)
+        self.assertEqual(len(keep), 20)
+        self.assertEqual(report['B']['after'], 10)
+        # Les représentants couvrent les poses distinctes de la classe
+        self.assertEqual(len({i // 20 for i in keep if i < 60}), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import os
+import sys
+import pickle
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataset_store import (save_dataset, load_dataset, dataset_exists, convert_pickle,
+                           save_frame_dataset, load_sequence_dataset, num_windows, merge_classes)
+
+
+class TestDatasetStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stem = os.path.join(self.tmp.name, 'data')
+        rng = np.random.default_rng(0)
+        self.data = [rng.random(84).tolist() for _ in range(10)]
+        self.labels = ['B', 'A'] * 5
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_is_memmapped_float32(self):
+        save_dataset(self.stem, self.data, self.labels, meta={'sequence_length': 15})
+        features, labels, meta = load_dataset(self.stem + '.pickle')
+        self.assertIsInstance(features, np.memmap)
+        self.assertEqual(features.dtype, np.float32)
+        np.testing.assert_array_equal(features, np.asarray(self.data, dtype=np.float32))
+        self.assertEqual(labels.tolist(), self.labels)
+        self.assertEqual(meta, {'sequence_length': 15})
+        self.assertIsNone(load_dataset(self.stem, groups=True)[3])
+
+    def test_legacy_pickle_fallback_and_conversion(self):
+        with open(self.stem + '.pickle', 'wb') as f:
+            pickle.dump({'data': self.data, 'labels': self.labels}, f)
+        self.assertTrue(dataset_exists(self.stem))
+        legacy, legacy_labels, _ = load_dataset(self.stem)
+        self.assertNotIsInstance(legacy, np.memmap)
+
+        convert_pickle(self.stem + '.pickle')
+        features, labels, _ = load_dataset(self.stem)
+        self.assertIsInstance(features, np.memmap)
+        np.testing.assert_array_equal(features, legacy)
+        self.assertEqual(labels.tolist(), legacy_labels.tolist())
+
+    def test_missing_dataset(self):
+        self.assertFalse(dataset_exists(self.stem))
+        with self.assertRaises(FileNotFoundError):
+            load_dataset(self.stem)
+
+
+    def test_merge_replaces_only_given_classes(self):
+        save_dataset(self.stem, self.data, self.labels, meta={'data_dir': 'Data'})
+        merge_classes(self.stem, np.ones((3, 84)), ['A', 'C', 'C'], meta={'dedup': 0})
+        features, labels, meta = load_dataset(self.stem)
+        self.assertEqual(sorted(labels.tolist()), ['A'] + ['B'] * 5 + ['C'] * 2)
+        np.testing.assert_array_equal(features[labels == 'B'], np.asarray(self.data[::2], dtype=np.float32))
+        self.assertEqual(meta, {'data_dir': 'Data', 'dedup': 0})
+
+class TestSequenceDataset(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stem = os.path.join(self.tmp.name, 'sequence_data')
+        rng = np.random.default_rng(0)
+        # 40 frames (pas 1), 12 frames (étirée), 5 frames (ignorée)
+        self.videos = [rng.random((n, 84), dtype=np.float32) for n in (40, 12, 5)]
+        save_frame_dataset(self.stem, self.videos, ['bonjour', 'merci', 'oui'], meta={'sequence_length': 15})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frames_stored_once(self):
+        dataset = load_sequence_dataset(self.stem)
+        self.assertEqual(dataset.frames.shape, (57, 84))
+        np.testing.assert_array_equal(dataset.video(1), self.videos[1])
+
+    def test_windows_match_legacy_slicing(self):
+        X, y = load_sequence_dataset(self.stem).windows(15, seed=0)
+        # 26 fenêtres pour 'bonjour', 1 étirée + 1 bruitée pour 'merci'
+        self.assertEqual(X.shape, (28, 15 * 84))
+        self.assertEqual(y.tolist(), ['bonjour'] * 26 + ['merci'] * 2)
+        np.testing.assert_array_equal(X[3], self.videos[0][3:18].flatten())
+        indices = np.linspace(0, 11, 15, dtype=int)
+        np.testing.assert_array_equal(X[26], self.videos[1][indices].flatten())
+        self.assertFalse(np.array_equal(X[27], X[26]))
+
+    def test_num_windows_matches_windows(self):
+        dataset = load_sequence_dataset(self.stem)
+        for length, stride in ((15, None), (10, 3), (20, None)):
+            _, y = dataset.windows(length, stride)
+            expected = [num_windows(n, length, stride) for n in dataset.lengths]
+            self.assertEqual([int((y == label).sum()) for label in dataset.labels], expected)
+
+    def test_window_groups_are_source_videos(self):
+        X, y, _, groups = load_dataset(self.stem, sequence_length=10, stride=5, groups=True)
+        self.assertEqual(len(groups), len(X))
+        self.assertEqual(set(groups[y == 'bonjour']), {0})
+        self.assertEqual(set(groups[y == 'merci']), {1})
+
+    def test_time_blocks_group_windows_without_crossing(self):
+        dataset = load_sequence_dataset(self.stem)
+        blocks = dataset.time_blocks(10, min_groups=3)
+        # 'merci' (12 frames) ne contient qu'un bloc de 10
+        self.assertEqual(blocks.tolist(), [3, 1, 1])
+        X, y, groups = dataset.windows(10, 5, groups=True, blocks=blocks)
+        # Débuts 0..30 : les fenêtres à cheval sur 13.3 / 26.7 frames sont écartées
+        np.testing.assert_array_equal(X[y == 'bonjour'][:, :84], self.videos[0][[0, 15, 30]])
+        self.assertEqual(groups[y == 'bonjour'].tolist(), [0, 1, 2])
+        self.assertEqual(set(groups[y == 'merci']), {3})
+        _, _, meta, _ = load_dataset(self.stem, sequence_length=10, stride=5, groups=True, min_groups=3)
+        self.assertEqual(meta['split_videos'], 1)
+
+    def test_length_and_stride_chosen_at_load(self):
+        X, y, meta = load_dataset(self.stem, sequence_length=10, stride=5)
+        self.assertEqual(X.shape[1], 10 * 84)
+        self.assertEqual(meta['sequence_length'], 10)
+        self.assertEqual((y == 'bonjour').sum(), 7)
+
+    def test_video_windows_are_views(self):
+        dataset = load_sequence_dataset(self.stem, mmap=False)
+        windows = dataset.video_windows(0, 15, stride=5)
+        self.assertEqual(windows.shape, (6, 15, 84))
+        self.assertTrue(np.shares_memory(windows, dataset.frames))
+        np.testing.assert_array_equal(windows[2], self.videos[0][10:25])
+        self.assertEqual(dataset.window_index(15, stride=5).tolist()[:2], [[0, 0], [0, 5]])
+
+
+    def test_merge_keeps_other_videos(self):
+        merge_classes(self.stem, [np.zeros((20, 84))], ['merci'])
+        dataset = load_sequence_dataset(self.stem)
+        self.assertEqual(dataset.labels.tolist(), ['bonjour', 'oui', 'merci'])
+        np.testing.assert_array_equal(dataset.video(1), self.videos[2])
+        self.assertEqual(dataset.meta['sequence_length'], 15)
+
+if __name__ == '__main__':
+    unittest.main()
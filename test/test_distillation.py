@@ -0,0 +1,53 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from forest_predictor import ForestPredictor
+from landmark_augment import LandmarkAugmenter
+from distillation import teacher_batches, agreement, single_sample_ms, distill_report
+
+
+class TestDistillation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.X = rng.random((120, 84)).astype(np.float32)
+        cls.y = np.array(['A', 'B', 'C'])[(cls.X[:, 0] * 3).astype(int)]
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(cls.X, cls.y)
+        cls.teacher = ForestPredictor.from_sklearn(model)
+
+    def test_batches_are_soft_teacher_targets(self):
+        batches = teacher_batches(self.teacher, self.X, batch_size=32, augmenter=LandmarkAugmenter(seed=0), seed=0)
+        X, targets = next(batches)
+        self.assertEqual(X.shape, (64, 84))
+        np.testing.assert_allclose(targets, self.teacher.predict_proba(X))
+        np.testing.assert_allclose(targets.sum(axis=1), 1, rtol=1e-5)
+        # Une époque couvre tous les échantillons réels une fois
+        sizes = [len(next(batches)[0]) for _ in range(3)]
+        self.assertEqual(sizes, [64, 64, 48])
+
+    def test_agreement(self):
+        proba = self.teacher.predict_proba(self.X)
+        self.assertEqual(agreement(proba, proba, self.teacher.classes_)['top1'], 1.0)
+        # Élève qui répond toujours 'A'
+        student = np.tile([1.0, 0.0, 0.0], (len(proba), 1))
+        result = agreement(proba, student, self.teacher.classes_)
+        self.assertEqual(result['per_class']['A'], 1.0)
+        self.assertEqual(result['per_class']['B'], 0.0)
+        self.assertAlmostEqual(result['top1'], np.mean(np.argmax(proba, axis=1) == 0), places=4)
+
+    def test_report(self):
+        ms = single_sample_ms(self.teacher.predict_proba, self.X, repeats=20)
+        self.assertGreater(ms, 0)
+        report = distill_report({'top1': 1.0}, {'top1': 0.9}, 2.0, 0.5, 1000, 250)
+        self.assertEqual(report['latency_ms']['speedup'], 4.0)
+        self.assertEqual(report['size_bytes']['ratio'], 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from forest_predictor import ForestPredictor, compile_forest
+
+
+class TestForestPredictor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.X = rng.random((600, 84)).astype(np.float32)
+        labels = np.array(['A', 'B', 'C', 'Famille'])
+        cls.y = labels[(cls.X[:, 0] * 2 + cls.X[:, 5] + rng.random(600) * 0.3).astype(int) % 4]
+        cls.model = RandomForestClassifier(n_estimators=20, max_depth=15, random_state=42).fit(cls.X, cls.y)
+        cls.forest = ForestPredictor.from_sklearn(cls.model)
+
+    def test_predict_proba_parity(self):
+        X = np.random.default_rng(1).random((200, 84)).astype(np.float32)
+        X[:50] = self.X[:50]  # Valeurs exactement sur les données d'entraînement (seuils limites)
+        np.testing.assert_allclose(self.forest.predict_proba(X), self.model.predict_proba(X), atol=1e-6)
+        np.testing.assert_array_equal(self.forest.predict(X), self.model.predict(X))
+
+    def test_single_sample(self):
+        x = self.X[3]
+        np.testing.assert_allclose(self.forest.predict_proba([x]), self.model.predict_proba([x]), atol=1e-6)
+        self.assertEqual(self.forest.predict([x])[0], self.model.predict([x])[0])
+        np.testing.assert_array_equal(self.forest.classes_, self.model.classes_)
+
+    def test_compile_forest_passthrough(self):
+        self.assertIsNone(compile_forest(None))
+        other = object()
+        self.assertIs(compile_forest(other), other)
+        self.assertIsInstance(compile_forest(self.model), ForestPredictor)
+
+
+if __name__ == '__main__':
+    unittest.main()
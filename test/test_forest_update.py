@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from forest_predictor import ForestPredictor
+from forest_update import add_classes, refresh_leaves, grow_trees, replay_indices
+
+
+class TestForestUpdate(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        centers = rng.random((4, 84))
+        self.y = np.repeat(np.array(['A', 'B', 'bonjour', 'C']), 50)
+        self.X = (np.repeat(centers, 50, axis=0) + rng.normal(0, 0.05, (200, 84))).astype(np.float32)
+        self.old = np.isin(self.y, ['A', 'B', 'C'])
+        self.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X[self.old], self.y[self.old])
+
+    def test_add_classes_keeps_old_predictions(self):
+        before = self.model.predict_proba(self.X)
+        added = add_classes(self.model, ['bonjour', 'A'])
+        self.assertEqual(added.tolist(), ['bonjour'])
+        self.assertEqual(self.model.classes_.tolist(), ['A', 'B', 'C', 'bonjour'])
+        after = self.model.predict_proba(self.X)
+        np.testing.assert_allclose(after[:, :3], before)
+        np.testing.assert_array_equal(after[:, 3], 0)
+
+    def test_update_learns_new_class(self):
+        new = ~self.old
+        add_classes(self.model, ['bonjour'])
+        refresh_leaves(self.model, self.X[new], self.y[new])
+        rows = np.concatenate([np.flatnonzero(new), replay_indices(self.y, ['A', 'B', 'C'], 10)])
+        grow_trees(self.model, self.X[rows], self.y[rows], 5)
+        self.assertEqual(len(self.model.estimators_), 15)
+        self.assertEqual((self.model.predict(self.X) == self.y).mean(), 1.0)
+        # Toujours compilable pour les applications
+        forest = ForestPredictor.from_sklearn(self.model)
+        np.testing.assert_allclose(forest.predict_proba(self.X), self.model.predict_proba(self.X), atol=1e-5)
+
+    def test_grow_requires_replay_of_every_class(self):
+        add_classes(self.model, ['bonjour'])
+        new = ~self.old
+        with self.assertRaises(ValueError):
+            grow_trees(self.model, self.X[new], self.y[new], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
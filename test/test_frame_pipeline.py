@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import itertools
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from frame_pipeline import FramePipeline, LatestSlot
+
+
+class TestLatestSlot(unittest.TestCase):
+    def test_put_overwrites_stale_item(self):
+        slot = LatestSlot()
+        slot.put(1)
+        slot.put(2)
+        self.assertEqual(slot.get_nowait(), 2)
+        self.assertIsNone(slot.get_nowait())
+        self.assertEqual(slot.dropped, 1)
+
+    def test_get_timeout(self):
+        self.assertIsNone(LatestSlot().get(timeout=0.01))
+
+
+class TestFramePipeline(unittest.TestCase):
+    def test_stages_run_in_order(self):
+        counter = itertools.count()
+
+        def source():
+            time.sleep(0.005)
+            return next(counter)
+
+        pipeline = FramePipeline([
+            ('source', source),
+            ('double', lambda x: x * 2),
+            ('tag', lambda x: ('done', x)),
+        ]).start()
+        try:
+            result = pipeline.output.get(timeout=2.0)
+        finally:
+            pipeline.stop()
+        self.assertEqual(result[0], 'done')
+        self.assertEqual(result[1] % 2, 0)
+        self.assertFalse(pipeline.is_running())
+        self.assertEqual(set(pipeline.stats()), {'source', 'double', 'tag'})
+
+    def test_stage_error_does_not_stop_pipeline(self):
+        def flaky(x):
+            if x == 0:
+                raise ValueError("boom")
+            return x
+
+        counter = itertools.count()
+        pipeline = FramePipeline([('source', lambda: next(counter)), ('flaky', flaky)]).start()
+        try:
+            result = pipeline.output.get(timeout=2.0)
+        finally:
+            pipeline.stop()
+        self.assertIsNotNone(result)
+        self.assertGreater(result, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
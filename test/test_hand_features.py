@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from hand_features import HandFeatureExtractor, extract_features, NUM_FEATURES
+
+
+def make_hand(rng, offset_x=0.0):
+    return [SimpleNamespace(x=float(x) + offset_x, y=float(y)) for x, y in rng.random((21, 2)) * 0.3]
+
+
+def reference_features(hands):
+    """Ancienne implémentation (listes Python) utilisée comme référence."""
+    sorted_hands = sorted(hands, key=lambda h: h[0].x)
+    x_ = [lm.x for h in sorted_hands for lm in h]
+    y_ = [lm.y for h in sorted_hands for lm in h]
+    data_aux = []
+    for h in sorted_hands:
+        for lm in h:
+            data_aux.append(lm.x - min(x_))
+            data_aux.append(lm.y - min(y_))
+    if len(data_aux) == 42:
+        data_aux.extend([0.0] * 42)
+    return data_aux
+
+
+class TestHandFeatures(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_single_hand_padded(self):
+        hand = make_hand(self.rng)
+        features = extract_features([hand])
+        self.assertEqual(features.dtype, np.float32)
+        self.assertEqual(features.size, NUM_FEATURES)
+        np.testing.assert_allclose(features.ravel(), reference_features([hand]), atol=1e-6)
+        self.assertTrue(np.all(features[1] == 0.0))
+
+    def test_two_hands_sorted_left_to_right(self):
+        left, right = make_hand(self.rng), make_hand(self.rng, offset_x=0.5)
+        features = extract_features([right, left])
+        np.testing.assert_allclose(features.ravel(), reference_features([right, left]), atol=1e-6)
+
+    def test_solutions_api_landmarks(self):
+        hand = make_hand(self.rng)
+        features = extract_features([SimpleNamespace(landmark=hand)])
+        np.testing.assert_allclose(features.ravel(), reference_features([hand]), atol=1e-6)
+
+    def test_writes_into_caller_buffer(self):
+        out = np.full((2, 21, 2), 7.0, dtype=np.float32)
+        extractor = HandFeatureExtractor(out)
+        self.assertEqual(extractor.update([make_hand(self.rng)]), 1)
+        self.assertIs(extractor.features, out)
+        self.assertTrue(np.shares_memory(extractor.flat, out))
+        self.assertTrue(np.all(out[1] == 0.0))
+
+    def test_no_hand(self):
+        self.assertIsNone(extract_features([]))
+        self.assertIsNone(extract_features(None))
+
+    def test_bbox(self):
+        extractor = HandFeatureExtractor()
+        hand = make_hand(self.rng)
+        extractor.update([hand])
+        min_x, min_y, max_x, max_y = extractor.bbox()
+        self.assertAlmostEqual(min_x, min(lm.x for lm in hand), places=6)
+        self.assertAlmostEqual(max_y, max(lm.y for lm in hand), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
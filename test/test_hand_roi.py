@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from hand_roi import HandROI
+from hand_features import HandFeatureExtractor
+
+
+class TestHandROI(unittest.TestCase):
+    def setUp(self):
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.roi = HandROI(margin=0.3, input_size=128, refresh_interval=0)
+
+    def test_full_frame_without_hand(self):
+        image, offset, scale = self.roi.prepare(self.frame)
+        self.assertEqual(image.shape, (480, 640, 3))
+        self.assertEqual((offset, scale), ((0.0, 0.0), (1.0, 1.0)))
+
+    def test_crop_is_square_inside_frame_and_downscaled(self):
+        self.roi.update((0.9, 0.1, 0.99, 0.3), self.frame.shape)
+        x0, y0, x1, y1 = self.roi.region
+        self.assertEqual(x1 - x0, y1 - y0)
+        self.assertTrue(0 <= x0 and x1 <= 640 and 0 <= y0 and y1 <= 480)
+        image, _, _ = self.roi.prepare(self.frame)
+        self.assertEqual(image.shape, (128, 128, 3))
+
+    def test_landmarks_mapped_back_to_full_frame(self):
+        rng = np.random.default_rng(0)
+        full = rng.random((21, 2)) * 0.2 + 0.4
+        self.roi.update((full[:, 0].min(), full[:, 1].min(), full[:, 0].max(), full[:, 1].max()), self.frame.shape)
+        _, offset, scale = self.roi.prepare(self.frame)
+        in_crop = (full - offset) / scale
+        self.assertTrue(np.all((in_crop >= 0) & (in_crop <= 1)))
+
+        reference = HandFeatureExtractor()
+        reference.update([[SimpleNamespace(x=x, y=y) for x, y in full]])
+        mapped = HandFeatureExtractor()
+        mapped.update([[SimpleNamespace(x=x, y=y) for x, y in in_crop]], offset, scale)
+        np.testing.assert_allclose(mapped.features, reference.features, atol=1e-6)
+
+    def test_region_kept_while_hand_stays_inside(self):
+        self.roi.update((0.4, 0.4, 0.5, 0.5), self.frame.shape)
+        region = self.roi.region
+        self.roi.update((0.405, 0.4, 0.505, 0.5), self.frame.shape)
+        self.assertEqual(self.roi.region, region)
+        self.roi.update((0.6, 0.4, 0.7, 0.5), self.frame.shape)
+        self.assertNotEqual(self.roi.region, region)
+
+    def test_lost_hand_and_refresh_fall_back_to_full_frame(self):
+        self.roi.update((0.4, 0.4, 0.5, 0.5), self.frame.shape)
+        self.roi.update(None, self.frame.shape)
+        self.assertIsNone(self.roi.region)
+
+        roi = HandROI(refresh_interval=3)
+        roi.update((0.4, 0.4, 0.5, 0.5), self.frame.shape)
+        shapes = [roi.prepare(self.frame)[0].shape for _ in range(3)]
+        self.assertEqual(shapes[-1], (480, 640, 3))
+
+    def test_tracking_mode_keeps_crop_while_hand_is_tracked(self):
+        roi = HandROI(refresh_interval=3, tracking=True)
+        roi.update((0.4, 0.4, 0.5, 0.5), self.frame.shape)
+        region = roi.region
+        for _ in range(10):
+            _, offset, _ = roi.prepare(self.frame)
+            self.assertNotEqual(offset, (0.0, 0.0))
+            roi.update((0.405, 0.4, 0.505, 0.5), self.frame.shape)
+            self.assertEqual(roi.region, region)
+        # Main perdue : seul cas (avec la sortie de zone) où l'entrée du détecteur change
+        roi.update(None, self.frame.shape)
+        self.assertEqual(roi.prepare(self.frame)[0].shape, (480, 640, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
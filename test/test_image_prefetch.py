@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from image_prefetch import ImagePrefetcher, reduction_factor
+
+
+class TestImagePrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Dossier accentué comme dans Data/ (ex: "métro")
+        self.folder = os.path.join(self.tmp.name, 'métro')
+        os.makedirs(self.folder)
+        self.paths = []
+        for i in range(10):
+            img = np.full((480, 640, 3), i * 20, dtype=np.uint8)
+            path = os.path.join(self.folder, f'métro({i}).png')
+            cv2.imencode('.png', img)[1].tofile(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_order_preserved_with_small_queue(self):
+        results = list(ImagePrefetcher(self.paths, workers=3, queue_size=2))
+        self.assertEqual([p for p, _, _ in results], self.paths)
+        self.assertEqual([int(img[0, 0, 0]) for _, img, _ in results], [i * 20 for i in range(10)])
+
+    def test_reduced_decode(self):
+        self.assertEqual(reduction_factor(640, 480, 160), 4)
+        self.assertEqual(reduction_factor(640, 480, 300), 2)
+        self.assertEqual(reduction_factor(640, 480, 400), 1)
+        shapes = {img.shape for _, img, _ in ImagePrefetcher(self.paths, max_size=300)}
+        self.assertEqual(shapes, {(240, 320, 3)})
+
+    def test_mixed_sizes_never_reduced_below_max_size(self):
+        large = os.path.join(self.folder, 'large.png')
+        cv2.imencode('.png', np.zeros((1920, 2560, 3), dtype=np.uint8))[1].tofile(large)
+        prefetcher = ImagePrefetcher([large] + self.paths[:2], workers=2, max_size=640)
+        shapes = [img.shape for _, img, _ in prefetcher]
+        self.assertEqual(shapes, [(480, 640, 3), (480, 640, 3), (480, 640, 3)])
+        self.assertEqual(prefetcher.factor, 1)
+
+    def test_missing_file_reported(self):
+        missing = os.path.join(self.folder, 'absent.png')
+        results = list(ImagePrefetcher([self.paths[0], missing]))
+        self.assertIsNone(results[1][1])
+        self.assertIsNotNone(results[1][2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from landmark_augment import LandmarkAugmenter
+from hand_features import HandFeatureExtractor
+
+
+def _features(hands):
+    extractor = HandFeatureExtractor()
+    extractor.update([[SimpleNamespace(x=x, y=y) for x, y in hand] for hand in hands])
+    return extractor.flat.copy()
+
+
+class TestLandmarkAugmenter(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.left = rng.random((21, 2)) * 0.2 + (0.2, 0.4)
+        self.right = rng.random((21, 2)) * 0.2 + (0.6, 0.4)
+        self.one_hand = _features([self.left])
+        self.two_hands = _features([self.left, self.right])
+
+    def test_identity_when_disabled(self):
+        augmenter = LandmarkAugmenter(rotation_deg=0, scale=0, hand_shift=0, mirror_prob=0, speed=None)
+        X = np.stack([self.one_hand, self.two_hands])
+        np.testing.assert_allclose(augmenter.augment(X), X, atol=1e-6)
+
+    def test_output_stays_normalized(self):
+        X = np.tile(np.stack([self.one_hand, self.two_hands]), (50, 1))
+        out = LandmarkAugmenter(seed=0).augment(X).reshape(100, 2, 21, 2)
+        self.assertFalse(np.array_equal(out.reshape(100, -1), X))
+        # Main absente toujours à zéro, minimum des points présents à 0
+        self.assertTrue(np.all(out[0::2, 1] == 0))
+        np.testing.assert_allclose(out[1::2].reshape(50, -1, 2).min(axis=1), 0, atol=1e-6)
+        np.testing.assert_allclose(out[0::2, 0].min(axis=1), 0, atol=1e-6)
+
+    def test_mirror_matches_extraction_of_mirrored_hands(self):
+        augmenter = LandmarkAugmenter(rotation_deg=0, scale=0, hand_shift=0, mirror_prob=1.0, speed=None)
+        mirrored = [(1 - self.left) * (1, -1) + (0, 1), (1 - self.right) * (1, -1) + (0, 1)]
+        expected = _features(mirrored)
+        np.testing.assert_allclose(augmenter.augment(self.two_hands[None])[0], expected, atol=1e-5)
+
+    def test_speed_warp_keeps_frames(self):
+        frames = np.stack([self.one_hand * (1 + 0.01 * t) for t in range(15)])
+        X = frames.reshape(1, -1)
+        augmenter = LandmarkAugmenter(rotation_deg=0, scale=0, hand_shift=0, mirror_prob=0, speed=(1.2, 1.2))
+        out = augmenter.augment(X).reshape(15, -1)
+        # Chaque frame est une frame de la fenêtre d'origine, le milieu est conservé
+        for frame in out:
+            self.assertTrue(np.any(np.all(np.isclose(frames, frame, atol=1e-6), axis=1)))
+        np.testing.assert_allclose(out[7], frames[7], atol=1e-6)
+        np.testing.assert_allclose(out[0], frames[0], atol=1e-6)
+
+    def test_expand_and_batches(self):
+        X = np.stack([self.one_hand, self.two_hands])
+        Xa, ya = LandmarkAugmenter(seed=0).expand(X, ['A', 'B'], copies=3)
+        self.assertEqual(Xa.shape, (8, 84))
+        self.assertEqual(ya.tolist(), ['A', 'B'] * 4)
+        xb, yb = next(LandmarkAugmenter(seed=0).batches(X, np.array([0, 1]), batch_size=2))
+        self.assertEqual(xb.shape, (4, 84))
+        self.assertEqual(sorted(yb.tolist()), [0, 0, 1, 1])
+        # Originaux inclus dans chaque lot
+        self.assertTrue(all(np.any(np.all(np.isclose(xb[:2], x), axis=1)) for x in X))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from landmark_cache import LandmarkCache, MISSING
+
+
+class TestLandmarkCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.db = os.path.join(self.root, 'cache.sqlite')
+        self.img = os.path.join(self.root, 'A', '0.jpg')
+        os.makedirs(os.path.dirname(self.img))
+        with open(self.img, 'wb') as f:
+            f.write(b'jpeg-bytes')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_and_no_hand_marker(self):
+        cache = LandmarkCache(self.db, root=self.root)
+        self.assertIs(cache.get(self.img), MISSING)
+        features = np.arange(84, dtype=np.float32)
+        cache.put(self.img, features)
+        cache.close()
+
+        cache = LandmarkCache(self.db, root=self.root)
+        np.testing.assert_array_equal(cache.get(self.img), features)
+        cache.put(self.img, None)
+        self.assertIsNone(cache.get(self.img))
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 0, 'hit_rate': 1.0})
+        cache.close()
+
+    def test_modified_file_is_a_miss(self):
+        cache = LandmarkCache(self.db, root=self.root)
+        cache.put(self.img, np.zeros(84, dtype=np.float32))
+        with open(self.img, 'wb') as f:
+            f.write(b'other, longer jpeg bytes')
+        self.assertIs(cache.get(self.img), MISSING)
+        cache.close()
+
+    def test_hash_mode_survives_touch(self):
+        cache = LandmarkCache(self.db, root=self.root, use_hash=True)
+        cache.put(self.img, np.ones(84, dtype=np.float32))
+        st = os.stat(self.img)
+        os.utime(self.img, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertIsNot(cache.get(self.img), MISSING)
+        cache.close()
+
+    def test_video_entry_per_variant(self):
+        cache = LandmarkCache(self.db, root=self.root)
+        frames = np.random.default_rng(0).random((7, 84), dtype=np.float32)
+        cache.put(self.img, frames, variant='fps=15')
+        np.testing.assert_array_equal(cache.get(self.img, variant='fps=15'), frames)
+        self.assertIs(cache.get(self.img, variant='fps=all'), MISSING)
+        self.assertIs(cache.get(self.img), MISSING)
+        cache.close()
+
+    def test_video_counts_kept_next_to_hand_frames(self):
+        cache = LandmarkCache(self.db, root=self.root, signature='v1')
+        self.assertIsNone(cache.get_counts(self.img, 'fps=15'))
+        counts = {'frames': 30, 'no_hand': 22, 'decode_failures': 1}
+        cache.put(self.img, np.zeros((7, 84), dtype=np.float32), variant='fps=15', counts=counts)
+        cache.close()
+        cache = LandmarkCache(self.db, root=self.root, signature='v1')
+        self.assertEqual(len(cache.get(self.img, variant='fps=15')), 7)
+        self.assertEqual(cache.get_counts(self.img, 'fps=15'), counts)
+        cache.close()
+        cache = LandmarkCache(self.db, root=self.root, signature='v2')
+        self.assertIsNone(cache.get_counts(self.img, 'fps=15'))
+        cache.close()
+
+    def test_signature_change_clears_cache(self):
+        cache = LandmarkCache(self.db, root=self.root, signature='v1')
+        cache.put(self.img, np.zeros(84, dtype=np.float32))
+        cache.close()
+        cache = LandmarkCache(self.db, root=self.root, signature='v2')
+        self.assertIs(cache.get(self.img), MISSING)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
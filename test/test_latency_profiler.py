@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from latency_profiler import LatencyProfiler
+
+
+class TestLatencyProfiler(unittest.TestCase):
+    def test_percentiles_over_rolling_window(self):
+        profiler = LatencyProfiler(window=100)
+        for ms in range(1, 201):
+            profiler.record('detection', ms / 1000.0)
+        stats = profiler.stats()['detection']
+        # Seules les 100 dernières mesures (101..200 ms) comptent
+        self.assertAlmostEqual(stats['p50_ms'], np.percentile(np.arange(101, 201), 50), places=3)
+        self.assertAlmostEqual(stats['p99_ms'], np.percentile(np.arange(101, 201), 99), places=3)
+        self.assertEqual(stats['count'], 200)
+
+    def test_stages_follow_loop_order(self):
+        profiler = LatencyProfiler()
+        for stage in ('display', 'custom', 'capture', 'detection'):
+            with profiler.measure(stage):
+                pass
+        self.assertEqual(list(profiler.stats()), ['capture', 'detection', 'display', 'custom'])
+
+    def test_snapshot_written_as_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'latency_stats.json')
+            profiler = LatencyProfiler(snapshot_path=path, snapshot_interval=0)
+            with profiler.measure('capture'):
+                pass
+            profiler.maybe_snapshot()
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        self.assertIn('capture', data['stages'])
+        self.assertEqual(set(data['stages']['capture']), {'p50_ms', 'p95_ms', 'p99_ms', 'fps', 'count'})
+
+    def test_disabled_records_nothing(self):
+        profiler = LatencyProfiler(enabled=False)
+        with profiler.measure('capture'):
+            pass
+        self.assertEqual(profiler.stats(), {})
+
+    def test_draw_on_frame(self):
+        profiler = LatencyProfiler()
+        profiler.record('capture', 0.005)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        profiler.draw(frame)
+        self.assertTrue(frame.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
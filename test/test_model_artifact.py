@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import pickle
+import tempfile
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from forest_predictor import ForestPredictor
+from model_artifact import save_artifact, load_artifact, load_model, artifact_path
+
+
+class TestModelArtifact(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.X = rng.random((400, 84)).astype(np.float32)
+        labels = np.array(['A', 'B', 'C', 'bonjour'])
+        cls.y = labels[(cls.X[:, 0] * 3 + cls.X[:, 5]).astype(int)]
+        cls.model = RandomForestClassifier(n_estimators=10, max_depth=12, random_state=0).fit(cls.X, cls.y)
+        cls.forest = ForestPredictor.from_sklearn(cls.model)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'model.forest')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_float32_is_exact_and_memmapped(self):
+        save_artifact(self.forest, self.path)
+        loaded = load_artifact(self.path)
+        self.assertFalse(loaded.threshold.flags.writeable)  # vue en lecture seule sur le fichier
+        np.testing.assert_array_equal(loaded.predict_proba(self.X), self.forest.predict_proba(self.X))
+        self.assertEqual(loaded.classes_.tolist(), ['A', 'B', 'C', 'bonjour'])
+        # Indices compacts : 84 features tiennent sur un octet
+        self.assertEqual(loaded.feature.dtype, np.uint8)
+
+    def test_int16_and_compressed(self):
+        save_artifact(self.forest, self.path, precision='int16', compress=True)
+        loaded = load_artifact(self.path)
+        self.assertEqual(loaded.threshold.dtype, np.int16)
+        self.assertGreater(np.mean(loaded.predict(self.X) == self.forest.predict(self.X)), 0.99)
+
+    def test_load_model_prefers_fresh_artifact(self):
+        model_path = os.path.join(self.tmp.name, 'model.p')
+        with open(model_path, 'wb') as f:
+            pickle.dump({'model': self.model}, f)
+        self.assertTrue(load_model(model_path).threshold.flags.writeable)
+        save_artifact(self.forest, artifact_path(model_path))
+        self.assertFalse(load_model(model_path).threshold.flags.writeable)
+        # Pickle plus récent (ré-entraînement sans export) : l'artefact est ignoré
+        later = time.time() + 10
+        os.utime(model_path, (later, later))
+        self.assertTrue(load_model(model_path).threshold.flags.writeable)
+        self.assertIsNone(load_model(os.path.join(self.tmp.name, 'absent.p')))
+
+    def test_rejects_other_files(self):
+        np.save(self.path, np.zeros(32, dtype=np.uint8))
+        os.replace(self.path + '.npy', self.path)
+        with self.assertRaises(ValueError):
+            load_artifact(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
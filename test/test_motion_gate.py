@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from motion_gate import MotionGate
+
+
+class TestMotionGate(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.gate = MotionGate(threshold=0.01)
+        self.features = np.random.default_rng(0).random(84).astype(np.float32) * 0.3
+
+    def predict(self, features):
+        self.calls.append(features.copy())
+        return len(self.calls)
+
+    def test_still_hand_reuses_prediction(self):
+        self.assertEqual(self.gate.run(self.features, self.predict), 1)
+        jitter = self.features + np.float32(0.001)
+        self.assertEqual(self.gate.run(jitter, self.predict), 1)
+        self.assertEqual(self.gate.stats(), {'executed': 1, 'skipped': 1, 'skip_ratio': 0.5})
+
+    def test_moving_landmark_runs_prediction(self):
+        self.gate.run(self.features, self.predict)
+        moved = self.features.copy()
+        moved[10] += 0.05  # Un seul landmark bouge (ex: un doigt)
+        self.assertEqual(self.gate.run(moved, self.predict), 2)
+        self.assertEqual(self.gate.executed, 2)
+
+    def test_compares_with_last_executed_features(self):
+        """Une dérive lente finit par déclencher une prédiction."""
+        self.gate.run(self.features, self.predict)
+        drifted = self.features.copy()
+        for _ in range(3):
+            drifted[0] += 0.004
+            self.gate.run(drifted, self.predict)
+        self.assertEqual(self.gate.executed, 2)
+
+    def test_reset(self):
+        self.gate.run(self.features, self.predict)
+        self.gate.reset()
+        self.assertEqual(self.gate.run(self.features, self.predict), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sequence_buffer import SequenceBuffer
+
+
+class TestSequenceBuffer(unittest.TestCase):
+    def test_window_matches_list_buffer(self):
+        """Même résultat que l'ancien `list.pop(0)` + `np.array(...).flatten()`."""
+        rng = np.random.default_rng(0)
+        buffer = SequenceBuffer(15)
+        reference = []
+        for _ in range(40):
+            frame = rng.random(84, dtype=np.float32)
+            buffer.append(frame)
+            reference.append(frame)
+            if len(reference) > 15:
+                reference.pop(0)
+            self.assertEqual(len(buffer), len(reference))
+            if len(reference) == 15:
+                window = buffer.window()
+                self.assertEqual(window.shape, (15 * 84,))
+                self.assertTrue(window.flags['C_CONTIGUOUS'])
+                np.testing.assert_array_equal(window, np.array(reference).flatten())
+                # Lot (1, N) passé aux modèles sans copie (une liste [window] serait recopiée)
+                self.assertTrue(np.shares_memory(np.asarray(window[None], dtype=np.float32), window))
+
+    def test_incomplete_window_raises(self):
+        buffer = SequenceBuffer(3, num_features=2)
+        buffer.append([1, 2])
+        self.assertFalse(buffer.is_full())
+        with self.assertRaises(ValueError):
+            buffer.window()
+
+    def test_reset(self):
+        buffer = SequenceBuffer(2, num_features=1)
+        buffer.append([1])
+        buffer.append([2])
+        buffer.reset()
+        self.assertEqual(len(buffer), 0)
+        buffer.append([3])
+        buffer.append([4])
+        np.testing.assert_array_equal(buffer.window(), [3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataset_store import save_dataset, save_frame_dataset
+from train_classifier import HandGestureClassifier, _mark_pareto
+
+
+class TestTrainClassifier(unittest.TestCase):
+    def test_pareto_marks_non_dominated(self):
+        results = [
+            {'accuracy': 0.9, 'latency_ms': 1.0, 'size_mb': 1.0},
+            {'accuracy': 0.8, 'latency_ms': 2.0, 'size_mb': 1.0},  # dominé par le premier
+            {'accuracy': 0.7, 'latency_ms': 0.5, 'size_mb': 2.0},
+        ]
+        _mark_pareto(results)
+        self.assertEqual([r['pareto'] for r in results], [True, False, True])
+
+    def test_search_respects_size_budget(self):
+        rng = np.random.default_rng(0)
+        centers = rng.random((3, 84))
+        labels = np.repeat(np.array(['A', 'B', 'C']), 40)
+        data = (np.repeat(centers, 40, axis=0) + rng.normal(0, 0.05, (120, 84))).astype(np.float32)
+        grid = {'n_estimators': [2, 20], 'max_depth': [None], 'max_features': ['sqrt'], 'min_samples_leaf': [1]}
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'data')
+            model_file = os.path.join(tmp, 'model.p')
+            save_dataset(data_file, data, labels, {})
+            trainer = HandGestureClassifier(data_file, model_file)
+            self.assertIsNotNone(trainer.search(grid=grid, workers=2))
+            with open(os.path.join(tmp, 'model_search.json')) as f:
+                sizes = {r['n_estimators']: r['size_mb'] for r in json.load(f)['results']}
+            # Budget sous la grande forêt : seule la petite est éligible
+            best = trainer.search(grid=grid, size_budget_mb=sizes[2], workers=2)
+            self.assertEqual(best['n_estimators'], 2)
+            self.assertIsNone(trainer.search(grid=grid, size_budget_mb=sizes[2] / 10, workers=2))
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'model.forest')))
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'model_search.json')))
+
+
+    def test_incremental_adds_class_without_regression(self):
+        rng = np.random.default_rng(0)
+        centers = rng.random((4, 84))
+        labels = np.repeat(np.array(['A', 'B', 'C', 'D']), 40)
+        data = (np.repeat(centers, 40, axis=0) + rng.normal(0, 0.05, (160, 84))).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'data')
+            model_file = os.path.join(tmp, 'model.p')
+            save_dataset(data_file, data[:120], labels[:120], {})
+            trainer = HandGestureClassifier(data_file, model_file)
+            trainer.train_and_save()
+            save_dataset(data_file, data, labels, {})
+            result = trainer.train_incremental(extra_trees=10)
+            self.assertEqual(result['trees'], 60)
+            self.assertEqual(result['updated_accuracy'], 1.0)
+            self.assertEqual(result['after'], result['before'])
+            with open(model_file, 'rb') as f:
+                self.assertEqual(pickle.load(f)['model'].classes_.tolist(), ['A', 'B', 'C', 'D'])
+            # Rien de nouveau : modèle inchangé
+            self.assertIsNone(trainer.train_incremental())
+
+            # Classe existante mise à jour : ses échantillons sont déjà dans les feuilles des anciens arbres
+            with open(model_file, 'rb') as f:
+                old_values = [tree.tree_.value.copy() for tree in pickle.load(f)['model'].estimators_]
+            self.assertIsNotNone(trainer.train_incremental(classes=['A'], extra_trees=10))
+            with open(model_file, 'rb') as f:
+                model = pickle.load(f)['model']
+            for tree, values in zip(model.estimators_, old_values):
+                np.testing.assert_array_equal(tree.tree_.value, values)
+
+    def test_cross_validation_report(self):
+        rng = np.random.default_rng(0)
+        centers = rng.random((3, 84))
+        labels = np.repeat(np.array(['A', 'B', 'C']), 30)
+        data = (np.repeat(centers, 30, axis=0) + rng.normal(0, 0.05, (90, 84))).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'data')
+            save_dataset(data_file, data, labels, {})
+            trainer = HandGestureClassifier(data_file, os.path.join(tmp, 'model.p'))
+            report = trainer.cross_validate(folds=3, params={'n_estimators': 10})
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'model_cv.json')))
+        self.assertEqual(report['accuracy_mean'], 1.0)
+        self.assertFalse(report['grouped_by_video'])
+        self.assertEqual(report['classes']['B'], {'precision': 1.0, 'recall': 1.0, 'f1': 1.0, 'support': 30})
+        self.assertEqual(np.trace(report['confusion_matrix']), 90)
+        self.assertEqual([f['test_samples'] for f in report['fold_details']], [30, 30, 30])
+
+    def test_cross_validation_groups_windows_by_video(self):
+        rng = np.random.default_rng(0)
+        videos = [rng.random((20, 84), dtype=np.float32) for _ in range(8)]
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'sequence_data')
+            save_frame_dataset(data_file, videos, ['bonjour', 'merci'] * 4, {'sequence_length': 5})
+            trainer = HandGestureClassifier(data_file, os.path.join(tmp, 'model_sequence.p'), stride=5)
+            report = trainer.cross_validate(folds=4, params={'n_estimators': 5})
+        self.assertTrue(report['grouped_by_video'])
+        # 4 fenêtres par vidéo, 2 vidéos entières par fold
+        self.assertEqual([f['test_samples'] for f in report['fold_details']], [8, 8, 8, 8])
+
+    def test_cross_validation_splits_single_video_classes_into_time_blocks(self):
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'sequence_data')
+            trainer = HandGestureClassifier(data_file, os.path.join(tmp, 'model_sequence.p'), stride=5)
+            # Un seul mot : rien à comparer
+            save_frame_dataset(data_file, [rng.random((20, 84), dtype=np.float32)], ['bonjour'],
+                               {'sequence_length': 5})
+            self.assertIsNone(trainer.cross_validate(folds=5, params={'n_estimators': 5}))
+
+            # Une vidéo par mot (Data/<mot>/), 'salut' trop courte pour 2 blocs de 5 frames
+            videos = [rng.random((n, 84), dtype=np.float32) for n in (20, 20, 7)]
+            save_frame_dataset(data_file, videos, ['bonjour', 'merci', 'salut'], {'sequence_length': 5})
+            report = trainer.cross_validate(folds=5, params={'n_estimators': 5})
+        self.assertEqual(report['split_videos'], 2)
+        self.assertEqual(report['excluded_classes'], {'salut': 1})
+        self.assertEqual(report['labels'], ['bonjour', 'merci'])
+        # 4 blocs de 5 frames par vidéo, une fenêtre par bloc : 4 folds au plus
+        self.assertEqual(report['folds'], 4)
+        self.assertEqual(sum(f['test_samples'] for f in report['fold_details']), 8)
+
+    def test_cross_validation_warns_on_ungrouped_sequence_pickle(self):
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'sequence_data')
+            with open(data_file + '.pickle', 'wb') as f:
+                pickle.dump({'data': rng.random((20, 5 * 84)), 'labels': ['bonjour', 'merci'] * 10}, f)
+            trainer = HandGestureClassifier(data_file, os.path.join(tmp, 'model_sequence.p'))
+            with redirect_stdout(io.StringIO()) as out:
+                report = trainer.cross_validate(folds=2, params={'n_estimators': 5})
+        self.assertFalse(report['grouped_by_video'])
+        self.assertIn('old pickle format', out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
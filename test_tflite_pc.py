@@ -4,6 +4,9 @@ import tensorflow.lite as tflite
 import mediapipe as mp
 import time
 
+from hand_features import HandFeatureExtractor
+from sequence_buffer import SequenceBuffer
+
 # --- Config ---
 MODEL_LETTERS_PATH = 'flutter_app/assets/model_letters.tflite'
 MODEL_WORDS_PATH = 'flutter_app/assets/model_words.tflite'
@@ -57,8 +60,9 @@ hands = mp_hands.Hands(
 )
 
 # --- State ---
+hand_features = HandFeatureExtractor()
 mode = "LETTRES" # or "MOTS"
-sequence_buffer = []
+sequence_buffer = SequenceBuffer(SEQUENCE_LENGTH)
 predicted_text = ""
 accuracy = 0.0
 
@@ -80,16 +84,8 @@ while cap.isOpened():
     image = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
     H, W, _ = image.shape
 
-    data_aux = []
-    x_ = []
-    y_ = []
-
-    if results.hand_landmarks:
-        # Sort hands by x position to ensure consistency (left hand first in list if on left side of screen)
-        # Note: MediaPipe x is normalized [0, 1].
-        sorted_hands = sorted(results.hand_landmarks, key=lambda h: h.landmark[0].x)
-        
-        for hand_landmarks in sorted_hands:
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
             mp_drawing.draw_landmarks(
                 image,
                 hand_landmarks,
@@ -97,36 +93,14 @@ while cap.isOpened():
                 mp_drawing_styles.get_default_hand_landmarks_style(),
                 mp_drawing_styles.get_default_hand_connections_style())
 
-            for i in range(len(hand_landmarks.landmark)):
-                x = hand_landmarks.landmark[i].x
-                y = hand_landmarks.landmark[i].y
-                x_.append(x)
-                y_.append(y)
-
-        # Normalize features relative to min x, min y
-        if x_ and y_:
-            min_x = min(x_)
-            min_y = min(y_)
-            
-            for hand_landmarks in sorted_hands:
-                for i in range(len(hand_landmarks.landmark)):
-                    x = hand_landmarks.landmark[i].x
-                    y = hand_landmarks.landmark[i].y
-                    data_aux.append(x - min_x)
-                    data_aux.append(y - min_y)
-
-            # Pad to 84 features (2 hands * 21 points * 2 coordinates)
-            # If only 1 hand detected (42 features), pad the remaining 42 with 0
-            while len(data_aux) < 84:
-                data_aux.append(0.0)
-            
-            # Truncate if somehow larger (shouldn't happen with max_num_hands=2)
-            data_aux = data_aux[:84]
+        # Sort hands by wrist x (left to right), normalize relative to min x, min y, padded to 84 (2 hands * 21 points * 2 coordinates)
+        if hand_features.update(results.multi_hand_landmarks):
+            data_aux = hand_features.flat
 
             # --- INFERENCE ---
             if mode == "LETTRES":
                 # Reshape for model: (1, 84)
-                input_data = np.array([data_aux], dtype=np.float32)
+                input_data = data_aux.reshape(1, -1)
                 interpreter_letters.set_tensor(input_details_letters[0]['index'], input_data)
                 interpreter_letters.invoke()
                 output_data = interpreter_letters.get_tensor(output_details_letters[0]['index'])
@@ -143,16 +117,10 @@ while cap.isOpened():
 
             elif mode == "MOTS":
                 sequence_buffer.append(data_aux)
-                if len(sequence_buffer) > SEQUENCE_LENGTH:
-                    sequence_buffer.pop(0)
                 
-                if len(sequence_buffer) == SEQUENCE_LENGTH:
+                if sequence_buffer.is_full():
                     # Flatten sequence: (1, 1260) -> 15 * 84 = 1260
-                    flattened = []
-                    for frame in sequence_buffer:
-                        flattened.extend(frame)
-                    
-                    input_data = np.array([flattened], dtype=np.float32)
+                    input_data = sequence_buffer.window().reshape(1, -1)
                     interpreter_words.set_tensor(input_details_words[0]['index'], input_data)
                     interpreter_words.invoke()
                     output_data = interpreter_words.get_tensor(output_details_words[0]['index'])
@@ -163,7 +131,7 @@ while cap.isOpened():
                     if prob > 0.8:
                         predicted_text = labels_words[idx]
                         accuracy = prob
-                        sequence_buffer = [] # Reset buffer after detection
+                        sequence_buffer.reset() # Reset buffer after detection
     
     # Draw UI
     cv2.rectangle(image, (0, 0), (W, 80), (0, 0, 0), -1)
@@ -183,7 +151,7 @@ while cap.isOpened():
         break
     elif key == ord('m'):
         mode = "MOTS" if mode == "LETTRES" else "LETTRES"
-        sequence_buffer = []
+        sequence_buffer.reset()
         predicted_text = "..."
         print(f"Switched to mode: {mode}")
 
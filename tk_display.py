@@ -0,0 +1,82 @@
+"""Affichage des frames caméra dans un Label Tkinter, découplé du thread d'inférence.
+
+Le thread caméra se contente de `submit()` ; la boucle Tk (via `after()`) affiche au
+plus `fps` frames par seconde en collant les pixels dans un seul PhotoImage réutilisé.
+Les frames arrivées entre deux rafraîchissements sont abandonnées.
+"""
+import queue
+
+import cv2
+from PIL import Image, ImageTk
+
+from frame_pipeline import LatestSlot
+
+
+class TkFrameDisplay:
+    def __init__(self, root, label, fps=20, profiler=None):
+        self.root = root
+        self.profiler = profiler
+        self.label = label
+        self.interval_ms = max(1, int(1000 / fps))
+        self._frames = LatestSlot()
+        self._calls = queue.Queue()
+        self._photo = None
+        self._photo_size = None
+        self._after_id = None
+        self.displayed = 0
+
+    @property
+    def dropped(self):
+        return self._frames.dropped
+
+    def submit(self, frame_bgr):
+        """Thread-safe : propose une frame BGR (remplace celle pas encore affichée)."""
+        self._frames.put(frame_bgr)
+
+    def call_soon(self, func, *args):
+        """Thread-safe : exécute `func(*args)` dans la boucle Tk (mise à jour de widgets)."""
+        self._calls.put((func, args))
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        try:
+            while True:
+                func, args = self._calls.get_nowait()
+                func(*args)
+        except queue.Empty:
+            pass
+        except Exception as e:
+            print(f"⚠️ Display callback error: {e}")
+
+        frame = self._frames.get_nowait()
+        if frame is not None:
+            try:
+                if self.profiler:
+                    with self.profiler.measure('display'):
+                        self._show(frame)
+                else:
+                    self._show(frame)
+            except Exception as e:
+                print(f"⚠️ Display error: {e}")
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _show(self, frame_bgr):
+        image = Image.fromarray(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB))
+        if self._photo is None or self._photo_size != image.size:
+            self._photo = ImageTk.PhotoImage(image=image)
+            self._photo_size = image.size
+        else:
+            self._photo.paste(image)
+        # Le label peut afficher autre chose entre-temps (ex: image de geste du mode vocal)
+        if str(self.label.cget('image')) != str(self._photo):
+            self.label.config(image=self._photo)
+            self.label.image = self._photo
+        self.displayed += 1
@@ -1,33 +1,61 @@
 import pickle
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split, StratifiedKFold, StratifiedGroupKFold
+from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
 import numpy as np
 import time
 import os
+import json
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from forest_predictor import ForestPredictor
+from dataset_store import load_dataset, dataset_exists
+from landmark_augment import LandmarkAugmenter
+from model_artifact import save_artifact, artifact_path
+from forest_update import add_classes, refresh_leaves, grow_trees, replay_indices
+from hand_features import NUM_FEATURES
+
+# Forêt de train_and_save (et par défaut de la validation croisée)
+FOREST_PARAMS = {'n_estimators': 50, 'max_depth': 15}
+
+# Grille du mode --search (forêt, profondeur, max_features, taille des feuilles)
+SEARCH_GRID = {
+    'n_estimators': [25, 50, 100],
+    'max_depth': [10, 15, None],
+    'max_features': ['sqrt', 0.3],
+    'min_samples_leaf': [1, 3],
+}
+
+# Mise à jour incrémentale : échantillons rappelés par ancienne classe pour les nouveaux
+# arbres, et baisse de précision tolérée sur une ancienne classe avant de refuser le modèle
+REPLAY_PER_CLASS = 50
+MAX_REGRESSION = 0.02
 
 class HandGestureClassifier:
-    def __init__(self, data_file, model_file):
+    def __init__(self, data_file, model_file, sequence_length=None, stride=None, augment_copies=0):
         self.data_file = data_file
         self.model_file = model_file
+        # Datasets de séquences par vidéo : fenêtres construites au chargement
+        # (None = longueur de l'extraction, pas adaptatif)
+        self.sequence_length = sequence_length
+        self.stride = stride
+        # Copies augmentées (rotation, échelle, miroir, vitesse) ajoutées au seul jeu
+        # d'entraînement, générées en mémoire à chaque entraînement
+        self.augment_copies = augment_copies
 
     def load_data(self):
-        if not os.path.exists(self.data_file):
+        if not dataset_exists(self.data_file):
             print(f"⚠️  {self.data_file} not found. Skipping.")
             return None, None
             
-        data_dict = pickle.load(open(self.data_file, 'rb'))
-        data = np.asarray(data_dict['data'])
-        labels = np.asarray(data_dict['labels'])
+        # float32 memmappé (.npy), ancien pickle en secours
+        data, labels, _ = load_dataset(self.data_file, sequence_length=self.sequence_length, stride=self.stride)
         return data, labels
 
-    def train_and_save(self):
-        print(f"\n--- Training for {self.data_file} ---")
-        data, labels = self.load_data()
-        
-        if data is None or len(data) == 0:
-            return
-        
+    def split_data(self, data, labels):
+        """Train/test 80/20 (stratifié si possible), augmentation du seul jeu d'entraînement."""
         # Check if stratification is possible (need at least 2 samples per class)
         unique, counts = np.unique(labels, return_counts=True)
         min_samples = np.min(counts)
@@ -43,9 +71,22 @@ class HandGestureClassifier:
             random_state=42
         )
         
+        if self.augment_copies:
+            x_train, y_train = LandmarkAugmenter(seed=42).expand(x_train, y_train, self.augment_copies)
+            print(f"Augmentation: x{self.augment_copies + 1} training samples")
+        return x_train, x_test, y_train, y_test
+
+    def train_and_save(self):
+        print(f"\n--- Training for {self.data_file} ---")
+        data, labels = self.load_data()
+        
+        if data is None or len(data) == 0:
+            return
+        
+        x_train, x_test, y_train, y_test = self.split_data(data, labels)
+        
         model = RandomForestClassifier(
-            n_estimators=50,
-            max_depth=15,
+            **FOREST_PARAMS,
             n_jobs=-1,
             random_state=42,
             verbose=0
@@ -59,13 +100,350 @@ class HandGestureClassifier:
         print(f"✅ Accuracy: {score * 100:.2f}%")
         print(f"   Train/Test split: {len(x_train)}/{len(x_test)} samples")
         
+        self.save_model(model)
+        return score
+
+    def save_model(self, model):
         with open(self.model_file, 'wb') as f:
             pickle.dump({'model': model}, f)
         print(f"✅ Model saved to {self.model_file}")
-        return score
+        
+        # Artefact .forest (tableaux de noeuds mappables) chargé par les applications
+        forest_file = save_artifact(ForestPredictor.from_sklearn(model), artifact_path(self.model_file))
+        print(f"✅ Compiled forest exported to {forest_file}")
+
+    def train_incremental(self, classes=None, extra_trees=None, replay_per_class=REPLAY_PER_CLASS,
+                          max_regression=MAX_REGRESSION):
+        """Ajoute au modèle existant les classes absentes (ou `classes`) sans tout ré-entraîner.
+
+        Voir forest_update.py. La précision par ancienne classe est mesurée sur le jeu de
+        test avant et après : si l'une baisse de plus de `max_regression`, le modèle
+        n'est pas sauvegardé. L'ancien modèle a pu voir une partie de ce jeu de test (le
+        découpage change quand le dataset grandit) : la vérification est donc prudente.
+        """
+        print(f"\n--- Incremental training for {self.data_file} ---")
+        if not os.path.exists(self.model_file):
+            print(f"⚠️  {self.model_file} not found. Full training instead.")
+            return self.train_and_save()
+        data, labels = self.load_data()
+        if data is None or len(data) == 0:
+            return None
+        
+        with open(self.model_file, 'rb') as f:
+            model = pickle.load(f)['model']
+        old_classes = np.asarray(model.classes_, dtype=str)
+        if classes:
+            update = np.intersect1d(np.asarray(classes, dtype=str), labels)
+        else:
+            update = np.setdiff1d(np.unique(labels), old_classes)
+        if len(update) == 0:
+            print("✅ No new class or sample to add. Model unchanged.")
+            return None
+        removed = np.setdiff1d(old_classes, labels)
+        if len(removed):
+            print(f"❌ Classes missing from {self.data_file}: {removed.tolist()}. Full training needed.")
+            return None
+        
+        x_train, x_test, y_train, y_test = self.split_data(data, labels)
+        old_test = np.isin(y_test, old_classes)
+        before = _per_class_accuracy(model, x_test[old_test], y_test[old_test])
+        
+        # 1. Anciens arbres étendus aux nouvelles classes, feuilles mises à jour avec leurs
+        # seuls échantillons : ceux d'une classe existante ont déjà été comptés
+        fresh = np.isin(y_train, update)
+        added = add_classes(model, update)
+        unseen = np.isin(y_train, added)
+        if unseen.any():
+            refresh_leaves(model, x_train[unseen], y_train[unseen])
+        # 2. Nouveaux arbres : nouveaux échantillons + rappel des autres classes
+        replay = replay_indices(y_train, np.setdiff1d(model.classes_, update), replay_per_class)
+        rows = np.concatenate([np.flatnonzero(fresh), replay])
+        extra_trees = extra_trees or max(len(model.estimators_) // 2, 10)
+        print(f"Updating {len(model.estimators_)} trees and growing {extra_trees} on {len(rows)} samples "
+              f"(new: {added.tolist()}, updated: {np.setdiff1d(update, added).tolist()})...")
+        grow_trees(model, x_train[rows], y_train[rows], extra_trees)
+        
+        after = _per_class_accuracy(model, x_test[old_test], y_test[old_test])
+        updated_test = np.isin(y_test, update)
+        new_score = accuracy_score(y_test[updated_test], model.predict(x_test[updated_test])) if updated_test.any() else None
+        regressions = {c: (before[c], after[c]) for c in before if after[c] < before[c] - max_regression}
+        if before:
+            print(f"{'❌' if regressions else '✅'} Old classes: {np.mean(list(before.values())) * 100:.2f}% -> "
+                  f"{np.mean(list(after.values())) * 100:.2f}%")
+        if new_score is not None:
+            print(f"✅ Updated classes: {new_score * 100:.2f}%")
+        if regressions:
+            for c, (b, a) in regressions.items():
+                print(f"   - {c}: {b * 100:.1f}% -> {a * 100:.1f}%")
+            print(f"❌ {len(regressions)} old classes regressed by more than {max_regression:.0%}. Model not saved, "
+                  f"run a full training.")
+            return None
+        
+        self.save_model(model)
+        return {'before': before, 'after': after, 'updated_accuracy': new_score, 'trees': len(model.estimators_)}
+
+    def cross_validate(self, folds=5, params=None, workers=None):
+        """Validation croisée k-fold en parallèle, rapport par classe dans <model>_cv.json.
+
+        Les fenêtres de séquences sont groupées par vidéo source (StratifiedGroupKFold) :
+        deux fenêtres qui se chevauchent ne tombent jamais de part et d'autre. Une classe
+        avec moins de `folds` vidéos (un seul dossier Data/<mot>/) voit ses vidéos coupées
+        en blocs temporels contigus, groupes à leur tour ; les fenêtres à cheval sur deux
+        blocs sont écartées. Les classes restées à un seul groupe (vidéo trop courte) sont
+        exclues et listées dans le rapport. Toutes
+        les folds partagent le tableau chargé (memmap pour les lettres) : une fold
+        entraîne sur tout le tableau avec un poids nul pour ses échantillons de test,
+        que sklearn écarte des arbres. Pas d'augmentation ici. Folds en threads : la
+        construction des arbres relâche le GIL.
+        """
+        print(f"\n--- {folds}-fold cross-validation for {self.data_file} ---")
+        if not dataset_exists(self.data_file):
+            print(f"⚠️  {self.data_file} not found. Skipping.")
+            return None
+        data, labels, meta, groups = load_dataset(self.data_file, sequence_length=self.sequence_length,
+                                                  stride=self.stride, groups=True, min_groups=folds)
+        if len(data) == 0:
+            return None
+        
+        params = dict(FOREST_PARAMS, **(params or {}))
+        excluded = {}
+        if groups is not None:
+            if meta.get('split_videos'):
+                print(f"   {meta['split_videos']} videos split into time blocks "
+                      f"(classes with fewer than {folds} videos).")
+            # Un seul groupe : la classe n'est jamais dans ses propres folds
+            # d'entraînement, toujours fausse, elle est sortie de l'évaluation
+            groups_per_class = {str(c): len(np.unique(groups[labels == c])) for c in np.unique(labels)}
+            excluded = {c: n for c, n in groups_per_class.items() if n < 2}
+            if excluded:
+                print(f"⚠️  Classes too short to split into 2 time blocks, excluded from cross-validation: "
+                      f"{', '.join(sorted(excluded))}")
+                keep = np.flatnonzero(~np.isin(labels, list(excluded)))
+                data, labels, groups = data[keep], labels[keep], groups[keep]
+            n_groups = len(np.unique(groups))
+            if len(np.unique(labels)) < 2:
+                print(f"⚠️  Not enough classes with 2+ groups ({n_groups} usable groups). "
+                      f"Skipping cross-validation.")
+                return None
+            # StratifiedGroupKFold : au moins une classe doit avoir un groupe par fold
+            most = max(n for c, n in groups_per_class.items() if c not in excluded)
+            if most < folds:
+                print(f"⚠️  At most {most} groups per class: {most} folds instead of {folds}.")
+                folds = most
+            splitter = StratifiedGroupKFold(n_splits=folds, shuffle=True, random_state=42)
+        else:
+            if data.shape[1] > NUM_FEATURES:
+                print("⚠️  Sequence windows without source video (old pickle format): overlapping windows "
+                      "can end up in both train and test, accuracy is overestimated. Rebuild with create_dataset.py.")
+            splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+        splits = list(splitter.split(np.zeros(len(labels)), labels, groups))
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers or min(folds, os.cpu_count() or 1)) as pool:
+            results = list(pool.map(lambda split: _run_fold(data, labels, split, params), splits))
+        report = _cv_report(results, labels, params, grouped=groups is not None)
+        report['excluded_classes'] = excluded
+        report['split_videos'] = meta.get('split_videos', 0)
+        report['timing']['wall_s'] = round(time.perf_counter() - start, 3)
+        _print_cv_report(report)
+        
+        report_file = os.path.splitext(self.model_file)[0] + '_cv.json'
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📝 Cross-validation report saved to {report_file}")
+        return report
+
+    def search(self, grid=None, latency_budget_ms=None, size_budget_mb=None, workers=None):
+        """Balaye la grille en parallèle et garde la meilleure forêt sous les budgets.
+
+        Pour chaque candidat : précision sur le jeu de test, latence d'une prédiction
+        (prédicteur compilé utilisé par les applications), débit par lot et taille du
+        modèle picklé. Les latences sont mesurées après coup, dans ce processus, pour
+        ne pas être faussées par les entraînements concurrents.
+        """
+        print(f"\n--- Hyperparameter search for {self.data_file} ---")
+        data, labels = self.load_data()
+        if data is None or len(data) == 0:
+            return None
+        
+        x_train, x_test, y_train, y_test = self.split_data(data, labels)
+        x_train = np.ascontiguousarray(x_train, dtype=np.float32)
+        x_test = np.ascontiguousarray(x_test, dtype=np.float32)
+        grid = grid or SEARCH_GRID
+        candidates = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+        print(f"Fitting {len(candidates)} candidates on {len(x_train)} samples...")
+        
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            models = list(pool.map(_fit_candidate, candidates,
+                                   itertools.repeat(x_train), itertools.repeat(y_train)))
+        
+        results = []
+        for params, model in zip(candidates, models):
+            result = dict(params, accuracy=round(accuracy_score(y_test, model.predict(x_test)), 4))
+            result.update(_measure_inference(model, x_test))
+            results.append(result)
+        _mark_pareto(results)
+        _print_pareto_table(results)
+        
+        eligible = [i for i, r in enumerate(results)
+                    if (latency_budget_ms is None or r['latency_ms'] <= latency_budget_ms)
+                    and (size_budget_mb is None or r['size_mb'] <= size_budget_mb)]
+        report_file = os.path.splitext(self.model_file)[0] + '_search.json'
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump({'latency_budget_ms': latency_budget_ms, 'size_budget_mb': size_budget_mb,
+                       'results': results}, f, indent=2)
+        print(f"📝 Search results saved to {report_file}")
+        if not eligible:
+            print("❌ No candidate fits the latency/size budget. Model not saved.")
+            return None
+        
+        best = max(eligible, key=lambda i: (results[i]['accuracy'], -results[i]['latency_ms']))
+        print(f"✅ Best under budget: {_describe(results[best])}")
+        self.save_model(models[best])
+        return results[best]
+
+
+def _per_class_accuracy(model, X, y):
+    """{classe: précision} sur les échantillons de test de chaque classe."""
+    if len(y) == 0:
+        return {}
+    predicted = model.predict(X)
+    return {str(c): float(np.mean(predicted[y == c] == c)) for c in np.unique(y)}
+
+
+def _run_fold(data, labels, split, params):
+    train, test = split
+    weights = np.zeros(len(labels))
+    weights[train] = 1.0
+    model = RandomForestClassifier(n_jobs=1, random_state=42, **params)
+    start = time.perf_counter()
+    model.fit(data, labels, sample_weight=weights)
+    fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    predicted = model.predict(data[test])
+    return {'test': test, 'predicted': predicted, 'fit_s': fit_s, 'predict_s': time.perf_counter() - start}
+
+
+def _cv_report(results, labels, params, grouped):
+    """Précision / rappel par classe et matrice de confusion sur toutes les folds, détail par fold."""
+    classes = np.unique(labels)
+    y_true = np.concatenate([labels[r['test']] for r in results])
+    y_pred = np.concatenate([r['predicted'] for r in results])
+    precision, recall, f1, support = precision_recall_fscore_support(y_true, y_pred, labels=classes, zero_division=0)
+    fold_scores = [accuracy_score(labels[r['test']], r['predicted']) for r in results]
+    return {
+        'folds': len(results),
+        'grouped_by_video': grouped,
+        'params': params,
+        'accuracy_mean': round(float(np.mean(fold_scores)), 4),
+        'accuracy_std': round(float(np.std(fold_scores)), 4),
+        'classes': {str(c): {'precision': round(float(p), 4), 'recall': round(float(r), 4),
+                             'f1': round(float(f), 4), 'support': int(s)}
+                    for c, p, r, f, s in zip(classes, precision, recall, f1, support)},
+        'labels': classes.tolist(),
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=classes).tolist(),
+        'fold_details': [{'accuracy': round(float(score), 4), 'test_samples': len(r['test']),
+                          'confusion_matrix': confusion_matrix(labels[r['test']], r['predicted'], labels=classes).tolist()}
+                         for score, r in zip(fold_scores, results)],
+        'timing': {
+            'fit_s': [round(r['fit_s'], 3) for r in results],
+            'predict_ms_per_sample': round(sum(r['predict_s'] for r in results) * 1000 / len(y_true), 4),
+        },
+    }
+
+
+def _print_cv_report(report):
+    print(f"✅ Accuracy: {report['accuracy_mean'] * 100:.2f}% ± {report['accuracy_std'] * 100:.2f} "
+          f"({report['folds']} folds{', grouped by video' if report['grouped_by_video'] else ''})")
+    print(f"\n{'Classe':<16}{'Précision':>10}{'Rappel':>8}{'F1':>7}{'N':>6}")
+    for label, c in sorted(report['classes'].items(), key=lambda item: item[1]['f1']):
+        print(f"{label:<16}{c['precision']:>10.2f}{c['recall']:>8.2f}{c['f1']:>7.2f}{c['support']:>6}")
+    matrix = np.array(report['confusion_matrix'])
+    np.fill_diagonal(matrix, 0)
+    worst = np.argsort(matrix, axis=None)[::-1][:5]
+    confusions = [(report['labels'][i], report['labels'][j], matrix[i, j])
+                  for i, j in zip(*np.unravel_index(worst, matrix.shape)) if matrix[i, j]]
+    if confusions:
+        print("Confusions: " + ", ".join(f"{t} -> {p} ({n})" for t, p, n in confusions))
+    if report.get('excluded_classes'):
+        print("Non évaluées (< 2 blocs): " + ", ".join(f"{c} ({n})" for c, n in sorted(report['excluded_classes'].items())))
+
+
+def _fit_candidate(params, x_train, y_train):
+    model = RandomForestClassifier(n_jobs=1, random_state=42, **params)
+    return model.fit(x_train, y_train)
+
+
+def _measure_inference(model, x_test, repeats=200):
+    """Latence médiane d'une prédiction, débit par lot et tailles du modèle."""
+    forest = ForestPredictor.from_sklearn(model)
+    samples = x_test[np.arange(repeats) % len(x_test)]
+    timings = np.empty(repeats)
+    for i, sample in enumerate(samples):
+        start = time.perf_counter()
+        forest.predict_proba(sample[None])
+        timings[i] = time.perf_counter() - start
+    start = time.perf_counter()
+    forest.predict_proba(x_test)
+    batch_s = time.perf_counter() - start
+    compiled_bytes = sum(a.nbytes for a in (forest.feature, forest.threshold, forest.left, forest.right,
+                                            forest.leaf_id, forest.leaf_values))
+    return {
+        'latency_ms': round(float(np.median(timings)) * 1000, 4),
+        'batch_per_s': round(len(x_test) / batch_s, 1) if batch_s > 0 else 0.0,
+        'size_mb': round(len(pickle.dumps({'model': model})) / 1e6, 3),
+        'compiled_mb': round(compiled_bytes / 1e6, 3),
+    }
+
+
+def _mark_pareto(results):
+    """Pareto : aucun autre candidat au moins aussi bon partout et meilleur sur un critère."""
+    scores = [(r['accuracy'], -r['latency_ms'], -r['size_mb']) for r in results]
+    for r, score in zip(results, scores):
+        r['pareto'] = not any(other != score and all(o >= s for o, s in zip(other, score))
+                              for other in scores)
+
+
+def _describe(r):
+    return (f"n_estimators={r['n_estimators']} max_depth={r['max_depth']} max_features={r['max_features']} "
+            f"min_samples_leaf={r['min_samples_leaf']} -> {r['accuracy'] * 100:.2f}%, "
+            f"{r['latency_ms']:.3f} ms, {r['size_mb']:.2f} MB")
+
+
+def _print_pareto_table(results):
+    print(f"\n{'':2}{'trees':>6}{'depth':>7}{'feat':>7}{'leaf':>6}{'acc %':>8}{'ms/pred':>9}{'batch/s':>10}{'MB':>8}")
+    for r in sorted(results, key=lambda r: r['latency_ms']):
+        print(f"{'*' if r['pareto'] else '':2}{r['n_estimators']:>6}{str(r['max_depth']):>7}{str(r['max_features']):>7}"
+              f"{r['min_samples_leaf']:>6}{r['accuracy'] * 100:>8.2f}{r['latency_ms']:>9.3f}{r['batch_per_s']:>10.0f}"
+              f"{r['size_mb']:>8.2f}")
+    print("* = Pareto (précision / latence / taille)")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entraînement des modèles lettres et mots")
+    parser.add_argument('--sequence-length', type=int, default=None,
+                        help="Frames par fenêtre du modèle de mots (défaut: celle de create_dataset)")
+    parser.add_argument('--stride', type=int, default=None,
+                        help="Pas entre fenêtres (défaut: adaptatif selon la durée de la vidéo)")
+    parser.add_argument('--augment', type=int, default=0,
+                        help="Copies augmentées de chaque échantillon d'entraînement (0 = aucune)")
+    parser.add_argument('--search', action='store_true',
+                        help="Recherche d'hyperparamètres (tableau Pareto précision / latence / taille)")
+    parser.add_argument('--latency-budget-ms', type=float, default=None,
+                        help="--search : latence max d'une prédiction du modèle gardé")
+    parser.add_argument('--size-budget-mb', type=float, default=None,
+                        help="--search : taille max du modèle gardé")
+    parser.add_argument('--cv', type=int, default=0,
+                        help="Validation croisée en K folds (rapport <model>_cv.json) au lieu de l'entraînement")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Ajouter les nouvelles classes aux modèles existants sans ré-entraînement complet")
+    parser.add_argument('--classes', default=None,
+                        help="--incremental : classes à ajouter ou compléter, séparées par des virgules "
+                             "(défaut: celles absentes du modèle)")
+    parser.add_argument('--extra-trees', type=int, default=None,
+                        help="--incremental : arbres ajoutés (défaut: la moitié de la forêt)")
+    args = parser.parse_args()
+
     print("="*60)
     print("ENTRAÎNEMENT DU MODÈLE DE RECONNAISSANCE HYBRIDE")
     print("="*60)
@@ -73,12 +451,23 @@ if __name__ == "__main__":
     start_time = time.time()
     
     # 1. Train Static Model (Letters)
-    static_trainer = HandGestureClassifier('data.pickle', 'model.p')
-    static_trainer.train_and_save()
+    static_trainer = HandGestureClassifier('data', 'model.p', augment_copies=args.augment)
     
     # 2. Train Sequence Model (Words)
-    sequence_trainer = HandGestureClassifier('sequence_data.pickle', 'model_sequence.p')
-    sequence_trainer.train_and_save()
+    sequence_trainer = HandGestureClassifier('sequence_data', 'model_sequence.p',
+                                              sequence_length=args.sequence_length, stride=args.stride,
+                                              augment_copies=args.augment)
+    
+    for trainer in (static_trainer, sequence_trainer):
+        if args.cv:
+            trainer.cross_validate(folds=args.cv)
+        elif args.search:
+            trainer.search(latency_budget_ms=args.latency_budget_ms, size_budget_mb=args.size_budget_mb)
+        elif args.incremental:
+            trainer.train_incremental(classes=args.classes.split(',') if args.classes else None,
+                                      extra_trees=args.extra_trees)
+        else:
+            trainer.train_and_save()
     
     elapsed_time = time.time() - start_time
     print(f"\n{'='*60}")